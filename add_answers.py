@@ -1,33 +1,80 @@
+import json
 import re
 import os
-from datetime import datetime
+from dataclasses import dataclass
+from typing import List, Optional
+from backup_store import backup_file
+from content_manifest import ContentManifest
+from question_bank import AnswerKey, merge_answers
+
+# 정답을 붙이는 CR 문제 번호 범위 (CR문제.txt 의 141~289번)
+ANSWER_RANGE = range(141, 290)
+
+QUESTION_HEADER = re.compile(r'^(\d+)\.')
+ANSWER_LINE = re.compile(r'^(\d+)\.\s*정답\s*:\s*(\S*)')
+
+
+@dataclass
+class QuestionBlock:
+    """문제 파일에서 "N." 줄부터 다음 문제 직전까지 (정답 줄은 answer 로 분리)"""
+    number: int
+    lines: List[str]
+    answer: Optional[str] = None
+
 
 def load_answers(answer_file):
-    """정답 파일에서 정답들을 로드합니다"""
-    answers = {}
-    
-    try:
-        with open(answer_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # 문제번호. 정답 패턴 찾기
-        pattern = r'(\d+)\.\s*([A-E])'
-        matches = re.findall(pattern, content)
-        
-        for question_num, answer in matches:
-            answers[int(question_num)] = answer
-        
-        print(f"정답 로드 완료: {len(answers)}개")
-        print(f"정답 범위: {min(answers.keys())}번 ~ {max(answers.keys())}번")
-        
-        return answers
-        
-    except Exception as e:
-        print(f"정답 파일 읽기 오류: {e}")
-        return {}
+    """정답 파일을 {문제 번호: 정답} 인덱스(AnswerKey)로 로드합니다"""
+    if not os.path.exists(answer_file):
+        print(f"정답 파일 읽기 오류: {answer_file} 없음")
+        return AnswerKey(source=answer_file)
+
+    key = AnswerKey.from_file(answer_file)
+    print(f"정답 로드 완료: {key.describe()}")
+    return key
+
 
-def add_answers_to_questions(questions_file, answers):
-    """문제 파일에 정답을 추가합니다"""
+def split_blocks(content):
+    """문제 파일 → (첫 문제 앞 줄들, 문제 블록 목록)"""
+    preamble, blocks = [], []
+    for line in content.split('\n'):
+        stripped = line.strip()
+        answer_match = ANSWER_LINE.match(stripped)
+        header_match = QUESTION_HEADER.match(stripped)
+        if answer_match and blocks and int(answer_match.group(1)) == blocks[-1].number:
+            blocks[-1].answer = answer_match.group(2) or None
+        elif header_match and not answer_match:
+            blocks.append(QuestionBlock(int(header_match.group(1)), [line]))
+        elif blocks:
+            blocks[-1].lines.append(line)
+        else:
+            preamble.append(line)
+    return preamble, blocks
+
+
+def render_blocks(preamble, blocks):
+    """블록마다 본문 끝(뒤쪽 빈 줄 앞)에 "N. 정답 : X" 를 붙여 다시 합칩니다"""
+    lines = list(preamble)
+    for i, block in enumerate(blocks):
+        body = list(block.lines)
+        trailing = []
+        while len(body) > 1 and not body[-1].strip():
+            trailing.insert(0, body.pop())
+        lines.extend(body)
+        if block.answer:
+            lines.append(f"{block.number}. 정답 : {block.answer}")
+            if not trailing and i < len(blocks) - 1:
+                trailing = [""]
+        lines.extend(trailing)
+    return '\n'.join(lines)
+
+
+def add_answers_to_questions(questions_file, answers, manifest=None):
+    """문제 파일에 정답을 추가합니다 (manifest: 문제/정답이 마지막 실행 후 그대로면 건너뜀)
+
+    문제 블록을 번호로 인덱싱해 정답 키와 한 번에 조인하므로, 이미 정답 줄이 있으면 새 정답으로 바꿉니다.
+    """
+    if not isinstance(answers, AnswerKey):
+        answers = AnswerKey(answers)
     
     print(f"\n=== {questions_file} 정답 추가 시작 ===")
     
@@ -41,75 +88,36 @@ def add_answers_to_questions(questions_file, answers):
     
     print(f"원본 파일 크기: {len(content)}자")
     
-    lines = content.split('\n')
-    new_lines = []
-    
-    current_question = None
-    need_to_add_answer = False  # E 보기 다음에 정답을 추가해야 하는지 표시
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        
-        # 정답을 추가해야 하는 상황인지 먼저 확인
-        if need_to_add_answer and current_question and current_question in answers:
-            # 현재 줄이 다음 문제 시작인지 확인
-            if not re.match(r'^\d+\.', line.strip()):
-                # 다음 문제가 아니면 정답 추가
-                answer = answers[current_question]
-                answer_line = f"{current_question}. 정답 : {answer}"
-                new_lines.append(answer_line)
-                new_lines.append("")  # 빈 줄 추가
-                print(f"  → 정답 추가: {answer_line}")
-                need_to_add_answer = False
-        
-        new_lines.append(line)
-        
-        # 문제 번호 찾기
-        question_match = re.match(r'^(\d+)\.', line.strip())
-        if question_match:
-            question_num = int(question_match.group(1))
-            if 141 <= question_num <= 289:
-                current_question = question_num
-                need_to_add_answer = False
-                print(f"문제 {current_question} 처리 중...")
-        
-        # E. 보기 찾기 (마지막 보기)
-        choice_match = re.match(r'^E\.', line.strip())
-        if choice_match and current_question:
-            need_to_add_answer = True
-            print(f"  문제 {current_question}의 E 보기 발견")
-        
-        i += 1
-    
-    # 마지막 문제 처리 (파일 끝에서 정답 추가가 필요한 경우)
-    if need_to_add_answer and current_question and current_question in answers:
-        answer = answers[current_question]
-        answer_line = f"{current_question}. 정답 : {answer}"
-        new_lines.append(answer_line)
-        print(f"  → 마지막 문제 정답 추가: {answer_line}")
-    
-    # 결과 저장
-    new_content = '\n'.join(new_lines)
+    answers_signature = json.dumps(answers.answers, sort_keys=True)
+    if manifest is not None and manifest.is_current(questions_file, content + answers_signature):
+        print("⏭️ 마지막 정답 추가 이후 문제/정답 변경 없음, 건너뜀")
+        return True
     
-    # 백업 생성
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = f"{questions_file}.backup_{timestamp}"
+    # 문제 블록 ⋈ 정답 키 (번호 기준)
+    preamble, blocks = split_blocks(content)
+    targets = [block for block in blocks if block.number in ANSWER_RANGE]
+    merge = merge_answers(targets, answers)
+    merge.print_report(f"{os.path.basename(questions_file)} 정답 병합")
+    
+    new_content = render_blocks(preamble, blocks)
+    if new_content == content:
+        print("✅ 정답이 이미 모두 반영되어 있습니다.")
+        if manifest is not None:
+            manifest.record(questions_file, new_content + answers_signature)
+        return True
     
     try:
-        # 원본 백업
-        with open(questions_file, 'r', encoding='utf-8') as f:
-            original_content = f.read()
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            f.write(original_content)
-        print(f"백업 생성: {backup_path}")
+        # 원본 백업 (backup_store: 같은 내용은 한 번만 저장)
+        backup_file(questions_file)
         
         # 정답이 추가된 내용 저장
         with open(questions_file, 'w', encoding='utf-8') as f:
             f.write(new_content)
+        if manifest is not None:
+            manifest.record(questions_file, new_content + answers_signature)
         
         print(f"\n✅ 정답 추가 완료!")
-        print(f"  파일 크기: {len(original_content)}자 → {len(new_content)}자")
+        print(f"  파일 크기: {len(content)}자 → {len(new_content)}자")
         
         return True
         
@@ -141,7 +149,10 @@ def main():
         return
     
     # 문제에 정답 추가
-    if add_answers_to_questions(questions_file, answers):
+    manifest = ContentManifest("add-answers")
+    if add_answers_to_questions(questions_file, answers, manifest):
+        manifest.save()
+        manifest.print_report()
         print("✅ 모든 작업이 완료되었습니다!")
         
         # 샘플 확인
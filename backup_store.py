@@ -0,0 +1,274 @@
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# 🗃️ 내용 주소 기반 텍스트 백업 저장소
+# 포매터/정답 추가 스크립트가 파일을 덮어쓰기 전에 backup_file(path) 로 원본을 저장합니다.
+# - 객체: .backups/objects/<sha256 앞 2자리>/<sha256>.gz  (같은 내용은 한 번만 저장)
+# - 목록: .backups/index.jsonl  (버전마다 한 줄: id, 원본 경로, 해시, 크기, 시각)
+# - 직전 버전과 내용이 같으면 새 버전을 만들지 않으므로 반복 실행해도 디스크가 늘지 않습니다.
+# - 보존 정책: 파일별 최근 BACKUP_KEEP_LAST 개 또는 BACKUP_KEEP_DAYS 일 이내 버전만 유지
+#   python backup_store.py list [경로]
+#   python backup_store.py restore <버전 id> [--to 경로]
+#   python backup_store.py prune [--keep-last N] [--keep-days D]
+
+STORE_DIR = os.getenv("BACKUP_STORE_DIR", ".backups")
+KEEP_LAST = int(os.getenv("BACKUP_KEEP_LAST", "20"))
+KEEP_DAYS = int(os.getenv("BACKUP_KEEP_DAYS", "30"))
+ID_LENGTH = 10
+# restore() 가 덮어쓰기 직전 현재 내용을 저장할 때 붙이는 라벨 (기본 복원 대상에서 제외)
+PRE_RESTORE_LABEL = "복원 전"
+
+# 예전 방식의 타임스탬프 사본 (CR문제.txt.backup_20250725_133717)
+LEGACY_PATTERN = re.compile(r'^(?P<original>.+?)[._]backup_(?P<stamp>\d{8}_\d{6})$')
+LEGACY_GLOBS = ('*.backup_*', '*_backup_*')
+
+
+def _normalize(path: str) -> str:
+    return os.path.relpath(os.path.abspath(path)).replace(os.sep, "/")
+
+
+def _entry(path: str, digest: str, size: int, created_at: str, label: str) -> Dict:
+    path = _normalize(path)
+    return {
+        "id": hashlib.sha1(f"{path}:{digest}:{created_at}".encode("utf-8")).hexdigest()[:ID_LENGTH],
+        "path": path,
+        "sha256": digest,
+        "size": size,
+        "created_at": created_at,
+        "label": label,
+    }
+
+
+class BackupStore:
+    def __init__(self, root: str = STORE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, "index.jsonl")
+
+    # --- 객체 ---
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.gz")
+
+    def _put_object(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress(data, mtime=0))
+            os.replace(tmp_path, path)
+        return digest
+
+    def read(self, version: Dict) -> bytes:
+        with open(self._object_path(version["sha256"]), "rb") as f:
+            return gzip.decompress(f.read())
+
+    # --- 목록 ---
+    def versions(self, path: Optional[str] = None) -> List[Dict]:
+        """오래된 순 버전 목록 (path 를 주면 그 파일만)"""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        if path is not None:
+            target = _normalize(path)
+            entries = [e for e in entries if e["path"] == target]
+        return entries
+
+    def _write_index(self, entries: List[Dict]) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.index_path)
+
+    def latest(self, path: str) -> Optional[Dict]:
+        """가장 최근 백업 ("복원 전" 사본 제외 - 다시 실행해도 직전 복원을 되돌리지 않음)"""
+        history = [e for e in self.versions(path) if e.get("label") != PRE_RESTORE_LABEL]
+        return history[-1] if history else None
+
+    def find(self, version_id: str) -> Dict:
+        matches = [e for e in self.versions() if e["id"].startswith(version_id)]
+        if not matches:
+            raise KeyError(f"백업 버전을 찾을 수 없습니다: {version_id}")
+        if len({e["id"] for e in matches}) > 1:
+            raise KeyError(f"버전 id 가 여러 개와 일치합니다: {version_id}")
+        return matches[-1]
+
+    # --- 저장 / 복원 ---
+    def save(self, path: str, label: str = "", created_at: Optional[str] = None) -> Optional[Dict]:
+        """파일 현재 내용을 저장합니다 (직전 버전과 같으면 None)"""
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = self._put_object(data)
+
+        history = self.versions(path)
+        if history and history[-1]["sha256"] == digest:
+            return None
+
+        entry = _entry(path, digest, len(data), created_at or datetime.now().isoformat(timespec="seconds"), label)
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+    def restore(self, version_id: str, target: Optional[str] = None) -> Dict:
+        """버전을 원래 경로(또는 target)에 복원합니다 (덮어쓰기 전 현재 내용도 저장)"""
+        version = self.find(version_id)
+        target = target or version["path"]
+        if os.path.exists(target):
+            self.save(target, label=PRE_RESTORE_LABEL)
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(self.read(version))
+        return version
+
+    # --- 보존 정책 ---
+    def prune(self, keep_last: int = KEEP_LAST, keep_days: int = KEEP_DAYS) -> Dict[str, int]:
+        """파일별로 최근 keep_last 개 또는 keep_days 일 이내 버전만 남기고, 참조 없는 객체를 지웁니다"""
+        entries = self.versions()
+        cutoff = (datetime.now() - timedelta(days=keep_days)).isoformat(timespec="seconds")
+        by_path: Dict[str, List[Dict]] = {}
+        for entry in entries:
+            by_path.setdefault(entry["path"], []).append(entry)
+
+        kept_ids = set()
+        for history in by_path.values():
+            recent = history[-keep_last:] if keep_last > 0 else []
+            kept_ids.update(e["id"] for e in recent)
+            kept_ids.update(e["id"] for e in history if e["created_at"] >= cutoff)
+        kept = [e for e in entries if e["id"] in kept_ids]
+
+        removed_objects, freed = 0, 0
+        referenced = {e["sha256"] for e in kept}
+        for object_path in glob.glob(os.path.join(self.root, "objects", "*", "*.gz")):
+            if os.path.basename(object_path)[:-3] not in referenced:
+                freed += os.path.getsize(object_path)
+                os.remove(object_path)
+                removed_objects += 1
+
+        if len(kept) != len(entries):
+            self._write_index(kept)
+        return {"versions": len(entries) - len(kept), "objects": removed_objects, "bytes": freed}
+
+    def disk_usage(self) -> int:
+        return sum(os.path.getsize(p) for p in glob.glob(os.path.join(self.root, "objects", "*", "*.gz")))
+
+    # --- 예전 사본 가져오기 ---
+    def import_legacy(self, folder: str, delete: bool = True) -> int:
+        """*.backup_YYYYMMDD_HHMMSS 사본을 시각 순서대로 저장소에 넣고 (선택) 사본을 지웁니다"""
+        found = []
+        for pattern in LEGACY_GLOBS:
+            for path in glob.glob(os.path.join(folder, pattern)):
+                match = LEGACY_PATTERN.match(path)
+                if match:
+                    stamp = datetime.strptime(match.group("stamp"), "%Y%m%d_%H%M%S")
+                    found.append((stamp, path, match.group("original")))
+
+        imported = 0
+        for stamp, path, original in sorted(set(found)):
+            version = self._save_as(path, original, stamp.isoformat(timespec="seconds"))
+            imported += version is not None
+            if delete:
+                os.remove(path)
+        return imported
+
+    def _save_as(self, source: str, original: str, created_at: str) -> Optional[Dict]:
+        """source 파일 내용을 original 경로의 버전으로 저장합니다"""
+        with open(source, "rb") as f:
+            data = f.read()
+        digest = self._put_object(data)
+        if any(e["sha256"] == digest for e in self.versions(original)):
+            return None
+        entry = _entry(original, digest, len(data), created_at, "legacy")
+        entries = self.versions() + [entry]
+        entries.sort(key=lambda e: e["created_at"])
+        self._write_index(entries)
+        return entry
+
+
+_default_store: Optional[BackupStore] = None
+
+
+def default_store() -> BackupStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = BackupStore()
+    return _default_store
+
+
+def backup_file(path: str, label: str = "") -> Optional[Dict]:
+    """덮어쓰기 전 원본 백업 (같은 내용이면 새로 저장하지 않음)"""
+    store = default_store()
+    version = store.save(path, label=label)
+    if version is None:
+        print(f"백업 생략 (직전 백업과 동일): {path}")
+    else:
+        print(f"백업 생성: {path} → 버전 {version['id']}")
+    store.prune()
+    return version
+
+
+def print_versions(versions: List[Dict]) -> None:
+    if not versions:
+        print("📭 저장된 백업이 없습니다.")
+        return
+    current_path = None
+    for version in versions:
+        if version["path"] != current_path:
+            current_path = version["path"]
+            print(f"\n📄 {current_path}")
+        label = f" [{version['label']}]" if version.get("label") else ""
+        print(f"  {version['id']}  {version['created_at']}  {version['size']:,} bytes{label}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="텍스트 파일 백업 저장소")
+    sub = parser.add_subparsers(dest="action", required=True)
+
+    list_parser = sub.add_parser("list", help="버전 목록")
+    list_parser.add_argument("path", nargs="?", help="특정 파일만")
+
+    restore = sub.add_parser("restore", help="버전 복원")
+    restore.add_argument("version_id")
+    restore.add_argument("--to", help="복원할 경로 (기본: 원래 경로)")
+
+    prune = sub.add_parser("prune", help="보존 정책 적용")
+    prune.add_argument("--keep-last", type=int, default=KEEP_LAST)
+    prune.add_argument("--keep-days", type=int, default=KEEP_DAYS)
+
+    legacy = sub.add_parser("import-legacy", help="*.backup_* 사본을 저장소로 옮기기")
+    legacy.add_argument("folder", nargs="?", default="questionbank/cr")
+
+    args = parser.parse_args()
+    store = default_store()
+
+    if args.action == "list":
+        versions = store.versions(args.path)
+        print_versions(sorted(versions, key=lambda v: v["path"]))
+        print(f"\n💾 저장소 크기: {store.disk_usage():,} bytes ({len(versions)}개 버전)")
+    elif args.action == "restore":
+        try:
+            version = store.restore(args.version_id, args.to)
+        except KeyError as e:
+            print(f"❌ {e.args[0]}")
+            return False
+        print(f"✅ 복원 완료: {version['id']} ({version['created_at']}) → {args.to or version['path']}")
+    elif args.action == "prune":
+        result = store.prune(args.keep_last, args.keep_days)
+        print(f"🗑️ 버전 {result['versions']}개, 객체 {result['objects']}개 삭제 ({result['bytes']:,} bytes)")
+    else:
+        imported = store.import_legacy(args.folder)
+        print(f"📥 예전 백업 {imported}개 버전 가져옴 (중복 제외)")
+
+
+if __name__ == "__main__":
+    main()
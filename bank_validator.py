@@ -0,0 +1,210 @@
+import argparse
+import json
+import re
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from question_bank import DEFAULT_FILES, LETTERS, BankQuestion, load_files, needs_explanation
+
+# ✅ 문제은행 검증 엔진
+# 정규화된 문제 목록(question_bank.BankQuestion)을 한 번 훑으면서 규칙을 모두 적용하고
+# 기계가 읽을 수 있는 JSON 리포트를 만듭니다.
+# 규칙은 RULES 에 (이름, 심각도, 함수) 로 등록하며, 함수는 문제 하나를 받아
+# 문제가 있으면 메시지, 없으면 None 을 반환합니다.
+
+DEFAULT_REPORT = 'validation_report.json'
+
+HANGUL_PATTERN = re.compile(r'[가-힣]')
+LETTER_PATTERN = re.compile(r'[A-Za-z가-힣]')
+
+# 한국어 해설에서 한글 비율이 이보다 낮으면 / 영어 텍스트에서 이보다 높으면 언어 불일치
+MIN_KO_HANGUL_RATIO = 0.2
+MAX_EN_HANGUL_RATIO = 0.05
+
+# 포맷팅 과정에서 본문이 유실되기 쉬웠던 문제들 (format_questions_v5 검증에서 이동)
+EXPECTED_KEYWORDS = {
+    ("cr", 145): "safety levers",
+    ("cr", 157): "European wild deer",
+    ("cr", 173): "Thymosin beta-4",
+    ("cr", 288): "Vebrol Corporation",
+}
+
+
+@dataclass
+class Issue:
+    rule: str
+    severity: str
+    key: str
+    message: str
+
+
+@dataclass
+class ValidationReport:
+    total: int = 0
+    issues: List[Issue] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def error_count(self) -> int:
+        return sum(1 for issue in self.issues if issue.severity == "error")
+
+    def by_rule(self) -> Dict[str, int]:
+        return dict(Counter(issue.rule for issue in self.issues))
+
+    def to_dict(self) -> Dict:
+        return {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "total": self.total,
+            "issue_count": len(self.issues),
+            "error_count": self.error_count,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "by_rule": self.by_rule(),
+            "issues": [asdict(issue) for issue in self.issues],
+        }
+
+
+def hangul_ratio(text: str) -> float:
+    """문자(영문/한글) 중 한글 비율"""
+    letters = LETTER_PATTERN.findall(text or '')
+    if not letters:
+        return 0.0
+    return sum(1 for ch in letters if HANGUL_PATTERN.match(ch)) / len(letters)
+
+
+def check_choice_count(q: BankQuestion) -> Optional[str]:
+    if len(q.choices) != 5:
+        return f"보기가 5개가 아닙니다 ({len(q.choices)}개)"
+    empty = [LETTERS[i] for i, choice in enumerate(q.choices) if not choice.strip()]
+    if empty:
+        return f"빈 보기: {', '.join(empty)}"
+    return None
+
+
+def check_empty_stem(q: BankQuestion) -> Optional[str]:
+    if not q.question.strip():
+        return "본문이 비어 있습니다"
+    return None
+
+
+def check_answer(q: BankQuestion) -> Optional[str]:
+    if q.answer is None:
+        return "정답이 없습니다"
+    if q.answer not in LETTERS:
+        return f"정답이 A~E 가 아닙니다 ({q.answer!r})"
+    return None
+
+
+def check_explanation_placeholder(q: BankQuestion) -> Optional[str]:
+    # 텍스트 파일 출처는 해설이 없으므로(None) 검사하지 않음
+    missing = [name for name, text in (("explanation", q.explanation), ("explanation_en", q.explanation_en))
+               if text is not None and needs_explanation(text)]
+    if missing:
+        return f"해설 없음/자리표시자: {', '.join(missing)}"
+    return None
+
+
+def check_language(q: BankQuestion) -> Optional[str]:
+    problems = []
+    if hangul_ratio(q.question) > MAX_EN_HANGUL_RATIO:
+        problems.append("본문에 한글")
+    if q.explanation and not needs_explanation(q.explanation) and hangul_ratio(q.explanation) < MIN_KO_HANGUL_RATIO:
+        problems.append("한국어 해설이 한국어가 아님")
+    if q.explanation_en and not needs_explanation(q.explanation_en) and hangul_ratio(q.explanation_en) > MAX_EN_HANGUL_RATIO:
+        problems.append("영어 해설에 한글")
+    return ", ".join(problems) or None
+
+
+def check_expected_keyword(q: BankQuestion) -> Optional[str]:
+    keyword = EXPECTED_KEYWORDS.get((q.source, q.number))
+    if keyword and keyword not in q.question:
+        return f"본문에 '{keyword}' 가 없습니다 (본문 유실 의심)"
+    return None
+
+
+# (이름, 심각도, 규칙)
+RULES: List[tuple] = [
+    ("choice_count", "error", check_choice_count),
+    ("empty_stem", "error", check_empty_stem),
+    ("answer", "error", check_answer),
+    ("explanation_placeholder", "warning", check_explanation_placeholder),
+    ("language", "warning", check_language),
+    ("expected_keyword", "error", check_expected_keyword),
+]
+
+
+def validate_bank(questions: List[BankQuestion],
+                  rules: Optional[List[tuple]] = None) -> ValidationReport:
+    """모든 문제에 규칙을 적용하고, 출처별 문제 번호 중복을 함께 검사합니다"""
+    started = time.perf_counter()
+    rules = RULES if rules is None else rules
+    report = ValidationReport(total=len(questions))
+
+    key_counts = Counter(q.key for q in questions)
+    for q in questions:
+        for name, severity, rule in rules:
+            message = rule(q)
+            if message:
+                report.issues.append(Issue(name, severity, q.key, message))
+    for key, count in key_counts.items():
+        if count > 1:
+            report.issues.append(Issue("duplicate_number", "error", key, f"같은 번호가 {count}번 있습니다"))
+
+    report.elapsed_ms = (time.perf_counter() - started) * 1000
+    return report
+
+
+def print_report(report: ValidationReport, limit: int = 30) -> None:
+    print("\n" + "=" * 60)
+    print(f"🔍 검증 결과: {report.total}개 문제, 문제점 {len(report.issues)}개 "
+          f"(오류 {report.error_count}개, {report.elapsed_ms:.0f}ms)")
+    print("=" * 60)
+    for rule, count in sorted(report.by_rule().items(), key=lambda x: -x[1]):
+        print(f"  - {rule}: {count}개")
+    for issue in report.issues[:limit]:
+        mark = "❌" if issue.severity == "error" else "⚠️"
+        print(f"  {mark} {issue.key} [{issue.rule}] {issue.message}")
+    if len(report.issues) > limit:
+        print(f"  … 나머지 {len(report.issues) - limit}개는 리포트 파일 참고")
+    if not report.issues:
+        print("✅ 모든 규칙을 통과했습니다!")
+
+
+def save_report(report: ValidationReport, path: str = DEFAULT_REPORT) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+    print(f"💾 리포트 저장: {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문제은행 일괄 검증")
+    parser.add_argument("--db", action="store_true", help="텍스트 파일 대신 questions 테이블 검증")
+    parser.add_argument("--type", help="--db 사용 시 type 필터 (예: cr, LSAT)")
+    parser.add_argument("--source", choices=sorted(DEFAULT_FILES), action="append",
+                        help="검증할 파일 출처 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument("--report", default=DEFAULT_REPORT, help="JSON 리포트 경로")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("문제은행 검증")
+    print("=" * 60)
+
+    if args.db:
+        from question_bank import load_db
+        from storage import get_client
+        questions = load_db(get_client(service_role=True), args.type)
+        print(f"📖 questions 테이블 → {len(questions)}개 문제")
+    else:
+        files = {source: DEFAULT_FILES[source] for source in (args.source or DEFAULT_FILES)}
+        questions = load_files(files)
+
+    report = validate_bank(questions)
+    print_report(report)
+    save_report(report, args.report)
+    return report.error_count == 0
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,46 @@
 import os
+import re
 from datetime import datetime
 from dotenv import load_dotenv
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, BotCommand
-from telegram.ext import Updater, CommandHandler, CallbackQueryHandler, CallbackContext
-from supabase import create_client, Client
+from telegram import Update, BotCommand
+from telegram.ext import Updater, CommandHandler, CallbackQueryHandler, CallbackContext, MessageHandler, Filters
+from storage import get_client
+from review_scheduler import ReviewScheduler
+from question_catalog import QuestionCatalog, display_number
+from live_explanation import LiveExplainer
+from question_bank import needs_explanation
+import practice_session
+from practice_session import correct_choice
+from user_progress import get_all_progress, get_progress, ALL_TYPES
+import leaderboard as ranking
+from question_analytics import accuracy_text
 
 # 🔐 Load environment variables
 load_dotenv()
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# 🔗 Connect to Supabase
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# 🔗 Connect to Supabase (공용 클라이언트, 첫 요청 시 연결)
+supabase = get_client()
+
+# 📚 문제 카탈로그 (메시지 본문/키보드 사전 렌더링)
+catalog = QuestionCatalog(supabase)
+
+# 📅 틀린 문제 복습 스케줄러
+review_scheduler = ReviewScheduler(supabase)
+
+# 🏆 유형별 랭킹 (user_progress 스냅샷, TTL 마다 갱신)
+leaderboard = ranking.Leaderboard(supabase)
+
+# 🔗 /q<번호> 링크 (/search, /practice 결과에서 탭, 그룹에서는 /q141@봇이름)
+QUESTION_LINK_PATTERN = r'^/q(\d+)(?:@\w+)?$'
+
+# 🔎 /search 결과 개수
+SEARCH_RESULT_LIMIT = 10
+
+# 💡 해설 없는 문제는 풀이 시 실시간 생성 (OPENAI_API_KEY 있을 때만)
+# 해설 저장은 RLS 에 막히지 않도록 service role 키 사용 (없으면 SUPABASE_KEY)
+live_explainer = LiveExplainer(get_client(service_role=True), catalog) if OPENAI_API_KEY else None
 
 # 🧾 Telegram 명령어 등록
 def set_bot_commands(updater: Updater):
@@ -20,7 +48,12 @@ def set_bot_commands(updater: Updater):
         BotCommand("start", "봇 시작 및 명령어 안내"),
         BotCommand("q", "다음 문제 풀기"),
         BotCommand("wrong", "틀린 문제 목록 보기"),
+        BotCommand("review", "틀린 문제 복습하기"),
+        BotCommand("search", "키워드로 문제 검색"),
+        BotCommand("practice", "시간 제한 연습 (예: /practice CR 10 20)"),
         BotCommand("stats", "내 문제 풀이 통계 보기"),
+        BotCommand("rank", "내 순위와 백분위 (예: /rank CR)"),
+        BotCommand("leaderboard", "상위 랭킹 (예: /leaderboard CR volume)"),
         BotCommand("help", "전체 명령어 설명 보기")
     ]
     updater.bot.set_my_commands(commands)
@@ -33,7 +66,12 @@ def start(update: Update, context: CallbackContext) -> None:
         "/q - 문제 받기\n"
         "/q12 - 특정 문제 번호로\n"
         "/wrong - 틀린 문제 보기\n"
+        "/review - 틀린 문제 복습\n"
+        "/search 키워드 - 문제 검색\n"
+        "/practice CR 10 20 - CR 10문제 20분 연습\n"
         "/stats - 통계 보기\n"
+        "/rank - 내 순위\n"
+        "/leaderboard - 상위 랭킹\n"
         "/help - 명령어 전체 보기"
     )
 
@@ -44,7 +82,12 @@ def help_command(update: Update, context: CallbackContext) -> None:
         "/q - 다음 문제 받기\n"
         "/q12 - 12번 문제처럼 특정 번호로 이동\n"
         "/wrong - 내가 틀린 문제들\n"
+        "/review - 복습할 때가 된 틀린 문제 풀기\n"
+        "/search 키워드 - 본문/보기/해설에서 문제 검색 (한글·영어)\n"
+        "/practice [유형] [문제 수] [분] - 시간 제한 연습 세션 (기본 CR 10문제 20분)\n"
         "/stats - 문제 풀이 통계\n"
+        "/rank [유형] - 정답률/풀이 수 순위와 백분위\n"
+        "/leaderboard [유형] [accuracy|volume] [N] - 상위 N명\n"
         "/help - 이 도움말 보기"
     )
     update.message.reply_text(text)
@@ -61,48 +104,179 @@ def send_question(update: Update, context: CallbackContext) -> None:
             .execute()
         answered_ids = {row["question_id"] for row in answered_rows.data if row["question_id"]}
 
-        questions = supabase.table("questions") \
-            .select("*") \
-            .order("question_number", desc=False) \
-            .execute()
-
         question = None
         if message.startswith("/q") and len(message) > 2:
-            try:
-                num = int(message[2:])
-                question = next((q for q in questions.data if q["question_number"] == num), None)
-                if not question:
-                    update.message.reply_text(f"{num}번 문제를 찾을 수 없습니다.")
-                    return
-            except:
+            match = re.match(QUESTION_LINK_PATTERN, message) or re.match(r'^/q(?:@\w+)?\s+(\d+)\s*$', message)
+            if not match:
                 update.message.reply_text("문제 번호를 잘못 입력했습니다. 예: /q12")
                 return
+            num = int(match.group(1))
+            question = catalog.by_number(num)
+            if not question:
+                update.message.reply_text(f"{num}번 문제를 찾을 수 없습니다.")
+                return
         else:
-            question = next((q for q in questions.data if q["id"] not in answered_ids), None)
+            question = catalog.first_unanswered(answered_ids)
             if not question:
                 update.message.reply_text("👏 모든 문제를 푸셨습니다!")
                 return
 
-        context.user_data["current_question"] = question
-        context.user_data["start_time"] = datetime.now()
-        context.user_data["question_id"] = question["id"]
+        reply_with_question(update, context, question)
 
-        q_number = question.get("question_number", "?")
-        q_text = question['question'].replace('\n', ' ').strip()
-        text = f"*문제 {q_number}:*\n{q_text}\n\n"
+    except Exception as e:
+        update.message.reply_text(f"문제를 불러오는 중 오류 발생\n{str(e)}")
+
+# 📨 문제 메시지 전송 (/q, /review 공용)
+def reply_with_question(update: Update, context: CallbackContext, question: dict, header: str = "") -> None:
+    context.user_data["current_question"] = question
+    context.user_data["start_time"] = datetime.now()
+    context.user_data["question_id"] = question["id"]
 
-        choices = question["choices"]
-        for i, choice in enumerate(choices):
-            # DB에는 순수한 텍스트만 저장되어 있으므로 A. B. 등을 붙여줌
-            text += f"{chr(65+i)}. {choice.strip()}\n"
+    rendered = catalog.rendered(question)
+    text = header + rendered.text if header else rendered.text
+    update.message.reply_text(text, parse_mode='Markdown', reply_markup=rendered.reply_markup)
 
-        keyboard = [[InlineKeyboardButton(f"{chr(65+i)}", callback_data=str(i+1)) for i in range(5)]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+# 🔁 /review
+def review(update: Update, context: CallbackContext) -> None:
+    user_id = str(update.effective_user.id)
+    try:
+        item = review_scheduler.next_due(user_id)
+        if not item:
+            upcoming = review_scheduler.upcoming(user_id)
+            if upcoming:
+                update.message.reply_text(f"⏳ 지금 복습할 문제가 없습니다.\n다음 복습: {upcoming.strftime('%Y-%m-%d %H:%M')}")
+            else:
+                update.message.reply_text("🥳 복습할 틀린 문제가 없습니다!")
+            return
 
-        update.message.reply_text(text, parse_mode='Markdown', reply_markup=reply_markup)
+        question = catalog.get(item.question_id)
+        if not question:
+            update.message.reply_text("복습 문제를 찾을 수 없습니다.")
+            return
 
+        remaining = review_scheduler.due_count(user_id)
+        reply_with_question(update, context, question, header=f"🔁 복습 ({remaining}개 남음)\n")
     except Exception as e:
-        update.message.reply_text(f"문제를 불러오는 중 오류 발생\n{str(e)}")
+        update.message.reply_text(f"복습 문제를 불러오는 중 오류 발생\n{str(e)}")
+
+# 🔎 /search <키워드>
+def search(update: Update, context: CallbackContext) -> None:
+    query = " ".join(context.args or []).strip()
+    if not query:
+        update.message.reply_text("검색어를 입력해주세요. 예: /search 재정적자 또는 /search wild deer")
+        return
+
+    try:
+        hits = catalog.search(query, limit=SEARCH_RESULT_LIMIT)
+        if not hits:
+            update.message.reply_text(f"🔎 '{query}' 검색 결과가 없습니다.")
+            return
+
+        lines = [f"🔎 '{query}' 검색 결과 {len(hits)}개:"]
+        for hit in hits:
+            lines.append(f"\n/q{display_number(hit.question)} - {hit.snippet}")
+        update.message.reply_text("\n".join(lines))
+    except Exception as e:
+        update.message.reply_text(f"검색 중 오류 발생\n{str(e)}")
+
+# 🏃 /practice [유형] [문제 수] [분]
+def practice(update: Update, context: CallbackContext) -> None:
+    user_id = str(update.effective_user.id)
+    args = context.args or []
+    usage = "사용법: /practice CR 10 20 (유형, 문제 수, 제한 시간(분))"
+    try:
+        question_type = args[0] if args else practice_session.DEFAULT_TYPE
+        count = int(args[1]) if len(args) > 1 else practice_session.DEFAULT_COUNT
+        minutes = int(args[2]) if len(args) > 2 else practice_session.DEFAULT_MINUTES
+    except ValueError:
+        update.message.reply_text(usage)
+        return
+    if not (1 <= count <= practice_session.MAX_COUNT and 1 <= minutes <= practice_session.MAX_MINUTES):
+        update.message.reply_text(f"{usage}\n문제 수는 1~{practice_session.MAX_COUNT}, "
+                                  f"시간은 1~{practice_session.MAX_MINUTES}분까지 가능합니다.")
+        return
+
+    # 진행 중인 세션이 있으면 기록하고 종료
+    previous = context.user_data.get("practice")
+    if previous:
+        finish_practice(context.bot, update.effective_chat.id, previous)
+
+    try:
+        answered_rows = supabase.table("user_answers") \
+            .select("question_id") \
+            .eq("user_id", user_id) \
+            .execute()
+        answered_ids = {row["question_id"] for row in answered_rows.data if row["question_id"]}
+
+        session = practice_session.start_session(catalog, user_id, question_type, count, minutes, answered_ids)
+        if not session:
+            update.message.reply_text(f"'{question_type}' 유형의 문제를 찾을 수 없습니다.")
+            return
+    except Exception as e:
+        update.message.reply_text(f"연습 세션을 준비하는 중 오류 발생\n{str(e)}")
+        return
+
+    context.user_data["practice"] = session
+    context.job_queue.run_once(
+        practice_timeout,
+        session.time_limit.total_seconds(),
+        context=(update.effective_chat.id, session),
+    )
+
+    update.message.reply_text(
+        f"🏃 {session.question_type} {len(session.questions)}문제 · 제한 시간 {minutes}분 연습을 시작합니다!"
+    )
+    rendered = session.current()
+    update.message.reply_text(rendered.text, parse_mode='Markdown', reply_markup=rendered.reply_markup)
+
+# 🏁 연습 세션 종료 - 답안을 한 번에 저장하고 결과 전송
+def finish_practice(bot, chat_id, session) -> None:
+    if not session.claim_finish():
+        return
+    try:
+        practice_session.flush_answers(supabase, session, review_scheduler)
+        note = ""
+    except Exception as e:
+        print(f"❌ Practice answers insert failed: {str(e)}")
+        note = "\n\n⚠️ 답안 저장 중 오류가 발생했습니다."
+    bot.send_message(chat_id, session.summary() + note)
+
+def practice_timeout(context: CallbackContext) -> None:
+    chat_id, session = context.job.context
+    if not session.finished:
+        context.bot.send_message(chat_id, "⌛ 연습 시간이 끝났습니다!")
+    finish_practice(context.bot, chat_id, session)
+
+# 🔘 연습 세션 버튼 (callback_data = "p:<세션ID>:<보기 번호>")
+def handle_practice_button(update: Update, context: CallbackContext) -> None:
+    query = update.callback_query
+    query.answer()
+
+    session_id, selected = practice_session.parse_callback(query.data)
+    session = context.user_data.get("practice")
+    query.edit_message_reply_markup(reply_markup=None)
+
+    if not session or session.session_id != session_id or session.finished:
+        query.message.reply_text("이미 종료된 연습 세션입니다. /practice 로 새로 시작하세요.")
+        return
+    if session.expired():
+        finish_practice(context.bot, query.message.chat_id, session)
+        return
+
+    answer = session.record(selected)
+    if answer.is_correct:
+        mark = "✅ 정답입니다!"
+    else:
+        correct = correct_choice(answer.question)
+        mark = f"❌ 오답입니다. (정답: {chr(64 + correct) if correct else '?'})"
+
+    if session.done:
+        query.message.reply_text(mark)
+        finish_practice(context.bot, query.message.chat_id, session)
+        return
+
+    rendered = session.current()
+    query.message.reply_text(f"{mark}\n\n{rendered.text}", parse_mode='Markdown', reply_markup=rendered.reply_markup)
 
 # 🔘 버튼 선택
 def handle_button(update: Update, context: CallbackContext) -> None:
@@ -119,12 +293,13 @@ def handle_button(update: Update, context: CallbackContext) -> None:
         query.edit_message_text("먼저 /q 명령어로 문제를 받아주세요.")
         return
 
-    correct = int(question["answer"])
+    correct = correct_choice(question)
     is_correct = selected == correct
     submitted_at = datetime.now()
-    qn = question.get("question_number", "?")
-    explanation = question.get("explanation", "설명 없음")
-    correct_letter = chr(64 + correct)
+    qn = display_number(question) or "?"
+    explanation = question.get("explanation") or "설명 없음"
+    generate_live = live_explainer is not None and needs_explanation(explanation)
+    correct_letter = chr(64 + correct) if correct else "?"
     duration = submitted_at - start_time
     duration_sec = duration.total_seconds()
 
@@ -134,20 +309,23 @@ def handle_button(update: Update, context: CallbackContext) -> None:
             "question_id": question_id,
             "user_answer": selected,
             "is_correct": is_correct,
-            "started_at": start_time.isoformat(),
-            "submitted_at": submitted_at.isoformat(),
-            "answered_at": submitted_at.isoformat()
+            "started_at": start_time.astimezone().isoformat(),
+            "submitted_at": submitted_at.astimezone().isoformat(),
+            "answered_at": submitted_at.astimezone().isoformat()
         }).execute()
     except Exception as e:
         print(f"❌ DB Insert Failed: {str(e)}")
 
-    # 진척도
+    # 복습 스케줄 갱신
     try:
-        total = len(supabase.table("questions").select("id").execute().data)
-        answered = supabase.table("user_answers") \
-            .select("question_id") \
-            .eq("user_id", user_id).execute().data
-        progress = len({row["question_id"] for row in answered})
+        review_scheduler.record_answer(user_id, question_id, is_correct, start_time, submitted_at)
+    except Exception as e:
+        print(f"❌ Review schedule update failed: {str(e)}")
+
+    # 진척도 (user_progress 행은 답안 insert 시 트리거가 갱신)
+    total = len(catalog)
+    try:
+        progress = get_progress(supabase, user_id).answered
     except:
         progress = "?"
 
@@ -156,13 +334,21 @@ def handle_button(update: Update, context: CallbackContext) -> None:
         f"📘 문제 {qn}번\n"
         f"당신의 선택: {chr(64+selected)}\n"
         f"{'✅ 정답입니다!' if is_correct else '❌ 오답입니다.'}\n\n"
-        f"📝 해설: {explanation.strip()}\n\n"
+        f"📝 해설: {'아래 메시지에서 생성 중...' if generate_live else explanation.strip()}\n\n"
         f"(풀이 시간: {mins}분 {secs}초)\n"
         f"(현재 {progress}/{total} 문제 풀이 완료)"
     )
-    query.edit_message_text(query.message.text_markdown_v2, parse_mode='MarkdownV2')
+    crowd = accuracy_text(question)
+    if crowd:
+        result_text += f"\n{crowd}"
+    # 본문은 그대로 두고 보기 버튼만 제거 (메시지 재렌더링 불필요)
+    query.edit_message_reply_markup(reply_markup=None)
     query.message.reply_text(result_text)
 
+    if generate_live:
+        live_message = query.message.reply_text("📝 해설 생성 중...")
+        live_explainer.explain_into_message(live_message, question)
+
 # ❌ /wrong
 def wrong_answers(update: Update, context: CallbackContext) -> None:
     user_id = str(update.effective_user.id)
@@ -191,14 +377,64 @@ def wrong_answers(update: Update, context: CallbackContext) -> None:
 def stats(update: Update, context: CallbackContext) -> None:
     user_id = str(update.effective_user.id)
     try:
-        rows = supabase.table("user_answers").select("is_correct").eq("user_id", user_id).execute().data
-        total = len(rows)
-        correct = sum(1 for r in rows if r["is_correct"])
-        percent = round((correct / total) * 100)
-        update.message.reply_text(f"✅ 맞은 문제: {correct}/{total} ({percent}%)")
+        rows = {p.question_type: p for p in get_all_progress(supabase, user_id)}
+        overall = rows.pop(ALL_TYPES, None)
+        if overall is None or not overall.attempts:
+            update.message.reply_text("아직 푼 문제가 없습니다. /q 로 시작해보세요!")
+            return
+
+        lines = [
+            f"✅ 맞은 문제: {overall.correct}/{overall.attempts} ({round(overall.accuracy * 100)}%)",
+            f"📘 푼 문제: {overall.answered}개",
+            f"🔥 연속 정답: {overall.streak} (최고 {overall.best_streak})",
+        ]
+        for qtype, p in sorted(rows.items()):
+            lines.append(f"  · {qtype.upper()}: {p.correct}/{p.attempts} ({round(p.accuracy * 100)}%)")
+        update.message.reply_text("\n".join(lines))
     except:
         update.message.reply_text("통계 조회 중 오류가 발생했습니다.")
 
+# 🏆 /rank [유형]
+def rank(update: Update, context: CallbackContext) -> None:
+    user_id = str(update.effective_user.id)
+    question_type, _, _ = ranking.parse_args(context.args or [])
+    try:
+        progress = get_progress(supabase, user_id, question_type)
+        if not progress.attempts:
+            update.message.reply_text("아직 푼 문제가 없습니다. /q 로 시작해보세요!")
+            return
+
+        scope = "전체" if question_type == ALL_TYPES else question_type.upper()
+        lines = [f"🏆 {scope} 내 순위"]
+        for name, metric in ranking.METRICS.items():
+            info = leaderboard.rank(progress, name)
+            if info is None:
+                lines.append(f"· {metric.label}: {metric.min_attempts}문제 이상 풀면 집계됩니다 (현재 {progress.attempts})")
+            else:
+                lines.append(f"· {metric.label}: {info.rank}/{info.total}위 · 상위 {round(100 - info.percentile, 1)}% · {info.value}")
+        update.message.reply_text("\n".join(lines))
+    except Exception as e:
+        update.message.reply_text(f"순위 조회 중 오류 발생\n{str(e)}")
+
+# 🏆 /leaderboard [유형] [accuracy|volume] [N]
+def leaderboard_command(update: Update, context: CallbackContext) -> None:
+    user_id = str(update.effective_user.id)
+    question_type, metric, limit = ranking.parse_args(context.args or [])
+    try:
+        top = leaderboard.top(question_type, metric, limit)
+        scope = "전체" if question_type == ALL_TYPES else question_type.upper()
+        label = ranking.METRICS[metric].label
+        if not top:
+            update.message.reply_text(f"🏆 {scope} {label} 랭킹에 아직 집계된 유저가 없습니다.")
+            return
+
+        lines = [f"🏆 {scope} {label} TOP {len(top)}"]
+        for i, p in enumerate(top, 1):
+            lines.append(f"{i}. {ranking.display_name(p.user_id, user_id)} - {ranking.METRICS[metric].format(p)}")
+        update.message.reply_text("\n".join(lines))
+    except Exception as e:
+        update.message.reply_text(f"리더보드 조회 중 오류 발생\n{str(e)}")
+
 # ▶️ main
 def main():
     print("🤖 GMAT CR 봇 시작...")
@@ -206,13 +442,23 @@ def main():
     dp = updater.dispatcher
 
     set_bot_commands(updater)
+    catalog.refresh()
 
     dp.add_handler(CommandHandler("start", start))
     dp.add_handler(CommandHandler("q", send_question))
+    # /q141 같은 링크는 CommandHandler("q") 에 걸리지 않으므로 정규식으로 따로 받음
+    dp.add_handler(MessageHandler(Filters.regex(QUESTION_LINK_PATTERN), send_question))
     dp.add_handler(CommandHandler("wrong", wrong_answers))
+    dp.add_handler(CommandHandler("review", review))
+    dp.add_handler(CommandHandler("search", search))
+    dp.add_handler(CommandHandler("practice", practice))
     dp.add_handler(CommandHandler("stats", stats))
+    dp.add_handler(CommandHandler("rank", rank))
+    dp.add_handler(CommandHandler("leaderboard", leaderboard_command))
     dp.add_handler(CommandHandler("help", help_command))
-    dp.add_handler(CallbackQueryHandler(handle_button))
+    # 실시간 해설 스트리밍 동안 다른 업데이트 처리가 막히지 않도록 비동기 실행
+    dp.add_handler(CallbackQueryHandler(handle_practice_button, pattern=practice_session.CALLBACK_PATTERN))
+    dp.add_handler(CallbackQueryHandler(handle_button, pattern=r"^\d+$", run_async=True))
 
     updater.start_polling()
     updater.idle()
@@ -0,0 +1,44 @@
+-- 🚚 대량 업데이트 RPC (storage/bulk.py, mode="rpc")
+-- payload: [{"id": "...", "answer": "B"}, {"id": "...", "explanation": "..."}, ...]
+-- payload 에 있는 필드만 덮어쓰고 나머지 컬럼은 기존 값을 유지합니다.
+CREATE OR REPLACE FUNCTION bulk_update_questions(payload jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    updated integer;
+BEGIN
+    UPDATE questions AS q
+    SET (question, choices, answer, explanation, explanation_en) = (
+        SELECT r.question, r.choices, r.answer, r.explanation, r.explanation_en
+        FROM jsonb_populate_record(q, item) AS r
+    )
+    FROM jsonb_array_elements(payload) AS item
+    WHERE q.id = (item->>'id')::uuid;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$;
+
+-- 🔑 정답 키 일괄 동기화 (upload_lsat_to_supabase.py sync-answers)
+-- payload: [{"q_number": 1000, "answer": "B"}, ...] 를 한 번에 받아 q_number 로 매칭합니다.
+-- 답이 실제로 바뀐 행만 갱신하고 그 수를 반환합니다.
+CREATE OR REPLACE FUNCTION sync_answers_by_q_number(payload jsonb, question_type text DEFAULT 'LSAT')
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    updated integer;
+BEGIN
+    UPDATE questions AS q
+    SET answer = item->>'answer'
+    FROM jsonb_array_elements(payload) AS item
+    WHERE q.type = question_type
+      AND q.q_number = (item->>'q_number')::integer
+      AND q.answer IS DISTINCT FROM item->>'answer';
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$;
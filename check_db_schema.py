@@ -1,5 +1,5 @@
 import os
-from supabase import create_client
+from storage import get_client
 from dotenv import load_dotenv
 
 # 환경 변수 로드
@@ -9,11 +9,7 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    print("❌ Supabase 환경 변수가 설정되지 않았습니다.")
-    exit(1)
-
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase = get_client(service_role=True)
 
 def check_table_schema():
     """questions 테이블의 스키마를 확인합니다."""
@@ -64,6 +60,10 @@ def main():
     print("=" * 60)
     print("Supabase questions 테이블 스키마 확인")
     print("=" * 60)
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("❌ Supabase 환경 변수가 설정되지 않았습니다.")
+        return
     
     # 1. 테이블 스키마 확인
     columns = check_table_schema()
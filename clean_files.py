@@ -1,9 +1,10 @@
 import re
 import os
-from datetime import datetime
+from backup_store import backup_file
+from content_manifest import ContentManifest
 
-def clean_file_simple(file_path):
-    """파일에서 불필요한 줄들을 제거하는 간단한 방법"""
+def clean_file_simple(file_path, manifest=None):
+    """파일에서 불필요한 줄들을 제거하는 간단한 방법 (manifest: 마지막 정리 후 그대로면 건너뜀)"""
     
     print(f"\n=== {file_path} 처리 시작 ===")
     
@@ -15,6 +16,10 @@ def clean_file_simple(file_path):
         print(f"파일 읽기 오류: {e}")
         return False
     
+    if manifest is not None and manifest.is_current(file_path, content):
+        print("⏭️ 마지막 정리 이후 변경 없음, 건너뜀")
+        return True
+    
     original_lines = content.count('\n') + 1
     print(f"원본 파일: {original_lines}줄")
     
@@ -67,22 +72,16 @@ def clean_file_simple(file_path):
     
     print(f"정리 후: {cleaned_lines}줄 (삭제: {removed_lines}줄)")
     
-    # 백업 생성
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = f"{file_path}.backup_{timestamp}"
-    
     try:
-        # 원본을 백업으로 복사
-        with open(file_path, 'r', encoding='utf-8') as f:
-            original_content = f.read()
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            f.write(original_content)
-        print(f"백업 생성: {backup_path}")
+        # 원본 백업 (backup_store: 같은 내용은 한 번만 저장)
+        backup_file(file_path)
         
         # 정리된 내용을 원본 파일에 저장
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(cleaned_content)
         print(f"파일 저장 완료: {file_path}")
+        if manifest is not None:
+            manifest.record(file_path, cleaned_content)
         
         return True
         
@@ -140,6 +139,7 @@ def main():
     ]
     
     success_count = 0
+    manifest = ContentManifest("clean")
     
     for file_path in files_to_clean:
         if not os.path.exists(file_path):
@@ -147,7 +147,7 @@ def main():
             continue
         
         # 파일 정리
-        if clean_file_simple(file_path):
+        if clean_file_simple(file_path, manifest):
             # 정리 결과 확인
             if verify_cleaning(file_path):
                 success_count += 1
@@ -157,6 +157,9 @@ def main():
         else:
             print(f"❌ {file_path} 정리 실패")
     
+    manifest.save()
+    manifest.print_report()
+    
     print(f"\n" + "=" * 60)
     print(f"전체 결과: {success_count}/{len(files_to_clean)} 파일 성공적으로 정리됨")
     print("=" * 60)
@@ -1,57 +1,34 @@
 import os
-import glob
+
+from backup_store import KEEP_DAYS, KEEP_LAST, default_store
 
 def cleanup_backups():
-    """백업 파일들을 정리합니다"""
+    """예전 방식 백업 사본을 백업 저장소로 옮기고 보존 정책을 적용합니다"""
     
     print("=" * 50)
     print("백업 파일 정리 스크립트")
     print("=" * 50)
     
     cr_folder = 'questionbank/cr'
-    
-    # 백업 파일 패턴들
-    backup_patterns = [
-        '*.backup_*',
-        '*_backup_*',
-        '*.bak'
-    ]
-    
-    backup_files = []
-    for pattern in backup_patterns:
-        backup_files.extend(glob.glob(os.path.join(cr_folder, pattern)))
-    
-    if not backup_files:
-        print("✅ 삭제할 백업 파일이 없습니다.")
-        return
-    
-    print(f"발견된 백업 파일들 ({len(backup_files)}개):")
-    for backup_file in backup_files:
-        file_size = os.path.getsize(backup_file)
-        print(f"  📁 {backup_file} ({file_size:,} bytes)")
-    
-    print("\n정말로 모든 백업 파일을 삭제하시겠습니까?")
-    print("원본 파일들 (CR문제.txt, CR 정답.txt, CR 답 풀이.txt)은 그대로 유지됩니다.")
-    
-    # 자동으로 삭제 (스크립트이므로)
-    deleted_count = 0
-    total_size = 0
-    
-    for backup_file in backup_files:
-        try:
-            file_size = os.path.getsize(backup_file)
-            os.remove(backup_file)
-            print(f"  ✅ 삭제됨: {backup_file}")
-            deleted_count += 1
-            total_size += file_size
-        except Exception as e:
-            print(f"  ❌ 삭제 실패: {backup_file} - {e}")
-    
-    print(f"\n🗑️ 정리 완료!")
-    print(f"  삭제된 파일 수: {deleted_count}개")
-    print(f"  절약된 공간: {total_size:,} bytes ({total_size/1024:.1f}KB)")
+    store = default_store()
+    before = store.disk_usage()
+    
+    # *.backup_YYYYMMDD_HHMMSS 사본 → 저장소 (같은 내용은 한 번만 저장, 사본은 삭제)
+    if os.path.isdir(cr_folder):
+        imported = store.import_legacy(cr_folder)
+        print(f"📥 예전 백업 사본 가져옴: {imported}개 버전 (중복 제외)")
+    
+    # 보존 정책: 파일별 최근 KEEP_LAST 개 또는 KEEP_DAYS 일 이내
+    result = store.prune()
+    print(f"\n🗑️ 정리 완료! (최근 {KEEP_LAST}개 / {KEEP_DAYS}일 이내 유지)")
+    print(f"  삭제된 버전 수: {result['versions']}개")
+    print(f"  삭제된 객체 수: {result['objects']}개")
+    print(f"  절약된 공간: {result['bytes']:,} bytes ({result['bytes']/1024:.1f}KB)")
+    print(f"  저장소 크기: {before:,} → {store.disk_usage():,} bytes")
     
     # 남은 파일들 확인
+    if not os.path.isdir(cr_folder):
+        return
     remaining_files = []
     for file in os.listdir(cr_folder):
         if file.endswith('.txt'):
@@ -64,4 +41,4 @@ def cleanup_backups():
         print(f"  📄 {file} ({file_size:,} bytes)")
 
 if __name__ == "__main__":
-    cleanup_backups() 
\ No newline at end of file
+    cleanup_backups()
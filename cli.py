@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""mBot 관리 도구 통합 CLI
+
+사용 예:
+    python cli.py --help
+    python cli.py format
+    python cli.py schema
+    python cli.py update-answers --dry-run
+    python cli.py startup        # 오프라인 명령 시작 속도 측정
+
+각 하위 명령은 실행될 때만 해당 모듈을 import 하므로
+--help 나 오프라인 명령은 supabase/openai/telegram 을 불러오지 않습니다.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# 하위 명령 → (모듈, 함수, 네트워크 필요 여부, 설명)
+COMMANDS = {
+    # 오프라인 (텍스트 파일 처리)
+    "clean": ("clean_files", "main", False, "CR 문제/정답/해설 파일의 잡데이터 제거"),
+    "clean-lsat": ("clean_lsat_step1", "main", False, "LSAT 원본 파일 잡데이터 제거"),
+    "clean-og": ("clean_og_cr", "clean_og_cr_file", False, "OG CR 파일 정리"),
+    "format": ("format_questions_v5", "main", False, "CR 문제 포맷팅 (v5)"),
+    "format-lsat": ("format_lsat_questions", "main", False, "LSAT 보기 매칭 포맷팅"),
+    "format-lsat-rules": ("lsat_rule_formatter", "main", False, "규칙 기반 LSAT 정리 (신뢰도 보고)"),
+    "format-og": ("format_og_cr", "format_og_cr_problems", False, "OG CR 문제 + 정답 포맷팅"),
+    "add-answers": ("add_answers", "main", False, "CR 문제 파일에 정답 추가"),
+    "cleanup-backups": ("cleanup_backups", "cleanup_backups", False, "예전 백업 사본을 저장소로 옮기고 보존 정책 적용"),
+    "restore-backup": ("restore_backup", "restore_backup", False, "CR문제.txt 백업 복원 (버전 id 선택)"),
+    "backups": ("backup_store", "main", False, "백업 저장소 list / restore / prune"),
+    "validate": ("bank_validator", "main", False, "문제은행 파일 일괄 검증 (--db 로 DB 검증)"),
+    "seed-local": ("seed_local", "main", False, "로컬 저장소(MBOT_STORAGE=sqlite)에 문제은행 적재"),
+    "route-report": ("model_router", "main", False, "모델 라우팅 정책별 예상 비용/시간 (--db 로 DB 기준)"),
+    # 온라인 (Supabase / OpenAI)
+    "schema": ("check_db_schema", "main", True, "questions 테이블 스키마 확인"),
+    "update-answers": ("update_answers_to_text", "main", True, "answer 값을 A~E 텍스트로 변환"),
+    "clean-explanations": ("clean_explanations", "main", True, "해설 칼럼의 태그 패턴 제거"),
+    "gen-ko": ("generate_explanations_ko", "main", True, "품질 점수가 낮은 한국어 해설만 재생성 (--dry-run)"),
+    "explain-quality": ("explanation_quality", "main", True, "해설 품질 점수 리포트 (재생성 대상 선별)"),
+    "gen-en": ("generate_explanations_en", "main", True, "품질 점수가 낮은 영어 해설만 재생성 (--dry-run)"),
+    "format-lsat-ai": ("format_lsat_openai", "main", True, "OpenAI로 LSAT 문제 정리"),
+    "format-lsat-ai-v3": ("format_lsat_openai_v3", "main", True, "OpenAI로 LSAT 문제 정리 (본문/질문 분리)"),
+    "upload-cr": ("upload_to_supabase", "main", True, "CR 문제 + 해설 업로드"),
+    "upload-og": ("upload_og_cr_to_supabase", "main", True, "OG CR 문제 + 해설 업로드"),
+    "upload-lsat": ("upload_lsat_to_supabase", "main", True, "LSAT 문제 업로드"),
+    "sync-lsat-answers": ("upload_lsat_to_supabase", "sync_answers_main", True, "LSAT 답안 파일을 한 번의 요청으로 동기화"),
+    "upload-lsat-explain": ("upload_lsat_with_explanations", "main", True, "LSAT 문제 + 해설 업로드"),
+    "dedupe": ("near_duplicates", "main", True, "유사(중복) 문제 리포트 (--files 로 파일 검사)"),
+    "backfill-progress": ("user_progress", "main", True, "user_answers 로 user_progress 다시 채우기"),
+    "analytics": ("question_analytics", "main", True, "문제별 정답률/보기 분포/변별도 집계"),
+    "snapshot": ("snapshot", "main", True, "DB 스냅샷 export / verify / restore"),
+}
+
+# 오프라인 명령에서 로드되면 안 되는 무거운 모듈
+HEAVY_MODULES = ("supabase", "postgrest", "httpx", "openai", "telegram")
+
+# 오프라인 명령 cold start 허용치 (인터프리터 기동 제외, import 시간 기준)
+STARTUP_BUDGET_MS = float(os.getenv("CLI_STARTUP_BUDGET_MS", "150"))
+
+
+def load_command(name):
+    """하위 명령의 실행 함수를 지연 import 합니다"""
+    module_name, func_name, _, _ = COMMANDS[name]
+    module = importlib.import_module(module_name)
+    return getattr(module, func_name)
+
+
+def run_command(name, extra_args=()):
+    """명령 실행 - 나머지 인자는 스크립트의 sys.argv 로 전달합니다"""
+    module_name = COMMANDS[name][0]
+    func = load_command(name)
+    sys.argv = [f"{module_name}.py", *extra_args]
+    result = func()
+    return 1 if result is False else 0
+
+
+def probe(name):
+    """(내부용) 명령 모듈 import 시간과 무거운 모듈 로드 여부를 JSON으로 출력"""
+    started = time.perf_counter()
+    load_command(name)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+    print(json.dumps({"command": name, "import_ms": elapsed_ms, "heavy": loaded}))
+    return 0
+
+
+def startup_check(repeat=5):
+    """오프라인 명령들의 cold start를 별도 프로세스로 측정합니다"""
+    print("=" * 60)
+    print(f"⏱️ 오프라인 명령 cold start 측정 (각 {repeat}회, 허용치 {STARTUP_BUDGET_MS:.0f}ms)")
+    print("=" * 60)
+
+    script = os.path.abspath(__file__)
+    failed = []
+
+    for name, (_, _, needs_network, _) in COMMANDS.items():
+        if needs_network:
+            continue
+
+        import_times = []
+        wall_times = []
+        heavy = set()
+        for _ in range(repeat):
+            started = time.perf_counter()
+            out = subprocess.run(
+                [sys.executable, script, "_probe", name],
+                capture_output=True, text=True, cwd=os.path.dirname(script),
+            )
+            wall_times.append((time.perf_counter() - started) * 1000)
+            if out.returncode != 0:
+                print(f"  ❌ {name}: 실행 실패\n{out.stderr.strip()}")
+                failed.append(name)
+                break
+            report = json.loads(out.stdout.strip().splitlines()[-1])
+            import_times.append(report["import_ms"])
+            heavy.update(report["heavy"])
+        else:
+            import_ms = statistics.median(import_times)
+            wall_ms = statistics.median(wall_times)
+            ok = import_ms <= STARTUP_BUDGET_MS and not heavy
+            mark = "✅" if ok else "⚠️"
+            extra = f" (무거운 모듈 로드: {', '.join(sorted(heavy))})" if heavy else ""
+            print(f"  {mark} {name:<16} import {import_ms:7.1f}ms / 프로세스 {wall_ms:7.1f}ms{extra}")
+            if not ok:
+                failed.append(name)
+
+    if failed:
+        print(f"\n⚠️ 허용치 초과 또는 실패: {', '.join(failed)}")
+        return 1
+    print("\n✅ 모든 오프라인 명령이 허용치 이내입니다.")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="mBot 문제은행 관리 도구",
+    )
+    sub = parser.add_subparsers(dest="command", metavar="<command>")
+
+    for name, (_, _, needs_network, description) in COMMANDS.items():
+        tag = "🌐" if needs_network else "💾"
+        # --help 등 나머지 인자는 각 스크립트가 직접 처리
+        sub.add_parser(name, help=f"{tag} {description}", add_help=False)
+
+    startup = sub.add_parser("startup", help="⏱️ 오프라인 명령 cold start 측정")
+    startup.add_argument("--repeat", type=int, default=5, help="명령당 측정 횟수")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    # startup 측정용 내부 명령 (도움말에는 노출하지 않음)
+    if len(argv) == 2 and argv[0] == "_probe" and argv[1] in COMMANDS:
+        return probe(argv[1])
+
+    parser = build_parser()
+    args, extra_args = parser.parse_known_args(argv)
+
+    if not args.command:
+        parser.print_help()
+        return 0
+    if args.command == "startup":
+        if extra_args:
+            parser.error(f"알 수 없는 인자: {' '.join(extra_args)}")
+        return startup_check(args.repeat)
+    return run_command(args.command, extra_args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# 🧮 증분 처리용 내용 해시 매니페스트
+# 단계(clean / format / add-answers / upload-cr ...)마다 "키(파일 경로 또는 문제 번호) → 마지막으로 처리한 결과의 해시"를
+# .cache/content_manifest.json 에 기록합니다. 다시 실행했을 때 현재 내용의 해시가 같으면
+# 이미 처리된 것으로 보고 건너뛰어, 바뀐 문제만 다시 정리/파싱/해설 생성/업로드합니다.
+# 공백만 바뀐 경우는 같은 내용으로 취급합니다 (줄바꿈을 다루는 format 단계는 keep_lines=True 로 줄 구조는 비교).
+# 전체 재처리: REPROCESS_ALL=1
+
+MANIFEST_PATH = os.getenv("CONTENT_MANIFEST_PATH", ".cache/content_manifest.json")
+REPROCESS_ALL = os.getenv("REPROCESS_ALL") == "1"
+REPORT_PREVIEW = 20
+
+
+def content_hash(text: str, keep_lines: bool = False) -> str:
+    """공백을 정규화한 내용 해시 (keep_lines=True 면 줄 끝 공백만 무시하고 줄바꿈은 구분)"""
+    if keep_lines:
+        normalized = "\n".join(line.rstrip() for line in (text or "").strip().splitlines())
+    else:
+        normalized = " ".join((text or "").split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _load(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        print(f"⚠️ 매니페스트를 읽지 못해 새로 만듭니다: {path}")
+        return {}
+
+
+class ContentManifest:
+    """한 단계의 키별 해시 기록 + 이번 실행의 처리/건너뜀 목록"""
+
+    def __init__(self, stage: str, path: str = MANIFEST_PATH, force: bool = REPROCESS_ALL,
+                 keep_lines: bool = False):
+        self.stage = stage
+        self.path = path
+        self.force = force
+        self.keep_lines = keep_lines
+        self.entries: Dict[str, Dict] = _load(path).get(stage, {}).get("entries", {})
+        self.processed: List[str] = []
+        self.skipped: List[str] = []
+
+    def get(self, key) -> Optional[Dict]:
+        return self.entries.get(str(key))
+
+    def is_current(self, key, text: str) -> bool:
+        """현재 내용이 마지막으로 처리한 결과와 같으면 True (건너뜀 목록에 추가)"""
+        entry = self.get(key)
+        if self.force or entry is None or entry["hash"] != content_hash(text, self.keep_lines):
+            return False
+        self.skipped.append(str(key))
+        return True
+
+    def record(self, key, text: str, **extra) -> None:
+        """처리 결과(다음 실행 때 비교할 내용)를 기록합니다"""
+        entry = {**(self.get(key) or {}), **extra, "hash": content_hash(text, self.keep_lines),
+                 "at": datetime.now().isoformat(timespec="seconds")}
+        self.entries[str(key)] = entry
+        self.processed.append(str(key))
+
+    def save(self) -> None:
+        """다른 단계 기록은 그대로 두고 이 단계만 교체해서 저장합니다"""
+        data = _load(self.path)
+        data[self.stage] = {
+            "entries": self.entries,
+            "last_run": {
+                "at": datetime.now().isoformat(timespec="seconds"),
+                "processed": self.processed,
+                "skipped": self.skipped,
+            },
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def print_report(self) -> None:
+        print(f"\n🧮 증분 처리 ({self.stage}): 처리 {len(self.processed)}개 · 변경 없음으로 건너뜀 {len(self.skipped)}개")
+        if self.skipped:
+            preview = ", ".join(self.skipped[:REPORT_PREVIEW])
+            more = f" 외 {len(self.skipped) - REPORT_PREVIEW}개" if len(self.skipped) > REPORT_PREVIEW else ""
+            print(f"   건너뜀: {preview}{more}")
+            print("   (전체 재처리: REPROCESS_ALL=1)")
@@ -1,23 +1,17 @@
 # db.py
-import os
-from supabase import create_client
-from dotenv import load_dotenv
-import random
+from storage import get_client
+from question_analytics import weighted_choice
 
-load_dotenv()
+supabase = get_client()
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-
-def get_random_cr_question():
+def get_random_cr_question(difficulty=None):
+    """difficulty: None / "easy" / "medium" / "hard" (question_analytics 의 정답률 통계로 가중치)"""
     res = supabase.table("questions").select("*").eq("type", "CR").execute()
     data = res.data
     if not data:
         return None
 
-    q = random.choice(data)
+    q = weighted_choice(data, difficulty)
     return {
         "id": q["id"],
         "question": q["question"],
@@ -0,0 +1,209 @@
+import argparse
+import json
+import re
+import statistics
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from bank_validator import MAX_EN_HANGUL_RATIO, MIN_KO_HANGUL_RATIO, hangul_ratio
+from question_bank import EXPLANATION_COLUMNS, LETTERS, BankQuestion, needs_explanation
+
+# 🩺 해설 품질 점수 (오프라인)
+# 저장된 해설마다 100점에서 문제별 감점을 빼서 점수를 매기고,
+# REGENERATE_BELOW 미만인 해설만 재생성 대상으로 표시합니다 (전체 재생성 대신 토큰 절약).
+# - placeholder:     자리표시자/실패 문구 ("설명 생성 실패", 한 문장짜리 "...추론 흐름을 가장 강하게..." 템플릿 등)
+# - language:        한국어 해설에 한글이 거의 없음 / 영어 해설에 한글
+# - leftover_tag:    "[한국어 설명]", "KOR:" 같은 생성 프롬프트 태그가 남음 (clean-explanations 로 제거 가능)
+# - length_outlier:  같은 칼럼 해설 길이 분포에서 크게 벗어남 (중앙값/MAD 기반 수정 z 점수)
+# - answer_mismatch: 해설에 적힌 정답 문자가 answer 와 다름
+#   python explanation_quality.py [--type cr] [--report explanation_quality.json]
+
+DEFAULT_REPORT = 'explanation_quality.json'
+
+PENALTIES = {
+    "placeholder": 100,
+    "answer_mismatch": 60,
+    "language": 50,
+    "length_outlier": 30,
+    "leftover_tag": 20,
+}
+REGENERATE_BELOW = 70
+
+# 예전 일괄 생성 스크립트가 남긴 템플릿 해설 (generate_explanations_ko 에서 이동)
+# 해설 전체가 템플릿 한 문장일 때만 일치 - "…보기입니다" 는 실제 해설에도 흔한 표현이므로 부분 일치로 보지 않음
+PLACEHOLDER_PATTERNS = (
+    re.compile(r'[^\n]{0,120}추론 흐름을 가장 강하게[^\n]{0,120}'),
+)
+
+LEFTOVER_TAG_PATTERN = re.compile(
+    r'\[(?:한국어|영어)\s*(?:설명|해설)\]|\[English Explanation\]|English Explanation\s*:|영어 설명\s*:|^\s*(?:KOR|ENG)\s*:',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# 해설 본문에 적힌 정답 ("정답은 (B)입니다", "정답: B", "The correct answer is (C)")
+STATED_ANSWER_PATTERNS = (
+    re.compile(r'정답\s*(?:은|는)?\s*[:：]?\s*\(?([A-E])(?![A-Za-z])'),
+    re.compile(r'(?i:answer)\s*(?i:is|:)\s*(?:(?i:choice|option)\s*)?\(?([A-E])(?![A-Za-z])'),
+)
+
+# 칼럼별 최소 길이와 이상치 기준 (수정 z 점수 = (x - 중앙값) / (MAD / 0.6745))
+MIN_LENGTH = {"explanation": 30, "explanation_en": 60}
+MAX_LENGTH_Z = 3.5
+
+
+@dataclass
+class LengthStats:
+    median: float
+    scale: float
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str]) -> Optional["LengthStats"]:
+        lengths = [len(t.strip()) for t in texts if not needs_explanation(t)]
+        if len(lengths) < 5:
+            return None
+        median = statistics.median(lengths)
+        deviations = [abs(n - median) for n in lengths]
+        mad = statistics.median(deviations)
+        # 절반 이상이 같은 길이면 MAD 가 0 → 평균 절대 편차로 대체 (Iglewicz-Hoaglin)
+        scale = mad / 0.6745 if mad else statistics.mean(deviations) * 1.2533
+        return cls(median, scale)
+
+    def z_score(self, length: int) -> float:
+        if not self.scale:
+            return 0.0
+        return (length - self.median) / self.scale
+
+
+@dataclass
+class ExplanationScore:
+    key: str
+    id: Optional[str]
+    column: str
+    score: int
+    issues: List[str] = field(default_factory=list)
+
+    @property
+    def needs_regeneration(self) -> bool:
+        return self.score < REGENERATE_BELOW
+
+    @property
+    def rules(self) -> List[str]:
+        """issues 의 규칙 이름 ("language: ..." → "language")"""
+        return [issue.split(":")[0] for issue in self.issues]
+
+
+def stated_answer(text: str) -> Optional[str]:
+    """해설에서 처음 명시된 정답 문자 (없으면 None)"""
+    for pattern in STATED_ANSWER_PATTERNS:
+        m = pattern.search(text or '')
+        if m:
+            return m.group(1)
+    return None
+
+
+def check_explanation(text: Optional[str], column: str, answer: Optional[str],
+                      length_stats: Optional[LengthStats] = None) -> Dict[str, str]:
+    """해설 하나의 문제점 {규칙: 메시지}"""
+    text = text or ''
+    if needs_explanation(text) or any(p.fullmatch(text.strip()) for p in PLACEHOLDER_PATTERNS):
+        return {"placeholder": "해설 없음/자리표시자"}
+
+    issues = {}
+    ratio = hangul_ratio(text)
+    if column == "explanation" and ratio < MIN_KO_HANGUL_RATIO:
+        issues["language"] = f"한국어 해설의 한글 비율 {ratio:.0%}"
+    elif column == "explanation_en" and ratio > MAX_EN_HANGUL_RATIO:
+        issues["language"] = f"영어 해설의 한글 비율 {ratio:.0%}"
+
+    tag = LEFTOVER_TAG_PATTERN.search(text)
+    if tag:
+        issues["leftover_tag"] = f"태그 남음: {tag.group(0).strip()!r}"
+
+    length = len(text.strip())
+    if length < MIN_LENGTH.get(column, 0):
+        issues["length_outlier"] = f"너무 짧음 ({length}자)"
+    elif length_stats and abs(length_stats.z_score(length)) > MAX_LENGTH_Z:
+        issues["length_outlier"] = f"길이 이상치 ({length}자, 중앙값 {length_stats.median:.0f}자)"
+
+    stated = stated_answer(text)
+    if stated and answer in LETTERS and stated != answer:
+        issues["answer_mismatch"] = f"해설의 정답 {stated} ≠ answer {answer}"
+    return issues
+
+
+def score_questions(questions: List[BankQuestion],
+                    columns: Iterable[str] = EXPLANATION_COLUMNS.values()) -> List[ExplanationScore]:
+    """칼럼별 길이 분포를 먼저 구한 뒤 모든 해설에 점수를 매깁니다 (파일 출처처럼 해설이 None 이면 제외)"""
+    scores = []
+    for column in columns:
+        texts = [getattr(q, column) for q in questions if getattr(q, column) is not None]
+        length_stats = LengthStats.from_texts(texts)
+        for q in questions:
+            text = getattr(q, column)
+            if text is None:
+                continue
+            issues = check_explanation(text, column, q.answer, length_stats)
+            score = max(0, 100 - sum(PENALTIES[rule] for rule in issues))
+            scores.append(ExplanationScore(q.key, None if q.id is None else str(q.id), column, score,
+                                           [f"{rule}: {message}" for rule, message in issues.items()]))
+    return scores
+
+
+def flagged_ids(scores: Iterable[ExplanationScore], column: str) -> set:
+    """재생성이 필요한 해설의 문제 id"""
+    return {s.id for s in scores if s.column == column and s.needs_regeneration}
+
+
+def print_report(scores: List[ExplanationScore], limit: int = 30) -> None:
+    flagged = [s for s in scores if s.needs_regeneration]
+    rules = Counter(rule for s in scores for rule in s.rules)
+    print("\n" + "=" * 60)
+    print(f"🩺 해설 품질: {len(scores)}개 해설, 재생성 대상 {len(flagged)}개 (기준 {REGENERATE_BELOW}점 미만)")
+    print("=" * 60)
+    for column in sorted({s.column for s in scores}):
+        column_scores = [s.score for s in scores if s.column == column]
+        print(f"  {column}: 평균 {statistics.mean(column_scores):.1f}점, "
+              f"재생성 {sum(1 for s in scores if s.column == column and s.needs_regeneration)}개")
+    for rule, count in rules.most_common():
+        print(f"  - {rule}: {count}개")
+    for s in sorted(flagged, key=lambda s: s.score)[:limit]:
+        print(f"  ⚠️ {s.key} [{s.column}] {s.score}점 - {'; '.join(s.issues)}")
+    if len(flagged) > limit:
+        print(f"  … 나머지 {len(flagged) - limit}개는 리포트 파일 참고")
+
+
+def save_report(scores: List[ExplanationScore], path: str = DEFAULT_REPORT) -> None:
+    data = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "regenerate_below": REGENERATE_BELOW,
+        "total": len(scores),
+        "flagged": sum(1 for s in scores if s.needs_regeneration),
+        "scores": [asdict(s) for s in scores],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    print(f"💾 리포트 저장: {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 해설 품질 점수 (재생성 대상 선별)")
+    parser.add_argument("--type", help="questions.type 필터 (예: cr, LSAT)")
+    parser.add_argument("--report", default=DEFAULT_REPORT, help="JSON 리포트 경로")
+    args = parser.parse_args()
+
+    from question_bank import load_db
+    from storage import get_client
+
+    started = time.perf_counter()
+    questions = load_db(get_client(service_role=True), args.type)
+    scores = score_questions(questions)
+    print(f"📖 questions 테이블 → {len(questions)}개 문제 ({time.perf_counter() - started:.1f}초)")
+    print_report(scores)
+    save_report(scores, args.report)
+
+
+if __name__ == "__main__":
+    main()
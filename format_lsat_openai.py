@@ -1,16 +1,29 @@
+import argparse
 import os
-import openai
 import re
 from dotenv import load_dotenv
+from llm_client import Budget, LLMClient
+
+from lsat_rule_formatter import MIN_CONFIDENCE, rule_formatter
+from parallel_format import DEFAULT_CONCURRENCY, DEFAULT_RPM, run_parallel_format, split_problems
 
 # 환경 변수 로드
 load_dotenv()
 
 # OpenAI API 설정
-openai.api_key = os.getenv('OPENAI_API_KEY')
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+
+
+# 토큰/지연/비용 기록 + 예산 (LLM_BUDGET_*), openai 는 첫 호출 때 import (CLI 시작 속도)
+llm = LLMClient("format-lsat-ai", api_key=OPENAI_API_KEY, budget=Budget.from_env())
 
-def format_lsat_with_openai(input_file, output_file):
-    """OpenAI API를 사용해서 LSAT 문제를 정리합니다 (원문 유지)"""
+def format_lsat_with_openai(input_file, output_file, concurrency=DEFAULT_CONCURRENCY, rpm=DEFAULT_RPM,
+                            min_confidence=MIN_CONFIDENCE, use_rules=True):
+    """OpenAI API를 사용해서 LSAT 문제를 정리합니다 (원문 유지)
+
+    규칙 기반 정리의 신뢰도가 min_confidence 이상인 문제는 API 없이 처리하고,
+    나머지만 병렬로 요청합니다. 결과는 원래 순서대로 output_file 에 바로 이어 씁니다.
+    """
     
     print(f"=== {input_file} OpenAI로 정리 시작 (원문 유지) ===")
     
@@ -25,30 +38,23 @@ def format_lsat_with_openai(input_file, output_file):
     print(f"원본 파일 크기: {len(content)}자")
     
     # 문제별로 분리
-    problems = re.split(r'(\d+\.)', content)
-    
-    formatted_problems = []
+    problems = split_problems(content)
     
-    for i in range(1, len(problems), 2):  # 문제 번호와 내용을 함께 처리
-        if i + 1 < len(problems):
-            problem_num = problems[i].strip()
-            problem_content = problems[i + 1].strip()
-            
-            if problem_content:
-                print(f"문제 {problem_num} 처리 중...")
-                
-                # OpenAI로 정리
-                formatted_problem = format_single_problem_with_openai(problem_num, problem_content)
-                if formatted_problem:
-                    formatted_problems.append(formatted_problem)
-    
-    # 결과 저장
+    # 결과 저장 (병렬 정리 + 순서대로 즉시 기록)
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('\n\n'.join(formatted_problems))
+        stats = run_parallel_format(
+            problems,
+            build_format_request,
+            check_formatted_problem,
+            acreate=lambda **request: llm.achat(retries=0, **request),
+            output_file=output_file,
+            concurrency=concurrency,
+            rpm=rpm,
+            local_format=rule_formatter(min_confidence) if use_rules else None,
+        )
         
         print(f"\n✅ 정리 완료!")
-        print(f"  처리된 문제 수: {len(formatted_problems)}개")
+        print(f"  처리된 문제 수: {stats.local + stats.formatted + stats.cached}개")
         print(f"  저장된 파일: {output_file}")
         
         return True
@@ -57,8 +63,8 @@ def format_lsat_with_openai(input_file, output_file):
         print(f"파일 저장 오류: {e}")
         return False
 
-def format_single_problem_with_openai(problem_num, problem_content):
-    """OpenAI API를 사용해서 단일 문제를 정리합니다 (원문 유지)"""
+def build_format_request(problem_num, problem_content):
+    """단일 문제 정리용 ChatCompletion 요청 인자를 만듭니다 (원문 유지)"""
     
     prompt = f"""다음은 LSAT 문제입니다. 원문을 그대로 유지하면서 지문과 보기만 분리해서 정리해주세요.
 
@@ -85,39 +91,52 @@ def format_single_problem_with_openai(problem_num, problem_content):
 
 정리된 결과:"""
 
+    return dict(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": "당신은 LSAT 문제 편집 전문가입니다. 원문을 번역하거나 수정하지 말고, 지문과 보기만 분리하여 정리하는 것이 목표입니다. 영어 원문을 그대로 유지하세요."},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=1000,
+        temperature=0.1  # 더 낮은 temperature로 일관성 확보
+    )
+
+def check_formatted_problem(problem_num, formatted_text):
+    """정리 결과 검증 - 보기 형식이 맞으면 텍스트, 아니면 None"""
+    if "(A)" in formatted_text and "(B)" in formatted_text and "(C)" in formatted_text:
+        print(f"  ✅ 문제 {problem_num} 정리 완료")
+        return formatted_text
+    else:
+        print(f"  ⚠️ 문제 {problem_num} 정리 실패 - 보기 형식 오류")
+        return None
+
+def format_single_problem_with_openai(problem_num, problem_content):
+    """OpenAI API를 사용해서 단일 문제를 정리합니다 (원문 유지, 동기 호출)"""
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "당신은 LSAT 문제 편집 전문가입니다. 원문을 번역하거나 수정하지 말고, 지문과 보기만 분리하여 정리하는 것이 목표입니다. 영어 원문을 그대로 유지하세요."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=1000,
-            temperature=0.1  # 더 낮은 temperature로 일관성 확보
-        )
-        
+        response = llm.chat(**build_format_request(problem_num, problem_content))
         formatted_text = response.choices[0].message.content.strip()
-        
-        # 결과 검증
-        if "(A)" in formatted_text and "(B)" in formatted_text and "(C)" in formatted_text:
-            print(f"  ✅ 문제 {problem_num} 정리 완료")
-            return formatted_text
-        else:
-            print(f"  ⚠️ 문제 {problem_num} 정리 실패 - 보기 형식 오류")
-            return None
+        return check_formatted_problem(problem_num, formatted_text)
             
     except Exception as e:
         print(f"  ❌ 문제 {problem_num} OpenAI API 오류: {e}")
         return None
 
 def main():
+    parser = argparse.ArgumentParser(description="OpenAI로 LSAT 문제 정리 (병렬)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시 요청 수")
+    parser.add_argument("--rpm", type=int, default=DEFAULT_RPM, help="분당 최대 요청 수")
+    parser.add_argument("--min-confidence", type=float, default=MIN_CONFIDENCE,
+                        help="이 신뢰도 이상이면 규칙 기반 결과를 그대로 사용")
+    parser.add_argument("--llm-only", action="store_true", help="규칙 기반 정리 없이 모두 API로 처리")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("LSAT 문제 OpenAI 정리 스크립트 (원문 유지)")
     print("지문과 보기를 분리하되 원문 그대로 유지")
     print("=" * 60)
     
     # API 키 확인
-    if not openai.api_key:
+    if not OPENAI_API_KEY:
         print("❌ OPENAI_API_KEY가 설정되지 않았습니다.")
         print("   .env 파일에 OPENAI_API_KEY=sk-... 형태로 추가하세요.")
         return
@@ -129,7 +148,8 @@ def main():
         print(f"❌ 파일을 찾을 수 없습니다: {input_file}")
         return
     
-    if format_lsat_with_openai(input_file, output_file):
+    if format_lsat_with_openai(input_file, output_file, args.concurrency, args.rpm,
+                               args.min_confidence, not args.llm_only):
         print("✅ LSAT 문제 정리가 완료되었습니다!")
         
         # 결과 확인
@@ -1,6 +1,6 @@
 import re
 import os
-from datetime import datetime
+from backup_store import backup_file
 
 def format_questions(file_path):
     """문제를 깔끔하게 포맷팅합니다 (v4.0 - 질문 패턴 첫 줄 버그 수정)"""
@@ -65,17 +65,11 @@ def format_questions(file_path):
     # 포맷팅된 내용 합치기
     formatted_content = '\n\n'.join(formatted_questions)
     
-    # 백업 생성
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = f"{file_path}.backup_{timestamp}"
-    
     try:
-        # 원본 백업
+        # 원본 백업 (backup_store: 같은 내용은 한 번만 저장)
         with open(file_path, 'r', encoding='utf-8') as f:
             original_content = f.read()
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            f.write(original_content)
-        print(f"백업 생성: {backup_path}")
+        backup_file(file_path)
         
         # 포맷팅된 내용 저장
         with open(file_path, 'w', encoding='utf-8') as f:
@@ -1,9 +1,15 @@
 import re
 import os
-from datetime import datetime
+from backup_store import backup_file
+from content_manifest import ContentManifest
 
-def format_questions(file_path):
-    """문제를 깔끔하게 포맷팅합니다 (v5.0 - 단순하고 안전한 방식)"""
+from bank_validator import EXPECTED_KEYWORDS
+
+def format_questions(file_path, manifest=None):
+    """문제를 깔끔하게 포맷팅합니다 (v5.0 - 단순하고 안전한 방식)
+
+    manifest 를 주면 마지막 포맷팅 결과와 같은 문제는 다시 포맷팅하지 않고 그대로 둡니다.
+    """
     
     print(f"=== {file_path} 문제 포맷팅 시작 ===")
     
@@ -38,6 +44,7 @@ def format_questions(file_path):
     print(f"총 {len(question_starts)}개 문제 발견")
     
     formatted_questions = []
+    seen_keys = {}
     
     # 각 문제를 개별적으로 처리
     for idx, (start_line, question_num) in enumerate(question_starts):
@@ -50,10 +57,22 @@ def format_questions(file_path):
         # 현재 문제의 내용 추출
         question_lines = lines[start_line:end_line]
         
+        # 같은 번호가 여러 번 나오는 경우(예: "141. 정답 : B" 줄) 키를 구분
+        seen_keys[question_num] = seen_keys.get(question_num, 0) + 1
+        key = question_num if seen_keys[question_num] == 1 else f"{question_num}#{seen_keys[question_num]}"
+        
+        # 마지막 포맷팅 이후 바뀌지 않은 문제는 그대로 사용
+        block = '\n'.join(question_lines).strip()
+        if manifest is not None and manifest.is_current(key, block):
+            formatted_questions.append(block)
+            continue
+        
         # 문제 포맷팅
         formatted_question = format_single_question_simple(question_num, question_lines)
         if formatted_question:
             formatted_questions.append(formatted_question)
+            if manifest is not None:
+                manifest.record(key, formatted_question)
             
         # 문제가 있던 문제들 특별 확인
         if question_num in [145, 146, 157, 171, 173, 174, 177, 188, 201, 210, 213, 225, 261, 288]:
@@ -65,17 +84,11 @@ def format_questions(file_path):
     # 포맷팅된 내용 합치기
     formatted_content = '\n\n'.join(formatted_questions)
     
-    # 백업 생성
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = f"{file_path}.backup_{timestamp}"
-    
     try:
-        # 원본 백업
+        # 원본 백업 (backup_store: 같은 내용은 한 번만 저장)
         with open(file_path, 'r', encoding='utf-8') as f:
             original_content = f.read()
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            f.write(original_content)
-        print(f"백업 생성: {backup_path}")
+        backup_file(file_path)
         
         # 포맷팅된 내용 저장
         with open(file_path, 'w', encoding='utf-8') as f:
@@ -226,7 +239,11 @@ def main():
         print(f"❌ 파일을 찾을 수 없습니다: {file_path}")
         return
     
-    if format_questions(file_path):
+    # 포맷팅은 줄바꿈을 고치는 단계이므로 줄 구조까지 비교
+    manifest = ContentManifest("format", keep_lines=True)
+    if format_questions(file_path, manifest):
+        manifest.save()
+        manifest.print_report()
         print("✅ 문제 포맷팅이 완료되었습니다!")
         
         # 검증
@@ -251,12 +268,8 @@ def main():
             print("✅ 모든 문제에 본문이 있습니다!")
             
         # 이전 문제들 특별 확인
-        problem_keywords = {
-            157: "European wild deer",
-            288: "Vebrol Corporation",
-            145: "safety levers",
-            173: "Thymosin beta-4"
-        }
+        problem_keywords = {number: keyword for (source, number), keyword in EXPECTED_KEYWORDS.items()
+                            if source == "cr"}
         
         for problem_num, keyword in problem_keywords.items():
             match = re.search(rf'^{problem_num}\. (.+?)(?={problem_num + 1}\.|$)', content, re.MULTILINE | re.DOTALL)
@@ -1,22 +1,29 @@
+import argparse
 import os
 import time
 from dotenv import load_dotenv
-from supabase import create_client
-from openai import OpenAI
+from llm_client import Budget, LLMClient
+from model_router import escalation_score, route
+from explanation_quality import REGENERATE_BELOW, check_explanation, score_questions
+from question_bank import from_db_row, normalize_answer
+from storage import get_client, iter_rows
 
 # ✅ 환경변수 로딩
 load_dotenv()
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-GPT_MODEL = os.getenv("GPT_MODEL", "gpt-4o-mini")
 
 # ✅ 클라이언트 설정
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-openai = OpenAI(api_key=OPENAI_API_KEY)
+supabase = get_client()
 
+# 토큰/지연/비용 기록 + 예산 (LLM_BUDGET_*), openai 는 첫 호출 때 import (CLI 시작 속도)
+llm = LLMClient("gen-en", api_key=OPENAI_API_KEY, budget=Budget.from_env())
 
-def generate_explanation_en(question, choices, answer_index, retries=3):
+
+SYSTEM_PROMPT_EN = "You are a professional GMAT tutor."
+
+
+def build_messages_en(question, choices, answer_index):
+    """해설 생성용 chat 메시지 (봇의 실시간 해설과 공용)"""
     prompt = f"""
 You are a professional GMAT Critical Reasoning tutor.
 
@@ -39,64 +46,74 @@ Choices:
 (D) {choices[3]}
 (E) {choices[4]}
 
-The correct answer is ({chr(64 + answer_index)}).
+The correct answer is ({normalize_answer(answer_index)}).
 """
-    for attempt in range(1, retries + 1):
-        try:
-            response = openai.chat.completions.create(
-                model=GPT_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a professional GMAT tutor."},
-                    {"role": "user", "content": prompt},
-                ],
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            print(f"⚠️ Retry {attempt}/{retries} failed: {e}")
-            time.sleep(2)
 
-    raise Exception(f"❌ Failed after {retries} retries.")
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT_EN},
+        {"role": "user", "content": prompt},
+    ]
 
 
-def update_missing_explanations_en():
-    print("🔍 Fetching questions from Supabase...")
-    rows = supabase.table("questions").select("*").execute().data
-    total = len(rows)
-    success = 0
-    skipped = 0
-    failed = []
+def generate_explanation_en(question, choices, answer_index, retries=3, question_type=None, quality_score=None):
+    """해설 한 개 생성 (모델/max_tokens 는 model_router, 실패 시 llm_client 가 지수 백오프로 retries 회 재시도)"""
+    r = route("gen-en", question_type, question + "\n" + "\n".join(map(str, choices)), quality_score)
+    response = llm.chat(
+        model=r.model,
+        messages=build_messages_en(question, choices, answer_index),
+        max_tokens=r.max_tokens,
+        retries=retries,
+    )
+    return response.choices[0].message.content.strip()
 
-    for idx, row in enumerate(rows, start=1):
+
+def update_missing_explanations_en(dry_run=False):
+    """품질 점수(explanation_quality)가 기준 미만인 영어 해설만 다시 생성합니다"""
+    print("🔍 Fetching questions from Supabase...")
+    rows = list(iter_rows(supabase, "questions"))
+    questions = [from_db_row(row) for row in rows]
+    scores = {s.id: s for s in score_questions(questions, columns=("explanation_en",))}
+    flagged = [row for row in rows if scores[str(row["id"])].needs_regeneration]
+    total = len(flagged)
+    success, skipped, failed = 0, len(rows) - total, []
+    print(f"🩺 {total} of {len(rows)} rows flagged (quality below {REGENERATE_BELOW})")
+
+    for idx, row in enumerate(flagged, start=1):
         qid = row["id"]
         question = row.get("question", "")
         choices = row.get("choices", [])
         answer = row.get("answer", None)
-        explanation_en = row.get("explanation_en", None)
+        score = scores[str(qid)]
 
-        print(f"\n📄 [{idx}/{total}] Processing row {qid[:8]}...")
-
-        if explanation_en:
-            print("⏭️ Already has explanation_en. Skipping.")
-            skipped += 1
-            continue
+        print(f"\n📄 [{idx}/{total}] Processing row {str(qid)[:8]} ({score.score} - {'; '.join(score.issues)})")
 
         if not question or not choices or len(choices) != 5 or not answer:
             print("⚠️ Incomplete data. Skipping.")
             skipped += 1
             continue
 
+        if dry_run:
+            continue
+
         try:
-            explanation = generate_explanation_en(question, choices, answer)
+            explanation = generate_explanation_en(question, choices, answer, question_type=row.get("type"),
+                                                  quality_score=escalation_score(score))
+            issues = check_explanation(explanation, "explanation_en", normalize_answer(answer))
+            if issues:
+                # 기존 해설을 더 나쁜(또는 같은 문제가 있는) 해설로 덮어쓰지 않음
+                print(f"⚠️ New explanation also has issues, not saved: {'; '.join(issues.values())}")
+                failed.append(qid)
+                continue
             supabase.table("questions").update({"explanation_en": explanation}).eq("id", qid).execute()
             print("✅ Explanation saved.")
             success += 1
             time.sleep(1.2)
         except Exception as e:
-            print(f"❌ Failed to generate explanation for row {qid[:8]}: {e}")
+            print(f"❌ Failed to generate explanation for row {str(qid)[:8]}: {e}")
             failed.append(qid)
 
-    print("\n✅ Processing complete.")
-    print(f"Total: {total}, Success: {success}, Skipped: {skipped}, Failed: {len(failed)}")
+    print("\n✅ Processing complete." + (" (dry-run, nothing generated)" if dry_run else ""))
+    print(f"Total: {len(rows)}, Success: {success}, Skipped: {skipped}, Failed: {len(failed)}")
 
     if failed:
         print("\n❗ Failed rows:")
@@ -104,5 +121,12 @@ def update_missing_explanations_en():
             print(f"  - {fid}")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="품질 점수가 낮은 영어 해설만 재생성")
+    parser.add_argument("--dry-run", action="store_true", help="생성하지 않고 재생성 대상만 출력")
+    args = parser.parse_args()
+    update_missing_explanations_en(dry_run=args.dry_run)
+
+
 if __name__ == "__main__":
-    update_missing_explanations_en()
+    main()
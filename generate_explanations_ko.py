@@ -1,22 +1,29 @@
+import argparse
 import os
 import time
 from dotenv import load_dotenv
-from supabase import create_client
-from openai import OpenAI
+from llm_client import Budget, LLMClient
+from model_router import escalation_score, route
+from explanation_quality import REGENERATE_BELOW, check_explanation, score_questions
+from question_bank import from_db_row, normalize_answer
+from storage import get_client, iter_rows
 
 # ✅ 환경변수 로딩
 load_dotenv()
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-GPT_MODEL = os.getenv("GPT_MODEL", "gpt-4o-mini")
 
 # ✅ 클라이언트 설정
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-openai = OpenAI(api_key=OPENAI_API_KEY)
+supabase = get_client()
 
+# 토큰/지연/비용 기록 + 예산 (LLM_BUDGET_*), openai 는 첫 호출 때 import (CLI 시작 속도)
+llm = LLMClient("gen-ko", api_key=OPENAI_API_KEY, budget=Budget.from_env())
 
-def generate_explanation_ko(question, choices, answer_index, retries=3):
+
+SYSTEM_PROMPT_KO = "당신은 GMAT CR 전문가 튜터입니다."
+
+
+def build_messages_ko(question, choices, answer_index):
+    """해설 생성용 chat 메시지 (봇의 실시간 해설과 공용)"""
     prompt = f"""
 다음은 GMAT CR 유형의 문제입니다.
 
@@ -30,7 +37,7 @@ def generate_explanation_ko(question, choices, answer_index, retries=3):
 (D) {choices[3]}
 (E) {choices[4]}
 
-정답은 ({chr(64 + answer_index)})입니다.
+정답은 ({normalize_answer(answer_index)})입니다.
 
 이 문제에 대한 해설을 작성해 주세요.
 - 각 보기를 논리적으로 간단히 분석해 주세요.
@@ -39,66 +46,71 @@ def generate_explanation_ko(question, choices, answer_index, retries=3):
 - 튜터가 학생에게 설명하듯이 쓰되, 어려운 용어는 피하고 논리 흐름 중심으로 해설해 주세요.
 """
 
-    for attempt in range(1, retries + 1):
-        try:
-            response = openai.chat.completions.create(
-                model=GPT_MODEL,
-                messages=[
-                    {"role": "system", "content": "당신은 GMAT CR 전문가 튜터입니다."},
-                    {"role": "user", "content": prompt},
-                ],
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            print(f"⚠️ Retry {attempt}/{retries} failed: {e}")
-            time.sleep(2)
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT_KO},
+        {"role": "user", "content": prompt},
+    ]
 
-    raise Exception(f"❌ Failed after {retries} retries.")
 
+def generate_explanation_ko(question, choices, answer_index, retries=3, question_type=None, quality_score=None):
+    """해설 한 개 생성 (모델/max_tokens 는 model_router, 실패 시 llm_client 가 지수 백오프로 retries 회 재시도)"""
+    r = route("gen-ko", question_type, question + "\n" + "\n".join(map(str, choices)), quality_score)
+    response = llm.chat(
+        model=r.model,
+        messages=build_messages_ko(question, choices, answer_index),
+        max_tokens=r.max_tokens,
+        retries=retries,
+    )
+    return response.choices[0].message.content.strip()
 
-def update_missing_or_placeholder_explanations_ko():
-    print("🔍 Supabase에서 questions 테이블 가져오는 중...")
-    rows = supabase.table("questions").select("*").execute().data
-    total = len(rows)
-    success, skipped, failed = 0, 0, []
 
-    for idx, row in enumerate(rows, start=1):
+def update_missing_or_placeholder_explanations_ko(dry_run=False):
+    """품질 점수(explanation_quality)가 기준 미만인 한국어 해설만 다시 생성합니다"""
+    print("🔍 Supabase에서 questions 테이블 가져오는 중...")
+    rows = list(iter_rows(supabase, "questions"))
+    questions = [from_db_row(row) for row in rows]
+    scores = {s.id: s for s in score_questions(questions, columns=("explanation",))}
+    flagged = [row for row in rows if scores[str(row["id"])].needs_regeneration]
+    total = len(flagged)
+    success, skipped, failed = 0, len(rows) - total, []
+    print(f"🩺 재생성 대상 {total}개 / 전체 {len(rows)}개 (품질 {REGENERATE_BELOW}점 미만)")
+
+    for idx, row in enumerate(flagged, start=1):
         qid = row["id"]
         question = row.get("question", "")
         choices = row.get("choices", [])
         answer = row.get("answer", None)
-        explanation = row.get("explanation", "")
-
-        print(f"\n📄 [{idx}/{total}] 처리 중: {qid[:8]}")
+        score = scores[str(qid)]
 
-        needs_update = (
-            not explanation
-            or "추론 흐름을 가장 강하게" in explanation
-            or "보기입니다" in explanation
-        )
-
-        if not needs_update:
-            print("⏭️ 적절한 해설이 이미 존재함. 건너뜀.")
-            skipped += 1
-            continue
+        print(f"\n📄 [{idx}/{total}] 처리 중: {str(qid)[:8]} ({score.score}점 - {'; '.join(score.issues)})")
 
         if not question or not choices or len(choices) != 5 or not answer:
             print("⚠️ 데이터 불완전. 건너뜀.")
             skipped += 1
             continue
 
+        if dry_run:
+            continue
+
         try:
-            explanation_ko = generate_explanation_ko(question, choices, answer)
+            explanation_ko = generate_explanation_ko(question, choices, answer,
+                                                     question_type=row.get("type"), quality_score=escalation_score(score))
+            issues = check_explanation(explanation_ko, "explanation", normalize_answer(answer))
+            if issues:
+                # 기존 해설을 더 나쁜(또는 같은 문제가 있는) 해설로 덮어쓰지 않음
+                print(f"⚠️ 새 해설에도 문제가 있어 저장하지 않음: {'; '.join(issues.values())}")
+                failed.append(qid)
+                continue
             supabase.table("questions").update({"explanation": explanation_ko}).eq("id", qid).execute()
             print("✅ 해설 업데이트 완료.")
             success += 1
             time.sleep(1.2)
         except Exception as e:
-            print(f"❌ 실패: {qid[:8]} → {e}")
+            print(f"❌ 실패: {str(qid)[:8]} → {e}")
             failed.append(qid)
 
-    print("\n✅ 전체 처리 완료")
-    print(f"총 {total}개 중 성공 {success}, 건너뜀 {skipped}, 실패 {len(failed)}")
+    print("\n✅ 전체 처리 완료" + (" (dry-run, 생성 안 함)" if dry_run else ""))
+    print(f"총 {len(rows)}개 중 성공 {success}, 건너뜀 {skipped}, 실패 {len(failed)}")
 
     if failed:
         print("\n❗ 실패한 항목 목록:")
@@ -106,5 +118,12 @@ def update_missing_or_placeholder_explanations_ko():
             print(f"  - {fid}")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="품질 점수가 낮은 한국어 해설만 재생성")
+    parser.add_argument("--dry-run", action="store_true", help="생성하지 않고 재생성 대상만 출력")
+    args = parser.parse_args()
+    update_missing_or_placeholder_explanations_ko(dry_run=args.dry_run)
+
+
 if __name__ == "__main__":
-    update_missing_or_placeholder_explanations_ko()
+    main()
@@ -0,0 +1,155 @@
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from user_progress import ALL_TYPES, PROGRESS_TABLE, UserProgress
+
+# 🏆 유형별 랭킹 / 리더보드
+# user_progress 행(유형별 한 행)을 TTL 마다 한 번 읽어 지표별 정렬 리스트로 만들어 둡니다.
+# - /leaderboard: 정렬 리스트의 앞부분만 잘라 보여줌
+# - /rank: 본인의 최신 행 하나를 읽고 정렬 리스트에서 bisect 로 순위/백분위 계산 (O(log n))
+# user_answers 는 읽지 않습니다.
+
+LEADERBOARD_TTL_SEC = int(os.getenv("LEADERBOARD_TTL_SEC", "300"))
+# 정답률 순위에 들기 위한 최소 제출 수 (1/1 = 100% 방지)
+MIN_ATTEMPTS = int(os.getenv("LEADERBOARD_MIN_ATTEMPTS", "10"))
+DEFAULT_TOP_N = 10
+MAX_TOP_N = 50
+
+
+def _accuracy_key(p: UserProgress) -> Tuple:
+    return (p.accuracy, p.correct)
+
+
+def _volume_key(p: UserProgress) -> Tuple:
+    return (p.answered, p.correct)
+
+
+@dataclass(frozen=True)
+class Metric:
+    name: str
+    label: str
+    key: Callable[[UserProgress], Tuple]
+    min_attempts: int = 0
+
+    def eligible(self, p: UserProgress) -> bool:
+        return p.attempts > 0 and p.attempts >= self.min_attempts
+
+    def format(self, p: UserProgress) -> str:
+        if self.name == "accuracy":
+            return f"{round(p.accuracy * 100)}% ({p.correct}/{p.attempts})"
+        return f"{p.answered}문제 (정답 {p.correct})"
+
+
+METRICS = {
+    "accuracy": Metric("accuracy", "정답률", _accuracy_key, MIN_ATTEMPTS),
+    "volume": Metric("volume", "푼 문제 수", _volume_key),
+}
+DEFAULT_METRIC = "accuracy"
+# /leaderboard 인자 별칭
+METRIC_ALIASES = {"acc": "accuracy", "accuracy": "accuracy", "정답률": "accuracy",
+                  "vol": "volume", "volume": "volume", "count": "volume", "문제수": "volume"}
+
+
+@dataclass
+class RankInfo:
+    rank: int
+    total: int
+    percentile: float  # 나보다 낮은 유저 비율 (0~100)
+    value: str
+
+
+class Ranking:
+    """한 (유형, 지표) 의 정렬 스냅샷"""
+
+    def __init__(self, metric: Metric, rows: List[UserProgress]):
+        self.metric = metric
+        ranked = sorted((p for p in rows if metric.eligible(p)), key=metric.key, reverse=True)
+        self.top: List[UserProgress] = ranked
+        # bisect 용 오름차순 키
+        self.keys: List[Tuple] = [metric.key(p) for p in reversed(ranked)]
+        self._by_user: Dict[str, Tuple] = {p.user_id: metric.key(p) for p in ranked}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def rank_of(self, progress: UserProgress) -> Optional[RankInfo]:
+        if not self.metric.eligible(progress):
+            return None
+        key = self.metric.key(progress)
+        below = bisect_left(self.keys, key)
+        tied = bisect_right(self.keys, key) - below
+        above = len(self.keys) - below - tied
+        # 스냅샷 이후 본인 값이 바뀌었을 수 있으므로 스냅샷 속 본인 항목은 빼고 계산
+        previous = self._by_user.get(progress.user_id)
+        if previous is not None:
+            if previous < key:
+                below -= 1
+            elif previous > key:
+                above -= 1
+            else:
+                tied -= 1
+        total = below + tied + above + 1
+        return RankInfo(
+            rank=above + 1,
+            total=total,
+            percentile=round(below / (total - 1) * 100, 1) if total > 1 else 100.0,
+            value=self.metric.format(progress),
+        )
+
+
+class Leaderboard:
+    """user_progress 의 유형별 메모리 스냅샷 (TTL 경과 시 해당 유형만 재로드)"""
+
+    def __init__(self, supabase, ttl_sec: int = LEADERBOARD_TTL_SEC):
+        self.supabase = supabase
+        self.ttl_sec = ttl_sec
+        self._rankings: Dict[str, Tuple[float, Dict[str, Ranking]]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, question_type: str) -> Dict[str, Ranking]:
+        from storage import iter_rows
+
+        rows = [UserProgress.from_row(row) for row in iter_rows(
+            self.supabase, PROGRESS_TABLE, filters=[("eq", "question_type", question_type)], key="user_id")]
+        print(f"🏆 리더보드 로드 ({question_type}): {len(rows)}명")
+        return {name: Ranking(metric, rows) for name, metric in METRICS.items()}
+
+    def ranking(self, question_type: str = ALL_TYPES, metric: str = DEFAULT_METRIC) -> Ranking:
+        question_type = question_type.lower()
+        with self._lock:
+            cached = self._rankings.get(question_type)
+            if cached is None or time.monotonic() - cached[0] > self.ttl_sec:
+                cached = (time.monotonic(), self._load(question_type))
+                self._rankings[question_type] = cached
+        return cached[1][metric]
+
+    def top(self, question_type: str = ALL_TYPES, metric: str = DEFAULT_METRIC,
+            limit: int = DEFAULT_TOP_N) -> List[UserProgress]:
+        return self.ranking(question_type, metric).top[:limit]
+
+    def rank(self, progress: UserProgress, metric: str = DEFAULT_METRIC) -> Optional[RankInfo]:
+        return self.ranking(progress.question_type, metric).rank_of(progress)
+
+
+def parse_args(args: List[str]) -> Tuple[str, str, int]:
+    """[유형] [지표] [N] 순서와 무관하게 해석 (예: /leaderboard CR volume 20)"""
+    question_type, metric, limit = ALL_TYPES, DEFAULT_METRIC, DEFAULT_TOP_N
+    for arg in args:
+        if arg.isdigit():
+            limit = min(max(int(arg), 1), MAX_TOP_N)
+        elif arg.lower() in METRIC_ALIASES:
+            metric = METRIC_ALIASES[arg.lower()]
+        else:
+            question_type = arg.lower()
+    return question_type, metric, limit
+
+
+def display_name(user_id: str, viewer_id: Optional[str] = None) -> str:
+    """텔레그램 ID 를 그대로 노출하지 않도록 끝 4자리만 표시"""
+    if user_id == viewer_id:
+        return "👉 나"
+    return f"유저 …{str(user_id)[-4:]}"
@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
+from llm_client import LLMClient, delta_text
+from model_router import route
+from question_bank import EXPLANATION_COLUMNS
+from question_catalog import display_number
+
+# 💡 봇 실시간 해설 생성
+# 해설이 없는 문제를 풀면 generate_explanations_ko/en 의 프롬프트와 model_router 의 모델로 스트리밍 생성하여
+# 텔레그램 메시지를 점진적으로 수정하고, 완성된 해설은 questions 테이블에 저장합니다.
+# 다음 사용자부터는 저장된 해설을 그대로 사용합니다.
+
+# 텔레그램 메시지 수정 간격 (채팅당 초당 약 1회 제한)
+EDIT_INTERVAL_SEC = 1.0
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+
+# 봇 프로세스 전체에서 하나의 LLM 클라이언트 (예산 없음, 봇 종료 시 사용량 장부 저장)
+llm = LLMClient("live-explanation")
+
+
+def stream_explanation(question: Dict, lang: str = "ko") -> Iterator[str]:
+    """해설을 스트리밍으로 생성하며 지금까지 누적된 텍스트를 yield 합니다"""
+    if lang == "en":
+        from generate_explanations_en import build_messages_en as build_messages
+    else:
+        from generate_explanations_ko import build_messages_ko as build_messages
+
+    choices = question["choices"]
+    messages = build_messages(question["question"], choices, question["answer"])
+    r = route("gen-en" if lang == "en" else "gen-ko", question.get("type"),
+              question["question"] + "\n" + "\n".join(map(str, choices)))
+
+    text = ""
+    for chunk in llm.stream(model=r.model, messages=messages, max_tokens=r.max_tokens):
+        delta = delta_text(chunk)
+        if delta:
+            text += delta
+            yield text
+
+
+class LiveExplainer:
+    """해설 스트리밍 → 메시지 수정 → DB 저장을 담당합니다"""
+
+    def __init__(self, supabase, catalog=None):
+        self.supabase = supabase
+        self.catalog = catalog
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def explain_into_message(self, message, question: Dict, lang: str = "ko") -> Optional[str]:
+        """message(텔레그램 Message)를 생성 중인 해설로 계속 수정합니다"""
+        qid = question["id"]
+        with self._lock:
+            if qid in self._in_flight:
+                message.edit_text("📝 다른 사용자를 위해 해설을 생성 중입니다. 잠시 후 다시 확인해주세요.")
+                return None
+            self._in_flight.add(qid)
+
+        try:
+            text = ""
+            shown = ""
+            last_edit = 0.0
+            for text in stream_explanation(question, lang):
+                now = time.monotonic()
+                if now - last_edit >= EDIT_INTERVAL_SEC:
+                    shown = self._edit(message, text + " ▌", shown)
+                    last_edit = now
+
+            text = text.strip()
+            if not text:
+                message.edit_text("❌ 해설을 생성하지 못했습니다.")
+                return None
+
+            self._edit(message, text, shown)
+            self._save(question, text, lang)
+            return text
+
+        except Exception as e:
+            print(f"❌ 실시간 해설 생성 실패 ({qid}): {e}")
+            message.edit_text("❌ 해설 생성 중 오류가 발생했습니다.")
+            return None
+        finally:
+            with self._lock:
+                self._in_flight.discard(qid)
+
+    def _edit(self, message, text: str, shown: str) -> str:
+        body = f"📝 해설: {text}"[:TELEGRAM_MESSAGE_LIMIT]
+        if body != shown:
+            try:
+                message.edit_text(body)
+            except Exception as e:
+                # "message is not modified" 등은 무시하고 계속 진행
+                print(f"⚠️ 해설 메시지 수정 실패: {e}")
+        return body
+
+    def _save(self, question: Dict, text: str, lang: str) -> None:
+        column = EXPLANATION_COLUMNS.get(lang, "explanation")
+        result = self.supabase.table("questions").update({column: text}).eq("id", question["id"]).execute()
+        if result.data:
+            print(f"💾 {display_number(question)}번 해설 저장 ({len(text)}자)")
+        else:
+            # RLS 가 update 를 막으면 오류 없이 0행이 반환됨 → 봇에 SUPABASE_SERVICE_ROLE_KEY 가 필요
+            print(f"⚠️ {display_number(question)}번 해설이 DB 에 저장되지 않음 (업데이트된 행 0개, 권한/RLS 확인)")
+        # 카탈로그 캐시에도 반영 → 이 프로세스에서는 다음 사용자부터 바로 해설을 봄 (저장 실패 시 다음 재로드까지)
+        if self.catalog is not None:
+            self.catalog.update_cached(question["id"], {column: text})
@@ -0,0 +1,324 @@
+import asyncio
+import atexit
+import csv
+import json
+import os
+import statistics
+import threading
+import time
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 🧮 공용 LLM 클라이언트 (토큰 / 지연 / 비용 기록)
+# 업로더, 해설 생성, 포맷터, 봇 실시간 해설이 모두 이 래퍼로 ChatCompletion 을 호출합니다.
+# - openai 0.28 (openai.ChatCompletion) 과 1.x (OpenAI().chat.completions) 를 모두 지원
+# - 호출마다 모델, 입력/출력 토큰, 지연, 재시도 횟수, 추정 비용, 성공 여부를 장부(Ledger)에 기록
+# - 프로세스가 끝날 때 모델별 요약을 출력하고 .cache/llm_ledger/<단계>-<시각>.csv/.json 으로 저장
+# - 예산: LLM_BUDGET_USD / LLM_BUDGET_TOKENS / LLM_BUDGET_CALLS 를 넘으면 다음 호출 전에 실행을 중단
+# - 재시도는 429/타임아웃/연결 오류/5xx 만 (인증 오류, 400 잘못된 요청은 바로 실패), 지연은 성공한 시도만 측정
+# 가격은 1K 토큰당 (입력, 출력) USD 추정치이며 LLM_PRICES_JSON='{"gpt-4o": [0.0025, 0.01]}' 로 덮어쓸 수 있습니다.
+
+LEDGER_DIR = os.getenv("LLM_LEDGER_DIR", ".cache/llm_ledger")
+DEFAULT_RETRIES = 3
+
+PRICES_PER_1K = {
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4.1-mini": (0.0004, 0.0016),
+    "gpt-4.1": (0.002, 0.008),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4": (0.03, 0.06),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+}
+PRICES_PER_1K.update({k: tuple(v) for k, v in json.loads(os.getenv("LLM_PRICES_JSON", "{}")).items()})
+
+
+# openai 0.28 (openai.error.*) 와 1.x (openai.*) 예외 이름
+RETRYABLE_ERROR_NAMES = {
+    "RateLimitError", "Timeout", "APITimeoutError", "APIConnectionError",
+    "ServiceUnavailableError", "InternalServerError", "TryAgain",
+}
+
+
+def is_retryable_error(exc: Exception) -> bool:
+    """다시 보내면 성공할 수 있는 오류(429/타임아웃/연결/5xx)인지 판단합니다"""
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    if any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(exc).__mro__):
+        return True
+    for attr in ("status_code", "http_status"):
+        status = getattr(exc, attr, None)
+        if isinstance(status, int) and (status == 429 or status >= 500):
+            return True
+    return False
+
+
+class BudgetExceeded(SystemExit):
+    """예산 초과 - 문제별 `except Exception` 에 삼켜지지 않고 실행 전체를 중단합니다 (요약/장부는 atexit 에서 기록)"""
+
+
+def model_price(model: str):
+    """가장 긴 접두어가 일치하는 가격 (gpt-4o-mini-2024-07-18 → gpt-4o-mini)"""
+    matches = [name for name in PRICES_PER_1K if model.startswith(name)]
+    return PRICES_PER_1K[max(matches, key=len)] if matches else (0.0, 0.0)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    price_in, price_out = model_price(model)
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1000
+
+
+def estimate_tokens(text: str) -> int:
+    """usage 가 없을 때(0.28 스트리밍 등) 쓰는 대략치: 영어 약 4자, 한글 약 1.5자당 1토큰"""
+    hangul = sum(1 for ch in text if '가' <= ch <= '힣')
+    return int((len(text) - hangul) / 4 + hangul / 1.5) + 1
+
+
+@dataclass
+class CallRecord:
+    at: str
+    stage: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0.0
+    retries: int = 0
+    cost_usd: float = 0.0
+    ok: bool = True
+    estimated: bool = False
+    error: str = ""
+
+
+@dataclass
+class Budget:
+    max_cost_usd: Optional[float] = None
+    max_tokens: Optional[int] = None
+    max_calls: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> "Budget":
+        def read(name, cast):
+            value = os.getenv(name)
+            return cast(value) if value else None
+        return cls(read("LLM_BUDGET_USD", float), read("LLM_BUDGET_TOKENS", int), read("LLM_BUDGET_CALLS", int))
+
+    def check(self, ledger: "Ledger") -> None:
+        if self.max_cost_usd is not None and ledger.cost_usd >= self.max_cost_usd:
+            raise BudgetExceeded(f"💸 LLM 예산 초과: ${ledger.cost_usd:.4f} ≥ ${self.max_cost_usd} (LLM_BUDGET_USD)")
+        if self.max_tokens is not None and ledger.tokens >= self.max_tokens:
+            raise BudgetExceeded(f"💸 LLM 토큰 한도 초과: {ledger.tokens} ≥ {self.max_tokens} (LLM_BUDGET_TOKENS)")
+        if self.max_calls is not None and len(ledger.records) >= self.max_calls:
+            raise BudgetExceeded(f"💸 LLM 호출 한도 초과: {len(ledger.records)} ≥ {self.max_calls} (LLM_BUDGET_CALLS)")
+
+
+class Ledger:
+    """호출 기록 (스레드 안전)"""
+
+    def __init__(self):
+        self.records: List[CallRecord] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: CallRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    @property
+    def cost_usd(self) -> float:
+        return sum(r.cost_usd for r in self.records)
+
+    @property
+    def tokens(self) -> int:
+        return sum(r.prompt_tokens + r.completion_tokens for r in self.records)
+
+    def by_model(self) -> Dict[str, Dict]:
+        summary = {}
+        for model in sorted({r.model for r in self.records}):
+            records = [r for r in self.records if r.model == model]
+            latencies = sorted(r.latency_ms for r in records if r.ok)
+            completion = sum(r.completion_tokens for r in records)
+            summary[model] = {
+                "calls": len(records),
+                "failures": sum(1 for r in records if not r.ok),
+                "retries": sum(r.retries for r in records),
+                "prompt_tokens": sum(r.prompt_tokens for r in records),
+                "completion_tokens": completion,
+                "cost_usd": round(sum(r.cost_usd for r in records), 6),
+                "avg_latency_ms": round(statistics.mean(latencies), 1) if latencies else None,
+                "p95_latency_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 1) if latencies else None,
+                "completion_tokens_per_sec": round(completion / (sum(latencies) / 1000), 1) if latencies and sum(latencies) else None,
+            }
+        return summary
+
+    def print_summary(self, stage: str) -> None:
+        print("\n" + "=" * 60)
+        print(f"🧮 LLM 사용량 ({stage}): 호출 {len(self.records)}회, 토큰 {self.tokens:,}, 추정 비용 ${self.cost_usd:.4f}")
+        print("=" * 60)
+        for model, s in self.by_model().items():
+            print(f"  {model}: {s['calls']}회 (실패 {s['failures']}, 재시도 {s['retries']}) · "
+                  f"입력 {s['prompt_tokens']:,} / 출력 {s['completion_tokens']:,} 토큰 · ${s['cost_usd']:.4f} · "
+                  f"평균 {s['avg_latency_ms']}ms, p95 {s['p95_latency_ms']}ms, {s['completion_tokens_per_sec']} tok/s")
+        if any(r.estimated for r in self.records):
+            print("  (usage 가 없는 스트리밍 호출은 글자 수로 토큰을 추정했습니다)")
+
+    def write(self, stage: str, directory: str = LEDGER_DIR) -> str:
+        """CSV(호출별) + JSON(요약 + 호출별) 저장, 경로 접두어를 반환"""
+        os.makedirs(directory, exist_ok=True)
+        prefix = os.path.join(directory, f"{stage}-{datetime.now().strftime('%Y%m%d_%H%M%S')}-{os.getpid()}")
+        with open(f"{prefix}.csv", "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(CallRecord)])
+            writer.writeheader()
+            writer.writerows(asdict(r) for r in self.records)
+        with open(f"{prefix}.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "stage": stage,
+                "written_at": datetime.now().isoformat(timespec="seconds"),
+                "calls": len(self.records),
+                "tokens": self.tokens,
+                "cost_usd": round(self.cost_usd, 6),
+                "by_model": self.by_model(),
+                "records": [asdict(r) for r in self.records],
+            }, f, ensure_ascii=False, indent=1)
+        return prefix
+
+
+def _usage(response):
+    usage = getattr(response, "usage", None)
+    if usage is None and isinstance(response, dict):
+        usage = response.get("usage")
+    if not usage:
+        return None
+    get = usage.get if isinstance(usage, dict) else lambda name: getattr(usage, name, 0)
+    return get("prompt_tokens") or 0, get("completion_tokens") or 0
+
+
+def delta_text(chunk) -> str:
+    """스트리밍 청크의 추가 텍스트 (0.28 은 dict, 1.x 는 객체)"""
+    if not chunk.choices:
+        return ""
+    delta = chunk.choices[0].delta
+    return (delta.get("content") if isinstance(delta, dict) else delta.content) or ""
+
+
+class LLMClient:
+    """단계(stage)별 ChatCompletion 래퍼: chat / achat / stream 모두 장부에 기록합니다"""
+
+    def __init__(self, stage: str, api_key: Optional[str] = None, budget: Optional[Budget] = None,
+                 retries: int = DEFAULT_RETRIES, write_ledger: bool = True):
+        self.stage = stage
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.budget = budget or Budget()
+        self.retries = retries
+        self.write_ledger = write_ledger
+        self.ledger = Ledger()
+        self._backend = None
+        self._finished = False
+        atexit.register(self.finish)
+
+    # --- openai 0.28 / 1.x ---
+    def _load_backend(self):
+        """openai 는 첫 호출 때만 import 합니다 (CLI 시작 속도)"""
+        if self._backend is None:
+            import openai
+            if hasattr(openai, "OpenAI"):
+                client, async_client = openai.OpenAI(api_key=self.api_key), openai.AsyncOpenAI(api_key=self.api_key)
+                self._backend = (client.chat.completions.create, async_client.chat.completions.create)
+            else:
+                openai.api_key = self.api_key
+                self._backend = (openai.ChatCompletion.create, openai.ChatCompletion.acreate)
+        return self._backend
+
+    # --- 기록 ---
+    def _record(self, request: Dict, started: float, retries: int, response=None, error: Optional[Exception] = None,
+                completion_text: Optional[str] = None) -> None:
+        model = request.get("model", "?")
+        usage = _usage(response) if response is not None else None
+        estimated = False
+        if usage is None and error is None:
+            prompt_text = "".join(str(m.get("content", "")) for m in request.get("messages", []))
+            usage, estimated = (estimate_tokens(prompt_text), estimate_tokens(completion_text or "")), True
+        prompt_tokens, completion_tokens = usage or (0, 0)
+        self.ledger.add(CallRecord(
+            at=datetime.now().isoformat(timespec="seconds"),
+            stage=self.stage,
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms=round((time.perf_counter() - started) * 1000, 1),
+            retries=retries,
+            cost_usd=round(estimate_cost(model, prompt_tokens, completion_tokens), 6),
+            ok=error is None,
+            estimated=estimated,
+            error="" if error is None else str(error)[:300],
+        ))
+
+    # --- 호출 ---
+    def chat(self, retries: Optional[int] = None, **request):
+        """동기 ChatCompletion (일시 오류만 지수 백오프로 retries 회 재시도, 마지막 오류는 다시 발생)"""
+        retries = self.retries if retries is None else retries
+        self.budget.check(self.ledger)
+        create, _ = self._load_backend()
+        for attempt in range(retries + 1):
+            started = time.perf_counter()
+            try:
+                response = create(**request)
+            except Exception as e:
+                if attempt == retries or not is_retryable_error(e):
+                    self._record(request, started, attempt, error=e)
+                    raise
+                print(f"⚠️ LLM 요청 실패, 재시도 {attempt + 1}/{retries}: {e}")
+                time.sleep(min(2 ** (attempt + 1), 30))
+                continue
+            self._record(request, started, attempt, response=response)
+            return response
+
+    async def achat(self, retries: Optional[int] = None, **request):
+        """비동기 ChatCompletion (chat 과 같은 재시도/기록)"""
+        retries = self.retries if retries is None else retries
+        self.budget.check(self.ledger)
+        _, acreate = self._load_backend()
+        for attempt in range(retries + 1):
+            started = time.perf_counter()
+            try:
+                response = await acreate(**request)
+            except Exception as e:
+                if attempt == retries or not is_retryable_error(e):
+                    self._record(request, started, attempt, error=e)
+                    raise
+                await asyncio.sleep(min(2 ** (attempt + 1), 30))
+                continue
+            self._record(request, started, attempt, response=response)
+            return response
+
+    def stream(self, **request) -> Iterator:
+        """스트리밍 ChatCompletion 청크를 그대로 넘기고, 끝나면 usage(없으면 추정치)를 기록합니다"""
+        self.budget.check(self.ledger)
+        create, _ = self._load_backend()
+        request = {**request, "stream": True, "stream_options": {"include_usage": True}}
+        started = time.perf_counter()
+        usage_chunk, text = None, ""
+        try:
+            for chunk in create(**request):
+                if _usage(chunk):
+                    usage_chunk = chunk
+                text += delta_text(chunk)
+                yield chunk
+        except Exception as e:
+            self._record(request, started, 0, error=e)
+            raise
+        self._record(request, started, 0, response=usage_chunk, completion_text=text)
+
+    # --- 마무리 ---
+    def finish(self) -> None:
+        """요약 출력 + 장부 저장 (호출이 없었으면 아무것도 하지 않음, 여러 번 불러도 한 번만)"""
+        if self._finished or not self.ledger.records:
+            return
+        self._finished = True
+        self.ledger.print_summary(self.stage)
+        if self.write_ledger:
+            prefix = self.ledger.write(self.stage)
+            print(f"💾 LLM 장부 저장: {prefix}.csv / .json")
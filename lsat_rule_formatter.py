@@ -0,0 +1,301 @@
+import argparse
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+# 🧩 규칙 기반 LSAT 문제 정리
+# OpenAI 없이 LSAT 문제를 본문 / 질문 / 보기 (A)~(E) 로 분리하고 신뢰도(0~1)를 매깁니다.
+# 신뢰도가 기준 이상인 문제는 그대로 사용하고, 기준 미만인 문제만 LLM으로 보냅니다.
+#
+# 지원하는 레이아웃
+#   inline   : "(A) 보기 내용" 이 줄 안에 붙어 있는 형태
+#   letter   : "A. 보기 내용" / "A) 보기 내용" 형태
+#   markers  : "(A)" ~ "(E)" 가 각각 한 줄씩 나오고 보기 내용이 (E) 뒤에 몰려 있는 형태
+#              (PDF 추출본 - format_lsat_questions 가 처리하던 레이아웃)
+
+MIN_CONFIDENCE = float(os.getenv("LSAT_RULE_MIN_CONFIDENCE", "0.8"))
+
+LETTERS = ['A', 'B', 'C', 'D', 'E']
+
+# clean_lsat_step1 / format_lsat_questions 와 같은 페이지 잡데이터
+JUNK_LINE_PATTERN = re.compile(
+    r'^(GO ON TO THE NEXT PAGE|PrepTest|\d+ Questions|\d+|[A-Z]|-\d+-?|\(Nov|\d{4}\))\.?$',
+    re.IGNORECASE,
+)
+MARKER_LINE_PATTERN = re.compile(r'^\(([A-E])\)$')
+LETTER_LINE_PATTERN = re.compile(r'^([A-E])[.)]\s+(.+)$')
+INLINE_MARKER_PATTERN = re.compile(r'\(([A-E])\)\s*')
+SPEAKER_PATTERN = re.compile(r'^[A-Z][A-Za-z.]*(?: [A-Z][A-Za-z.]*)?:\s')
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+(?=["“(]?[A-Z])')
+# 마침표로 끝나도 문장 끝이 아닌 약어 ("Dr. Lee", "the U.S. Senate")
+ABBREVIATIONS = {
+    "dr.", "mr.", "mrs.", "ms.", "prof.", "st.", "jr.", "sr.", "mt.", "gen.", "gov.", "sen.", "rep.",
+    "u.s.", "u.k.", "e.g.", "i.e.", "vs.", "no.", "inc.", "co.", "corp.", "ltd.",
+}
+
+# 질문(stem)에 거의 항상 들어가는 표현
+STEM_CUE_PATTERN = re.compile(
+    r"which (?:one )?of the following|each of the following|if true|most|whether|"
+    r"argument|reasoning|conclusion|assum|principle|flaw|infer|statements above|\?$|:$",
+    re.IGNORECASE,
+)
+
+MAX_CHOICE_LENGTH = 600
+
+
+@dataclass
+class RuleResult:
+    problem_num: str
+    text: Optional[str]
+    confidence: float
+    layout: str
+    reasons: List[str] = field(default_factory=list)
+
+
+def _clean_lines(content: str) -> List[str]:
+    lines = []
+    for line in content.split('\n'):
+        line = line.strip()
+        if not line or (JUNK_LINE_PATTERN.match(line) and not MARKER_LINE_PATTERN.match(line)):
+            continue
+        lines.append(line)
+    return lines
+
+
+def _join(lines: List[str]) -> str:
+    """PDF 줄바꿈을 공백으로 합치되, 대화형 지문의 화자("Javier:")는 줄을 나눕니다"""
+    paragraphs: List[str] = []
+    for line in lines:
+        if paragraphs and not SPEAKER_PATTERN.match(line):
+            paragraphs[-1] += ' ' + line
+        else:
+            paragraphs.append(line)
+    return '\n'.join(re.sub(r'\s+', ' ', p).strip() for p in paragraphs)
+
+
+def split_sentences(text: str) -> List[str]:
+    """문장 경계로 나누되, 약어("Dr.", "U.S.")와 이름 머리글자("John F. Kennedy") 뒤에서는 나누지 않습니다"""
+    sentences, start = [], 0
+    for m in SENTENCE_BOUNDARY.finditer(text):
+        word = text[start:m.start()].rsplit(None, 1)[-1].lstrip('"“(')
+        if word.lower() in ABBREVIATIONS or re.fullmatch(r'[A-Z]\.', word):
+            continue
+        sentences.append(text[start:m.start()])
+        start = m.end()
+    sentences.append(text[start:])
+    return sentences
+
+
+def split_stem(body: str) -> Tuple[str, str]:
+    """본문 끝 문장을 질문으로 분리합니다 → (지문, 질문)"""
+    sentences = split_sentences(body.strip())
+    stem = sentences[-1].strip()
+    passage = body.strip()[:len(body.strip()) - len(stem)].strip()
+    # 마지막 문단 안에서 분리되었다면 문단 구분 유지
+    if '\n' in stem:
+        head, stem = stem.rsplit('\n', 1)
+        passage = f"{passage} {head}".strip() if passage else head
+    return passage, stem
+
+
+def _inline_choices(lines: List[str]) -> Optional[Tuple[str, List[str]]]:
+    text = _join(lines)
+    parts = INLINE_MARKER_PATTERN.split(text)
+    # parts = [본문, 'A', 내용, 'B', 내용, ...]
+    if [parts[i] for i in range(1, len(parts), 2)] != LETTERS:
+        return None
+    choices = [parts[i].strip() for i in range(2, len(parts), 2)]
+    if not all(choices):
+        return None
+    return parts[0], choices
+
+
+def _letter_choices(lines: List[str]) -> Optional[Tuple[str, List[str]]]:
+    starts = []
+    for i, line in enumerate(lines):
+        m = LETTER_LINE_PATTERN.match(line)
+        if m and m.group(1) == LETTERS[len(starts)]:
+            starts.append(i)
+            if len(starts) == 5:
+                break
+    if len(starts) != 5:
+        return None
+
+    choices = []
+    for n, start in enumerate(starts):
+        end = starts[n + 1] if n + 1 < len(starts) else len(lines)
+        first = LETTER_LINE_PATTERN.match(lines[start]).group(2)
+        choices.append(re.sub(r'\s+', ' ', ' '.join([first, *lines[start + 1:end]])).strip())
+    return _join(lines[:starts[0]]), choices
+
+
+def split_choice_block(lines: List[str]) -> Tuple[Optional[List[str]], float, str]:
+    """(E) 뒤에 몰려 있는 보기 내용을 5개로 나눕니다 → (보기, 신뢰도, 방법)"""
+    text = re.sub(r'\s+', ' ', ' '.join(lines)).strip()
+
+    # 1) 문장 경계가 정확히 5개 보기로 나뉘는 경우
+    sentences = [s.strip() for s in split_sentences(text) if s.strip()]
+    if len(sentences) == 5:
+        return sentences, 0.85, "sentences"
+
+    # 2) 마침표로 끝나는 줄 단위 (보기마다 줄이 끝나는 PDF)
+    chunks, current = [], []
+    for line in lines:
+        current.append(line)
+        if re.search(r'[.?!]["”]?$', line):
+            chunks.append(' '.join(current))
+            current = []
+    if current:
+        chunks.append(' '.join(current))
+    if len(chunks) == 5:
+        return [re.sub(r'\s+', ' ', c).strip() for c in chunks], 0.8, "line-ends"
+
+    return None, 0.0, f"보기 분리 실패 (문장 {len(sentences)}개)"
+
+
+def _marker_choices(lines: List[str]) -> Optional[Tuple[str, List[str], float, str]]:
+    markers = [i for i, line in enumerate(lines) if MARKER_LINE_PATTERN.match(line)]
+    if [MARKER_LINE_PATTERN.match(lines[i]).group(1) for i in markers] != LETTERS:
+        return None
+    choices, score, how = split_choice_block(lines[markers[-1] + 1:])
+    return _join(lines[:markers[0]]), choices, score, how
+
+
+def format_problem(problem_num: str, content: str) -> RuleResult:
+    """단일 문제를 규칙 기반으로 정리하고 신뢰도를 계산합니다"""
+    problem_num = problem_num.strip()
+    if not problem_num.endswith('.'):
+        problem_num += '.'
+    lines = _clean_lines(content)
+    if not lines:
+        return RuleResult(problem_num, None, 0.0, "empty", ["내용 없음"])
+
+    reasons: List[str] = []
+    parsed = _inline_choices(lines)
+    if parsed:
+        layout, confidence = "inline", 1.0
+        body, choices = parsed
+    else:
+        parsed = _letter_choices(lines)
+        if parsed:
+            layout, confidence = "letter", 0.95
+            body, choices = parsed
+        else:
+            marker = _marker_choices(lines)
+            if not marker:
+                return RuleResult(problem_num, None, 0.0, "unknown", ["보기 (A)~(E) 를 찾지 못함"])
+            body, choices, confidence, how = marker
+            layout = f"markers/{how}"
+            if choices is None:
+                return RuleResult(problem_num, None, 0.0, "markers", [how])
+
+    passage, stem = split_stem(body)
+    if not stem:
+        return RuleResult(problem_num, None, 0.0, layout, ["질문 없음"])
+    if not STEM_CUE_PATTERN.search(stem):
+        # 질문을 잘못 잘랐을 가능성이 크므로 규칙 결과를 쓰지 않고 LLM 으로 보냄
+        return RuleResult(problem_num, None, 0.0, layout, ["질문 표현을 찾지 못함"])
+    if not passage:
+        confidence -= 0.1
+        reasons.append("지문 없음")
+    if any(len(c) > MAX_CHOICE_LENGTH for c in choices):
+        confidence -= 0.3
+        reasons.append("보기가 비정상적으로 김")
+    if any(INLINE_MARKER_PATTERN.search(c) for c in choices):
+        confidence -= 0.3
+        reasons.append("보기 안에 보기 기호가 남음")
+
+    parts = [problem_num]
+    if passage:
+        parts.append(passage)
+        parts.append("")
+    parts.append(stem)
+    parts.append("")
+    parts.extend(f"({letter}) {choice}" for letter, choice in zip(LETTERS, choices))
+
+    return RuleResult(problem_num, '\n'.join(parts), round(max(confidence, 0.0), 2), layout, reasons)
+
+
+def rule_formatter(min_confidence: float = MIN_CONFIDENCE) -> Callable[[str, str], Optional[str]]:
+    """신뢰도가 기준 이상일 때만 정리 결과를 돌려주는 함수 (LLM 포맷터의 선처리용)"""
+
+    def format_locally(problem_num: str, problem_content: str) -> Optional[str]:
+        result = format_problem(problem_num, problem_content)
+        if result.text and result.confidence >= min_confidence:
+            print(f"  🧩 문제 {problem_num} 규칙 기반 정리 ({result.layout}, 신뢰도 {result.confidence:.2f})")
+            return result.text
+        return None
+
+    return format_locally
+
+
+def format_lsat_with_rules(input_file, output_file, min_confidence=MIN_CONFIDENCE):
+    """LSAT 파일 전체를 규칙 기반으로 정리합니다 (신뢰도 미달 문제는 원문 유지)"""
+    from parallel_format import split_problems
+
+    print(f"=== {input_file} 규칙 기반 정리 시작 (기준 신뢰도 {min_confidence:.2f}) ===")
+
+    try:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        print(f"파일 읽기 오류: {e}")
+        return None
+
+    problems = split_problems(content)
+    results = [format_problem(num, body) for num, body in problems]
+
+    output = []
+    low_confidence = []
+    for (_, body), result in zip(problems, results):
+        if result.text and result.confidence >= min_confidence:
+            output.append(result.text)
+        else:
+            low_confidence.append(result)
+            output.append(f"{result.problem_num}\n{body.strip()}")
+
+    try:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write('\n\n'.join(output))
+    except Exception as e:
+        print(f"파일 저장 오류: {e}")
+        return None
+
+    layouts = {}
+    for result in results:
+        layouts[result.layout] = layouts.get(result.layout, 0) + 1
+
+    print(f"\n📊 규칙 기반 정리 결과: {len(results)}개 중 {len(results) - len(low_confidence)}개 정리")
+    for layout, count in sorted(layouts.items(), key=lambda x: -x[1]):
+        print(f"  - {layout}: {count}개")
+    if low_confidence:
+        print(f"\n⚠️ 신뢰도 미달 {len(low_confidence)}개 (원문 유지, LLM 정리 대상):")
+        for result in low_confidence:
+            reason = ', '.join(result.reasons) or "-"
+            print(f"  문제 {result.problem_num} 신뢰도 {result.confidence:.2f} ({result.layout}): {reason}")
+    print(f"  저장된 파일: {output_file}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="규칙 기반 LSAT 문제 정리 (오프라인)")
+    parser.add_argument("--input", default='questionbank/lsat/LSAT.txt', help="원본 LSAT 파일")
+    parser.add_argument("--output", default='questionbank/lsat/LSAT_rules.txt', help="결과 파일")
+    parser.add_argument("--min-confidence", type=float, default=MIN_CONFIDENCE, help="통과 기준 신뢰도 (0~1)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("LSAT 문제 규칙 기반 정리 스크립트")
+    print("본문 + 질문 + 보기 분리 (OpenAI 미사용)")
+    print("=" * 60)
+
+    if not os.path.exists(args.input):
+        print(f"❌ 파일을 찾을 수 없습니다: {args.input}")
+        return False
+
+    return format_lsat_with_rules(args.input, args.output, args.min_confidence) is not None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+import argparse
+import glob
+import json
+import os
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from explanation_quality import REGENERATE_BELOW, ExplanationScore, score_questions
+from llm_client import LEDGER_DIR, estimate_cost, estimate_tokens
+
+# 🧭 모델 라우팅
+# 해설 생성 단계(stage)마다 모델과 max_tokens 를 문제 유형, 본문 길이, 지난 해설 품질 점수로 고릅니다.
+# - 짧은 CR 문제는 작고 빠른 모델, 긴 LSAT 지문만 큰 모델
+# - 지난 해설이 품질 기준(REGENERATE_BELOW) 미만이었으면 큰 모델로 올림 (빈/자리표시자 해설은 제외 - 처음 쓰는 것)
+# - GPT_MODEL 이 설정되어 있으면 모든 단계에서 그 모델로 고정
+# 정책은 ROUTER_POLICY (routed / legacy / small / large) 로 고르며, legacy 는 예전 스크립트별 고정 모델입니다.
+# 환경 변수(ROUTER_*, GPT_MODEL)는 import 가 아니라 route() 를 부를 때 읽습니다 (.env 를 나중에 로드하는 스크립트 포함).
+#   python model_router.py                 # 문제은행 파일 기준 정책별 예상 비용/시간
+#   python model_router.py --db            # questions 테이블 기준 (gen-ko 가 재생성할 문제만)
+
+DEFAULT_SMALL_MODEL = "gpt-4o-mini"
+DEFAULT_LARGE_MODEL = "gpt-4o"
+DEFAULT_POLICY = "routed"
+
+# 이 길이(본문 + 보기, 글자 수) 이상이면 긴 문제 (ROUTER_LONG_STEM_CHARS)
+DEFAULT_LONG_STEM_CHARS = 1500
+LONG_TOKEN_FACTOR = 1.5
+
+# 단계별 기본 max_tokens (한 언어 / 두 언어 JSON)
+STAGE_MAX_TOKENS = {
+    "upload-cr": 600,
+    "upload-og": 900,
+    "upload-lsat-explain": 1200,
+    "gen-ko": 500,
+    "gen-en": 500,
+}
+
+# 예전 스크립트별 고정값 (legacy 정책, 비교 기준) - 모델이 None 이면 GPT_MODEL (없으면 gpt-4o-mini)
+LEGACY_ROUTES = {
+    "upload-cr": ("gpt-3.5-turbo", 500),
+    "upload-og": ("gpt-4", 1000),
+    "upload-lsat-explain": ("gpt-4", 1500),
+    "gen-ko": (None, 500),
+    "gen-en": (None, 500),
+}
+
+# 비용/시간 추정용: 프롬프트 지시문 토큰, 출력이 max_tokens 를 채우는 비율,
+# 장부(.cache/llm_ledger)에 기록이 없을 때 쓰는 모델별 (기본 지연 초, 출력 토큰/초)
+PROMPT_OVERHEAD_TOKENS = 350
+COMPLETION_FILL = 0.6
+DEFAULT_THROUGHPUT = {
+    "gpt-4o-mini": (0.5, 80.0),
+    "gpt-4o": (0.6, 60.0),
+    "gpt-4.1-mini": (0.5, 70.0),
+    "gpt-4.1": (0.7, 50.0),
+    "gpt-4-turbo": (0.8, 30.0),
+    "gpt-4": (1.0, 20.0),
+    "gpt-3.5-turbo": (0.4, 90.0),
+}
+
+# 파일 출처 → 그 문제를 처리하는 업로드 단계
+SOURCE_STAGES = {"cr": "upload-cr", "og": "upload-og", "lsat": "upload-lsat-explain"}
+
+
+@dataclass
+class Route:
+    model: str
+    max_tokens: int
+    reason: str
+
+
+def small_model() -> str:
+    return os.getenv("ROUTER_SMALL_MODEL", DEFAULT_SMALL_MODEL)
+
+
+def large_model() -> str:
+    return os.getenv("ROUTER_LARGE_MODEL", DEFAULT_LARGE_MODEL)
+
+
+def _is_long(text: str) -> bool:
+    return len(text or "") >= int(os.getenv("ROUTER_LONG_STEM_CHARS", DEFAULT_LONG_STEM_CHARS))
+
+
+def legacy_route(stage: str, question_type: str, text: str, quality_score: Optional[int]) -> Route:
+    model, max_tokens = LEGACY_ROUTES[stage]
+    return Route(model or os.getenv("GPT_MODEL", "gpt-4o-mini"), max_tokens, "legacy")
+
+
+def fixed_route(model_fn):
+    def route_fn(stage: str, question_type: str, text: str, quality_score: Optional[int]) -> Route:
+        model = model_fn()
+        max_tokens = STAGE_MAX_TOKENS[stage]
+        if _is_long(text):
+            max_tokens = int(max_tokens * LONG_TOKEN_FACTOR)
+        return Route(model, max_tokens, f"고정 {model}")
+    return route_fn
+
+
+def routed_route(stage: str, question_type: str, text: str, quality_score: Optional[int]) -> Route:
+    long = _is_long(text)
+    max_tokens = int(STAGE_MAX_TOKENS[stage] * (LONG_TOKEN_FACTOR if long else 1))
+    forced = os.getenv("GPT_MODEL")
+    if forced:
+        return Route(forced, max_tokens, "GPT_MODEL 고정")
+    if (question_type or "").lower() == "lsat" and long:
+        return Route(large_model(), max_tokens, "긴 LSAT 지문")
+    if quality_score is not None and quality_score < REGENERATE_BELOW:
+        return Route(large_model(), max_tokens, f"지난 해설 품질 {quality_score}점")
+    return Route(small_model(), max_tokens, "긴 문제" if long else "짧은 문제")
+
+
+POLICIES = {
+    "routed": routed_route,
+    "legacy": legacy_route,
+    "small": fixed_route(small_model),
+    "large": fixed_route(large_model),
+}
+
+
+def route(stage: str, question_type: str, text: str, quality_score: Optional[int] = None,
+          policy: Optional[str] = None) -> Route:
+    """단계/유형/본문(+보기)/지난 품질 점수로 모델과 max_tokens 를 고릅니다 (policy 가 없으면 ROUTER_POLICY)"""
+    return POLICIES[policy or os.getenv("ROUTER_POLICY", DEFAULT_POLICY)](stage, question_type, text, quality_score)
+
+
+def escalation_score(score: ExplanationScore) -> Optional[int]:
+    """큰 모델로 올릴 근거가 되는 지난 점수 (빈/자리표시자 해설은 작은 모델이 처음 쓰는 것이므로 None)"""
+    if "placeholder" in score.rules:
+        return None
+    return score.score
+
+
+def observed_throughput(ledger_dir: str = LEDGER_DIR) -> Dict[str, tuple]:
+    """llm_client 장부의 실측값 → {모델: (0, 출력 토큰/초)} (성공 호출 5회 이상인 모델만)"""
+    totals = defaultdict(lambda: [0, 0.0, 0.0])  # 호출 수, 지연 합(ms), 출력 토큰 합
+    for path in glob.glob(os.path.join(ledger_dir, "*.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                records = json.load(f).get("records", [])
+        except (OSError, ValueError):
+            continue
+        for r in records:
+            if r.get("ok") and not r.get("estimated"):
+                t = totals[r["model"]]
+                t[0] += 1
+                t[1] += r["latency_ms"]
+                t[2] += r["completion_tokens"]
+
+    # 기본 지연을 따로 나누지 않고 실측 지연 전체를 출력 토큰 수로 나눈 처리량으로 사용
+    return {model: (0.0, completion / (latency_ms / 1000))
+            for model, (calls, latency_ms, completion) in totals.items()
+            if calls >= 5 and latency_ms and completion}
+
+
+def _throughput(model: str, observed: Dict[str, tuple]) -> tuple:
+    if model in observed:
+        return observed[model]
+    matches = [name for name in DEFAULT_THROUGHPUT if model.startswith(name)]
+    return DEFAULT_THROUGHPUT[max(matches, key=len)] if matches else (1.0, 30.0)
+
+
+@dataclass
+class Job:
+    stage: str
+    question_type: str
+    text: str
+    quality_score: Optional[int] = None
+
+
+def project(jobs: List[Job], policy: str, observed: Optional[Dict[str, tuple]] = None) -> Dict:
+    """정책 하나로 모든 작업을 보냈을 때의 예상 호출 수/토큰/비용/순차 소요 시간"""
+    observed = observed or {}
+    by_model = Counter()
+    reasons = Counter()
+    cost, seconds, prompt_total, completion_total = 0.0, 0.0, 0, 0
+    for job in jobs:
+        r = route(job.stage, job.question_type, job.text, job.quality_score, policy=policy)
+        prompt_tokens = estimate_tokens(job.text) + PROMPT_OVERHEAD_TOKENS
+        completion_tokens = int(r.max_tokens * COMPLETION_FILL)
+        base, tokens_per_sec = _throughput(r.model, observed)
+        cost += estimate_cost(r.model, prompt_tokens, completion_tokens)
+        seconds += base + completion_tokens / tokens_per_sec
+        prompt_total += prompt_tokens
+        completion_total += completion_tokens
+        by_model[r.model] += 1
+        reasons[r.reason] += 1
+    return {
+        "policy": policy,
+        "calls": len(jobs),
+        "by_model": dict(by_model),
+        "reasons": dict(reasons),
+        "prompt_tokens": prompt_total,
+        "completion_tokens": completion_total,
+        "cost_usd": round(cost, 4),
+        "seconds": round(seconds, 1),
+    }
+
+
+def print_projection(results: List[Dict]) -> None:
+    print("\n" + "=" * 60)
+    print("🧭 라우팅 정책별 예상 비용 / 시간 (순차 실행 기준, 추정치)")
+    print("=" * 60)
+    baseline = next((r for r in results if r["policy"] == "legacy"), None)
+    for r in results:
+        models = ", ".join(f"{model} {count}" for model, count in sorted(r["by_model"].items()))
+        compare = ""
+        if baseline and r is not baseline and baseline["cost_usd"]:
+            compare = (f"  (legacy 대비 비용 {r['cost_usd'] / baseline['cost_usd']:.0%}, "
+                       f"시간 {r['seconds'] / max(baseline['seconds'], 0.1):.0%})")
+        print(f"\n  [{r['policy']}] ${r['cost_usd']:.4f} · {r['seconds'] / 60:.1f}분 · "
+              f"입력 {r['prompt_tokens']:,} / 출력 {r['completion_tokens']:,} 토큰{compare}")
+        print(f"    모델: {models}")
+        if r["policy"] == "routed":
+            print(f"    이유: {', '.join(f'{k} {v}' for k, v in r['reasons'].items())}")
+
+
+def _choices_text(choices) -> str:
+    return "\n".join(str(c) for c in choices or [])
+
+
+def gen_ko_jobs(questions: List) -> List[Job]:
+    """generate_explanations_ko 와 같은 기준: 품질 미달로 표시되고 데이터가 온전한 문제만"""
+    scores = {s.id: s for s in score_questions(questions, columns=("explanation",))}
+    jobs = []
+    for q in questions:
+        score = scores.get(None if q.id is None else str(q.id))
+        if score is None or not score.needs_regeneration:
+            continue
+        if not q.question or len(q.choices or []) != 5 or not q.answer:
+            continue
+        jobs.append(Job("gen-ko", q.source, f"{q.question}\n{_choices_text(q.choices)}", escalation_score(score)))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모델 라우팅 정책별 예상 비용/시간 (dry-run, API 호출 없음)")
+    parser.add_argument("--db", action="store_true", help="questions 테이블에서 gen-ko 가 재생성할 문제만 (품질 기준 미만)")
+    parser.add_argument("--type", help="--db 사용 시 type 필터")
+    parser.add_argument("--policies", nargs="+", default=list(POLICIES), choices=list(POLICIES))
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🧭 모델 라우팅 dry-run")
+    print("=" * 60)
+
+    if args.db:
+        from question_bank import load_db
+        from storage import get_client
+        questions = load_db(get_client(service_role=True), args.type)
+        jobs = gen_ko_jobs(questions)
+        print(f"📖 questions 테이블 {len(questions)}개 → gen-ko 재생성 대상 {len(jobs)}개 (품질 {REGENERATE_BELOW}점 미만)")
+    else:
+        from question_bank import load_files
+        questions = load_files()
+        jobs = [Job(SOURCE_STAGES[q.source], q.source, f"{q.question}\n{_choices_text(q.choices)}") for q in questions]
+
+    if not jobs:
+        print("❌ 대상 문제가 없습니다.")
+        return False
+
+    observed = observed_throughput()
+    if observed:
+        print(f"⏱️ 장부 실측 처리량 사용: {', '.join(sorted(observed))}")
+    print_projection([project(jobs, policy, observed) for policy in args.policies])
+
+
+if __name__ == "__main__":
+    main()
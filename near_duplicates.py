@@ -0,0 +1,230 @@
+import argparse
+import array
+import hashlib
+import json
+import os
+import re
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+# 🧬 유사(중복) 문제 탐지 인덱스
+# 문제 본문 + 보기를 단어 3-gram 으로 쪼개 MinHash 서명을 만들고, LSH 밴드 버킷으로
+# 후보만 골라 비교합니다. 문제 하나를 찾을 때 전체 문제와 비교하지 않으므로
+# 업로드 직전 검사(DuplicateGuard)와 questions 테이블 전체 리포트(main)에 사용합니다.
+
+# 추정 Jaccard 유사도가 이 값 이상이면 중복으로 봅니다
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+# 기본은 업로드 시 경고만 함 (같은 지문의 다른 질문도 실제 문제이므로), SKIP_NEAR_DUPLICATES=1 이면 건너뜀
+SKIP_NEAR_DUPLICATES = os.getenv("SKIP_NEAR_DUPLICATES") == "1"
+
+NUM_PERM = 128
+BANDS = 16          # 16 밴드 x 8 행 → 유사도 약 0.7 부터 후보로 잡힘
+SHINGLE_SIZE = 3
+MIN_TOKENS = 5      # 이보다 짧은 본문은 색인하지 않음
+SEED = 20240623
+
+DEFAULT_REPORT = 'near_duplicates_report.json'
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9가-힣]+')
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall((text or '').lower())
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    tokens = tokenize(text)
+    if len(tokens) < MIN_TOKENS:
+        return set()
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def signature_text(question: str, choices: Sequence[str] = ()) -> str:
+    """중복 비교에 쓰는 텍스트: 본문 + 보기 (같은 지문이라도 질문/보기가 다르면 유사도가 낮아짐)"""
+    return '\n'.join([question or '', *map(str, choices or [])])
+
+
+@dataclass
+class Match:
+    key: str
+    other: str
+    similarity: float
+
+
+class MinHasher:
+    """shingle 마다 SHAKE-128 로 num_perm 개의 32비트 해시를 뽑아 위치별 최솟값을 취합니다
+
+    (a*x + b) mod p 순열을 파이썬 루프로 돌리는 것보다 몇 배 빠르며, 결과는 시드에 대해 결정적입니다.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = SEED):
+        self.num_perm = num_perm
+        self.salt = str(seed).encode('utf-8') + b':'
+
+    def signature(self, shingle_set: Iterable[str]) -> Optional[Tuple[int, ...]]:
+        if not shingle_set:
+            return None
+        size = self.num_perm * 4
+        rows = [array.array('I', hashlib.shake_128(self.salt + s.encode('utf-8')).digest(size))
+                for s in shingle_set]
+        return tuple(map(min, zip(*rows)))
+
+
+class NearDuplicateIndex:
+    """MinHash + LSH 인덱스 (키 → 서명)"""
+
+    def __init__(self, threshold: float = NEAR_DUP_THRESHOLD, num_perm: int = NUM_PERM, bands: int = BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm 은 bands 의 배수여야 합니다")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self.signatures: Dict[str, Tuple[int, ...]] = {}
+        self.buckets: Dict[Tuple[int, int], List[str]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> Iterable[Tuple[int, Hashable]]:
+        for band in range(self.bands):
+            yield band, hash(signature[band * self.rows:(band + 1) * self.rows])
+
+    def similarity(self, sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+    def add(self, key: str, text: str) -> bool:
+        signature = self.hasher.signature(shingles(text))
+        if signature is None:
+            return False
+        self.signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self.buckets[band_key].append(key)
+        return True
+
+    def _query_signature(self, signature: Tuple[int, ...], exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self.buckets.get(band_key, ()))
+        candidates.discard(exclude)
+
+        matches = []
+        for other in candidates:
+            score = self.similarity(signature, self.signatures[other])
+            if score >= self.threshold:
+                matches.append((other, score))
+        return sorted(matches, key=lambda m: -m[1])
+
+    def query(self, text: str) -> List[Tuple[str, float]]:
+        """본문과 유사한 (키, 유사도) 목록 - LSH 후보만 비교합니다"""
+        signature = self.hasher.signature(shingles(text))
+        if signature is None:
+            return []
+        return self._query_signature(signature)
+
+    def find_all(self) -> List[Match]:
+        """색인된 전체 문제에서 중복 쌍을 찾습니다"""
+        pairs = []
+        for key, signature in self.signatures.items():
+            for other, score in self._query_signature(signature, exclude=key):
+                if key < other:
+                    pairs.append(Match(key, other, round(score, 3)))
+        return sorted(pairs, key=lambda m: (-m.similarity, m.key))
+
+
+def _row_label(row: Dict) -> str:
+    number = row.get("question_number")
+    if number is None:
+        number = row.get("q_number")
+    return f"{(row.get('type') or 'db').lower()}:{number} (id={row.get('id')})"
+
+
+def build_table_index(client, threshold: float = NEAR_DUP_THRESHOLD) -> NearDuplicateIndex:
+    """questions 테이블 전체 본문으로 인덱스를 만듭니다"""
+    from storage import iter_rows
+
+    index = NearDuplicateIndex(threshold)
+    columns = "id, type, question_number, q_number, question, choices"
+    for row in iter_rows(client, "questions", columns=columns):
+        index.add(_row_label(row), signature_text(row.get("question"), row.get("choices")))
+    return index
+
+
+class DuplicateGuard:
+    """업로드 직전 중복 검사 - 기존 문제 + 이번에 올린 문제를 함께 비교합니다"""
+
+    def __init__(self, index: NearDuplicateIndex):
+        self.index = index
+        self.reported: List[Match] = []
+        self.skipped: List[Match] = []
+
+    @classmethod
+    def from_table(cls, client, threshold: float = NEAR_DUP_THRESHOLD) -> "DuplicateGuard":
+        started = time.perf_counter()
+        index = build_table_index(client, threshold)
+        print(f"🧬 중복 검사 인덱스: 기존 문제 {len(index)}개 ({time.perf_counter() - started:.1f}초)")
+        return cls(index)
+
+    def should_skip(self, label: str, text: str, choices: Sequence[str] = ()) -> bool:
+        """본문 + 보기가 유사한 문제가 있으면 경고합니다 (SKIP_NEAR_DUPLICATES=1 일 때만 True)"""
+        text = signature_text(text, choices)
+        matches = self.index.query(text)
+        if matches:
+            other, score = matches[0]
+            match = Match(label, other, round(score, 3))
+            if SKIP_NEAR_DUPLICATES:
+                print(f"  🧬 {label}: 기존 문제 {other} 와 유사 (유사도 {score:.2f}), 건너뜀")
+                self.skipped.append(match)
+                return True
+            print(f"  🧬 {label}: 기존 문제 {other} 와 유사 (유사도 {score:.2f}), 확인 필요")
+            self.reported.append(match)
+        self.index.add(label, text)
+        return False
+
+    def print_summary(self) -> None:
+        if self.reported:
+            print(f"\n🧬 유사 문제로 보고된 문제: {len(self.reported)}개 (업로드함, near_duplicates 리포트로 확인)")
+        if self.skipped:
+            print(f"\n🧬 유사 문제로 건너뛴 문제: {len(self.skipped)}개 (SKIP_NEAR_DUPLICATES=1)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="유사(중복) 문제 리포트")
+    parser.add_argument("--files", action="store_true", help="DB 대신 문제은행 텍스트 파일 검사")
+    parser.add_argument("--threshold", type=float, default=NEAR_DUP_THRESHOLD, help="중복 판정 유사도 (0~1)")
+    parser.add_argument("--report", default=DEFAULT_REPORT, help="JSON 리포트 경로")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("유사(중복) 문제 리포트")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    if args.files:
+        from question_bank import load_files
+        index = NearDuplicateIndex(args.threshold)
+        for q in load_files():
+            index.add(q.key, signature_text(q.question, q.choices))
+    else:
+        from storage import get_client
+        index = build_table_index(get_client(service_role=True), args.threshold)
+
+    pairs = index.find_all()
+    elapsed = time.perf_counter() - started
+
+    print(f"\n📊 {len(index)}개 문제 중 유사 쌍 {len(pairs)}개 (기준 {args.threshold:.2f}, {elapsed:.1f}초)")
+    for match in pairs[:30]:
+        print(f"  🧬 {match.key} ↔ {match.other} (유사도 {match.similarity:.2f})")
+    if len(pairs) > 30:
+        print(f"  … 나머지 {len(pairs) - 30}개는 리포트 파일 참고")
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump({"threshold": args.threshold, "indexed": len(index),
+                   "pairs": [asdict(m) for m in pairs]}, f, ensure_ascii=False, indent=2)
+    print(f"💾 리포트 저장: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from llm_client import is_retryable_error
+
+# ⚡ LLM 병렬 포맷터
+# 문제별 ChatCompletion 요청을 동시성 제한 + 분당 요청 수 제한 아래에서 병렬로 보내고,
+# 원래 순서대로 결과 파일에 즉시 이어 씁니다. 검증을 통과한 결과는 요청 내용의
+# 해시로 캐시하여 재실행 시 API를 다시 호출하지 않습니다.
+# local_format 을 주면 먼저 로컬(규칙 기반)로 정리해보고, 실패한 문제만 API로 보냅니다.
+
+DEFAULT_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+DEFAULT_RPM = int(os.getenv("LLM_RPM", "60"))
+DEFAULT_RETRIES = 3
+CACHE_DIR = os.getenv("LLM_FORMAT_CACHE_DIR", ".cache/llm_format")
+
+
+def split_problems(content: str) -> List[Tuple[str, str]]:
+    """'숫자.' 기준으로 (문제 번호, 내용) 목록을 만듭니다"""
+    parts = re.split(r'(\d+\.)', content)
+    problems = []
+    for i in range(1, len(parts) - 1, 2):
+        problem_num = parts[i].strip()
+        problem_content = parts[i + 1].strip()
+        if problem_content:
+            problems.append((problem_num, problem_content))
+    return problems
+
+
+@dataclass
+class FormatStats:
+    total: int = 0
+    formatted: int = 0
+    local: int = 0
+    cached: int = 0
+    failed: List[str] = field(default_factory=list)
+    elapsed_sec: float = 0.0
+
+
+class RateLimiter:
+    """요청 시작 간격을 60/rpm 초 이상으로 유지합니다"""
+
+    def __init__(self, rpm: int):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._next_at - now)
+            self._next_at = max(now, self._next_at) + self.interval
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class ResultCache:
+    """요청(JSON) 해시 → 검증된 결과 텍스트 파일 캐시"""
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def key(request: Dict) -> str:
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.txt")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def put(self, key: str, text: str) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+
+class OrderedWriter:
+    """완료 순서와 무관하게 원래 순서대로 결과를 파일에 이어 씁니다"""
+
+    def __init__(self, path: str, separator: str = "\n\n"):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.separator = separator
+        self.pending: Dict[int, Optional[str]] = {}
+        self.next_index = 0
+        self.written = 0
+
+    def add(self, index: int, text: Optional[str]) -> None:
+        self.pending[index] = text
+        while self.next_index in self.pending:
+            item = self.pending.pop(self.next_index)
+            if item:
+                if self.written:
+                    self.file.write(self.separator)
+                self.file.write(item)
+                self.written += 1
+            self.next_index += 1
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+async def _format_all(problems, build_request, validate, acreate, writer, cache,
+                      concurrency, rpm, retries, stats, local_format):
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rpm)
+
+    async def format_one(index: int, problem_num: str, problem_content: str) -> None:
+        if local_format:
+            local = local_format(problem_num, problem_content)
+            if local:
+                stats.local += 1
+                writer.add(index, local)
+                return
+
+        request = build_request(problem_num, problem_content)
+        key = cache.key(request)
+
+        cached = cache.get(key)
+        if cached is not None:
+            print(f"  ♻️ 문제 {problem_num} 캐시 사용")
+            stats.cached += 1
+            writer.add(index, cached)
+            return
+
+        text = None
+        async with semaphore:
+            for attempt in range(1, retries + 1):
+                await limiter.wait()
+                try:
+                    response = await acreate(**request)
+                    text = response.choices[0].message.content.strip()
+                    break
+                except Exception as e:
+                    print(f"  ⚠️ 문제 {problem_num} 요청 실패 {attempt}/{retries}: {e}")
+                    if not is_retryable_error(e):
+                        # 인증 오류, 잘못된 요청(400) 등은 다시 보내도 같으므로 바로 실패 처리
+                        break
+                    if attempt < retries:
+                        await asyncio.sleep(2 ** attempt)
+
+        result = validate(problem_num, text) if text else None
+        if result:
+            cache.put(key, result)
+            stats.formatted += 1
+        else:
+            stats.failed.append(problem_num)
+        writer.add(index, result)
+
+    await asyncio.gather(*(
+        format_one(index, problem_num, problem_content)
+        for index, (problem_num, problem_content) in enumerate(problems)
+    ))
+
+
+def run_parallel_format(problems: List[Tuple[str, str]],
+                        build_request: Callable[[str, str], Dict],
+                        validate: Callable[[str, str], Optional[str]],
+                        acreate: Callable,
+                        output_file: str,
+                        concurrency: int = DEFAULT_CONCURRENCY,
+                        rpm: int = DEFAULT_RPM,
+                        retries: int = DEFAULT_RETRIES,
+                        cache_dir: str = CACHE_DIR,
+                        local_format: Optional[Callable[[str, str], Optional[str]]] = None) -> FormatStats:
+    """문제 목록을 병렬로 정리하여 output_file 에 순서대로 저장합니다
+
+    build_request(문제번호, 내용) → ChatCompletion 인자 dict
+    validate(문제번호, 응답 텍스트) → 저장할 텍스트 또는 None
+    acreate(**request) → 비동기 ChatCompletion 호출
+    local_format(문제번호, 내용) → 로컬 정리 결과 또는 None (None 이면 API 사용)
+    """
+    stats = FormatStats(total=len(problems))
+    print(f"⚡ {len(problems)}개 문제 병렬 정리 (동시 {concurrency}개, 분당 {rpm}회)")
+
+    started = time.monotonic()
+    writer = OrderedWriter(output_file)
+    try:
+        asyncio.run(_format_all(
+            problems, build_request, validate, acreate, writer, ResultCache(cache_dir),
+            concurrency, rpm, retries, stats, local_format,
+        ))
+    finally:
+        writer.close()
+    stats.elapsed_sec = time.monotonic() - started
+
+    print(f"\n📊 정리 결과: 규칙 {stats.local}개, API {stats.formatted}개, 캐시 {stats.cached}개, "
+          f"실패 {len(stats.failed)}개 "
+          f"({stats.elapsed_sec:.1f}초)")
+    if stats.failed:
+        print(f"  실패한 문제: {', '.join(stats.failed)}")
+    return stats
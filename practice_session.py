@@ -0,0 +1,190 @@
+import random
+import secrets
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from question_bank import LETTERS, normalize_answer
+from question_catalog import RenderedQuestion, build_keyboard, display_number
+
+# 🏃 유형별 시간 제한 연습 세션
+# /practice CR 10 20 → CR 10문제, 20분
+# 세션 시작 시 문제를 모두 골라 메시지를 미리 렌더링하고, 풀이 중에는 DB를 읽지 않습니다.
+# 답안은 메모리에 모았다가 세션이 끝날 때 user_answers 에 한 번에 insert 합니다.
+# 버튼 callback_data 는 "p:<세션ID>:<보기 번호>" 로 일반 문제(/q) 버튼과 구분합니다.
+
+CALLBACK_PREFIX = "p"
+CALLBACK_PATTERN = rf"^{CALLBACK_PREFIX}:"
+
+DEFAULT_TYPE = "CR"
+DEFAULT_COUNT = 10
+DEFAULT_MINUTES = 20
+MAX_COUNT = 50
+MAX_MINUTES = 180
+
+
+def correct_choice(question: Dict) -> Optional[int]:
+    """정답을 1부터 시작하는 보기 번호로 반환합니다 ('B' 와 2 모두 2)"""
+    letter = normalize_answer(question.get("answer"))
+    return LETTERS.index(letter) + 1 if letter in LETTERS else None
+
+
+def parse_callback(data: str):
+    """'p:<세션ID>:<보기 번호>' → (세션ID, 보기 번호)"""
+    _, session_id, selected = data.split(":", 2)
+    return session_id, int(selected)
+
+
+def pick_questions(questions: List[Dict], question_type: str, count: int, answered_ids) -> List[Dict]:
+    """유형이 맞는 문제 중 안 푼 문제를 우선으로 count 개를 무작위로 고릅니다"""
+    pool = [q for q in questions if (q.get("type") or "").lower() == question_type.lower()]
+    fresh = [q for q in pool if q["id"] not in answered_ids]
+    seen = [q for q in pool if q["id"] in answered_ids]
+    picked = random.sample(fresh, min(count, len(fresh)))
+    if len(picked) < count:
+        picked += random.sample(seen, min(count - len(picked), len(seen)))
+    return picked
+
+
+@dataclass
+class PracticeAnswer:
+    question: Dict
+    selected: int
+    is_correct: bool
+    started_at: datetime
+    submitted_at: datetime
+
+    def to_row(self, user_id: str) -> Dict:
+        return {
+            "user_id": user_id,
+            "question_id": self.question["id"],
+            "user_answer": self.selected,
+            "is_correct": self.is_correct,
+            "started_at": self.started_at.astimezone().isoformat(),
+            "submitted_at": self.submitted_at.astimezone().isoformat(),
+            "answered_at": self.submitted_at.astimezone().isoformat(),
+        }
+
+
+@dataclass
+class PracticeSession:
+    user_id: str
+    question_type: str
+    questions: List[Dict]
+    rendered: List[RenderedQuestion]
+    time_limit: timedelta
+    session_id: str = field(default_factory=lambda: secrets.token_hex(3))
+    started_at: datetime = field(default_factory=datetime.now)
+    index: int = 0
+    answers: List[PracticeAnswer] = field(default_factory=list)
+    question_started_at: Optional[datetime] = None
+    finished: bool = False
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def deadline(self) -> datetime:
+        return self.started_at + self.time_limit
+
+    def expired(self, now: Optional[datetime] = None) -> bool:
+        return (now or datetime.now()) >= self.deadline
+
+    def remaining(self, now: Optional[datetime] = None) -> timedelta:
+        return max(self.deadline - (now or datetime.now()), timedelta(0))
+
+    @property
+    def done(self) -> bool:
+        return self.index >= len(self.questions)
+
+    def current(self) -> RenderedQuestion:
+        """현재 문제 메시지 (헤더 + 미리 렌더링된 본문)"""
+        self.question_started_at = datetime.now()
+        mins, secs = divmod(int(self.remaining().total_seconds()), 60)
+        header = f"🏃 연습 {self.index + 1}/{len(self.questions)} · 남은 시간 {mins}분 {secs}초\n"
+        rendered = self.rendered[self.index]
+        return RenderedQuestion(header + rendered.text, rendered.reply_markup)
+
+    def record(self, selected: int, now: Optional[datetime] = None) -> PracticeAnswer:
+        """현재 문제의 답안을 메모리에 기록하고 다음 문제로 넘어갑니다"""
+        now = now or datetime.now()
+        question = self.questions[self.index]
+        answer = PracticeAnswer(
+            question=question,
+            selected=selected,
+            is_correct=selected == correct_choice(question),
+            started_at=self.question_started_at or now,
+            submitted_at=now,
+        )
+        self.answers.append(answer)
+        self.index += 1
+        return answer
+
+    def claim_finish(self) -> bool:
+        """세션 종료를 한 번만 처리하도록 (마지막 답안 / 시간 초과 작업 중 먼저 온 쪽)"""
+        with self._lock:
+            if self.finished:
+                return False
+            self.finished = True
+            return True
+
+    def summary(self) -> str:
+        correct = sum(1 for a in self.answers if a.is_correct)
+        elapsed = min(datetime.now(), self.deadline) - self.started_at
+        mins, secs = divmod(int(elapsed.total_seconds()), 60)
+        lines = [
+            f"🏁 {self.question_type} 연습 종료",
+            f"✅ 맞은 문제: {correct}/{len(self.answers)} (전체 {len(self.questions)}문제)",
+            f"⏱️ 소요 시간: {mins}분 {secs}초",
+        ]
+        wrong = [a for a in self.answers if not a.is_correct]
+        if wrong:
+            lines.append("\n❌ 틀린 문제:")
+            for a in wrong:
+                correct_idx = correct_choice(a.question)
+                correct_letter = chr(64 + correct_idx) if correct_idx else "?"
+                lines.append(f"/q{display_number(a.question)} - 선택 {chr(64 + a.selected)}, 정답 {correct_letter}")
+        unanswered = len(self.questions) - len(self.answers)
+        if unanswered:
+            lines.append(f"\n⌛ 시간 초과로 풀지 못한 문제: {unanswered}개")
+        return "\n".join(lines)
+
+
+def start_session(catalog, user_id: str, question_type: str, count: int, minutes: int,
+                  answered_ids) -> Optional[PracticeSession]:
+    """문제를 고르고 세션 전용 키보드로 메시지를 미리 렌더링합니다"""
+    questions = pick_questions(catalog.all(), question_type, count, answered_ids)
+    if not questions:
+        return None
+
+    session = PracticeSession(
+        user_id=user_id,
+        question_type=question_type.upper(),
+        questions=questions,
+        rendered=[],
+        time_limit=timedelta(minutes=minutes),
+    )
+    prefix = f"{CALLBACK_PREFIX}:{session.session_id}:"
+    keyboards = {}
+    for question in questions:
+        choice_count = len(question.get("choices") or []) or 5
+        if choice_count not in keyboards:
+            keyboards[choice_count] = build_keyboard(choice_count, prefix)
+        session.rendered.append(RenderedQuestion(catalog.rendered(question).text, keyboards[choice_count]))
+    return session
+
+
+def flush_answers(supabase, session: PracticeSession, review_scheduler=None) -> int:
+    """세션 답안을 user_answers 에 한 번에 기록합니다"""
+    rows = [answer.to_row(session.user_id) for answer in session.answers]
+    if not rows:
+        return 0
+    supabase.table("user_answers").insert(rows).execute()
+
+    if review_scheduler is not None:
+        for answer in session.answers:
+            try:
+                review_scheduler.record_answer(session.user_id, answer.question["id"], answer.is_correct,
+                                               answer.started_at, answer.submitted_at)
+            except Exception as e:
+                print(f"❌ Review schedule update failed: {str(e)}")
+    return len(rows)
@@ -0,0 +1,208 @@
+import argparse
+import os
+import random
+import statistics
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from question_bank import LETTERS, normalize_answer
+from user_progress import answer_sort_key
+
+# 📊 문제별 난이도 / 오답 보기 통계
+# user_answers 를 keyset 페이지 단위로 한 번 훑어 문제별로 집계하고 questions 의 stats_* 컬럼에 저장합니다.
+# - 같은 유저가 같은 문제를 다시 푼 기록은 제외하고 제출 시각이 가장 이른 첫 풀이만 사용 (재풀이는 정답을 알고 푼 것)
+# - 정답률, 보기 선택 분포, 풀이 시간 중앙값
+# - 변별도: 응답자를 전체 정답률로 정렬해 상위 27% 정답률 - 하위 27% 정답률
+# 스키마/RPC 는 question_stats.sql 참고. 주기 실행: python cli.py analytics
+
+ANSWER_COLUMNS = "id, user_id, question_id, user_answer, is_correct, started_at, submitted_at"
+STATS_COLUMNS = ("stats_attempts", "stats_accuracy", "stats_choice_dist",
+                 "stats_median_sec", "stats_discrimination")
+
+# 이보다 적게 풀린 문제는 정답률/변별도를 저장하지 않음 (표본 부족)
+MIN_ATTEMPTS = int(os.getenv("ANALYTICS_MIN_ATTEMPTS", "5"))
+DISCRIMINATION_GROUP = 0.27
+# 자리를 비운 풀이 등 비정상적으로 긴 시간은 중앙값에서 제외
+MAX_SOLVE_SEC = 60 * 60
+
+
+def _parse_time(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def solve_seconds(row: Dict) -> Optional[float]:
+    started, submitted = _parse_time(row.get("started_at")), _parse_time(row.get("submitted_at"))
+    if not started or not submitted:
+        return None
+    seconds = (submitted - started).total_seconds()
+    return seconds if 0 <= seconds <= MAX_SOLVE_SEC else None
+
+
+@dataclass
+class QuestionTally:
+    choices: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    responses: List[Tuple[str, bool]] = field(default_factory=list)
+    solve_times: List[float] = field(default_factory=list)
+
+    def add(self, row: Dict) -> None:
+        # 1~5 / '2' / 'b' / '(B)' 모두 'B' 로 맞춰서 셈
+        selected = normalize_answer(row.get("user_answer"))
+        if selected in LETTERS:
+            self.choices[selected] += 1
+        self.responses.append((row["user_id"], bool(row.get("is_correct"))))
+        seconds = solve_seconds(row)
+        if seconds is not None:
+            self.solve_times.append(seconds)
+
+
+def discrimination_index(responses: List[Tuple[str, bool]], ability: Dict[str, float]) -> Optional[float]:
+    """상위/하위 27% 응답자의 정답률 차이 (-1~1, 0.3 이상이면 변별력 양호)"""
+    group = int(len(responses) * DISCRIMINATION_GROUP)
+    if group < 1:
+        return None
+    ranked = sorted(responses, key=lambda r: ability.get(r[0], 0.0))
+    lower = sum(1 for _, ok in ranked[:group] if ok) / group
+    upper = sum(1 for _, ok in ranked[-group:] if ok) / group
+    return round(upper - lower, 3)
+
+
+def collect(client, page_size: int = 1000) -> Dict[str, QuestionTally]:
+    """user_answers 를 페이지 단위로 읽어 문제별 첫 풀이를 집계합니다"""
+    from storage import iter_pages
+
+    # (유저, 문제) 별로 제출 시각이 가장 이른 기록 (snapshot 복원 후에는 id 순서가 제출 순서가 아님)
+    first: Dict[Tuple[str, str], Dict] = {}
+    scanned = 0
+    for page in iter_pages(client, "user_answers", columns=ANSWER_COLUMNS, page_size=page_size):
+        for row in page:
+            scanned += 1
+            key = (row.get("user_id"), row.get("question_id"))
+            if not all(key):
+                continue
+            if key not in first or answer_sort_key(row) < answer_sort_key(first[key]):
+                first[key] = row
+        print(f"  … 답안 {scanned}개 확인, 첫 풀이 {len(first)}개")
+
+    tallies: Dict[str, QuestionTally] = defaultdict(QuestionTally)
+    for row in first.values():
+        tallies[row["question_id"]].add(row)
+    return tallies
+
+
+def compute_stats(tallies: Dict[str, QuestionTally]) -> Dict[str, Dict]:
+    """문제 id → stats_* 컬럼 값"""
+    # 유저 능력치 = 첫 풀이 전체의 정답률
+    totals: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    for tally in tallies.values():
+        for user_id, ok in tally.responses:
+            totals[user_id][0] += ok
+            totals[user_id][1] += 1
+    ability = {user_id: correct / attempts for user_id, (correct, attempts) in totals.items()}
+
+    stats = {}
+    for question_id, tally in tallies.items():
+        attempts = len(tally.responses)
+        enough = attempts >= MIN_ATTEMPTS
+        chosen = sum(tally.choices.values())
+        stats[question_id] = {
+            "stats_attempts": attempts,
+            "stats_accuracy": round(sum(ok for _, ok in tally.responses) / attempts, 3) if enough else None,
+            "stats_choice_dist": {letter: round(count / chosen, 3) for letter, count in sorted(tally.choices.items())}
+            if chosen else None,
+            "stats_median_sec": round(statistics.median(tally.solve_times), 1) if tally.solve_times else None,
+            "stats_discrimination": discrimination_index(tally.responses, ability) if enough else None,
+        }
+    return stats
+
+
+def run(client, page_size: int = 1000, dry_run: bool = False):
+    """집계 후 값이 바뀐 문제만 update_question_stats RPC 로 기록합니다"""
+    from storage import bulk_update, print_summary
+
+    stats = compute_stats(collect(client, page_size))
+    updated_at = datetime.now().isoformat()
+
+    def transform(row: Dict) -> Optional[Dict]:
+        values = stats.get(row["id"])
+        if values is None or all(row.get(k) == v for k, v in values.items()):
+            return None
+        return {**values, "stats_updated_at": updated_at}
+
+    result = bulk_update(
+        client, "questions", transform,
+        columns="id, question_number, type, " + ", ".join(STATS_COLUMNS),
+        mode="rpc", rpc_name="update_question_stats",
+        dry_run=dry_run, show_diff=10,
+        label=lambda row: f"{row.get('type')} {row.get('question_number')}번",
+    )
+    print_summary(result, dry_run)
+    print_flagged(stats)
+    return result
+
+
+def print_flagged(stats: Dict[str, Dict], limit: int = 10) -> None:
+    """변별도가 음수인 문제 (정답 키 오류 의심) 를 출력합니다"""
+    flagged = sorted((s["stats_discrimination"], qid) for qid, s in stats.items()
+                     if s["stats_discrimination"] is not None and s["stats_discrimination"] < 0)
+    if flagged:
+        print(f"\n⚠️ 변별도 음수 문제 {len(flagged)}개 (정답/보기 확인 필요):")
+        for value, qid in flagged[:limit]:
+            print(f"  - {qid}: {value}")
+
+
+def accuracy_text(question: Dict) -> Optional[str]:
+    """봇 표시용 문구 (통계가 없으면 None)"""
+    accuracy = question.get("stats_accuracy")
+    if accuracy is None:
+        return None
+    return f"👥 {round(accuracy * 100)}%의 유저가 맞혔습니다 ({question.get('stats_attempts')}명 풀이)"
+
+
+# 샘플링 난이도 구간 (정답률 기준)
+DIFFICULTY_RANGES = {
+    "easy": (0.7, 1.01),
+    "medium": (0.4, 0.7),
+    "hard": (0.0, 0.4),
+}
+
+
+def difficulty_weight(question: Dict, difficulty: Optional[str] = None) -> float:
+    """샘플링 가중치: 지정 난이도 구간이면 높게, 통계 없는 문제는 중간값"""
+    accuracy = question.get("stats_accuracy")
+    if difficulty is None:
+        return 1.0
+    if accuracy is None:
+        return 0.5
+    low, high = DIFFICULTY_RANGES[difficulty]
+    return 3.0 if low <= accuracy < high else 0.2
+
+
+def weighted_choice(questions: List[Dict], difficulty: Optional[str] = None) -> Optional[Dict]:
+    if not questions:
+        return None
+    return random.choices(questions, weights=[difficulty_weight(q, difficulty) for q in questions])[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="user_answers 로 문제별 정답률/보기 분포/풀이 시간/변별도 집계")
+    parser.add_argument("--dry-run", action="store_true", help="집계만 하고 기록하지 않음")
+    parser.add_argument("--page-size", type=int, default=1000, help="user_answers 페이지 크기")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📊 문제별 풀이 통계 집계")
+    print("=" * 60)
+
+    from storage import get_client
+    run(get_client(service_role=True), page_size=args.page_size, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+# 📚 문제은행 정규화 레코드 + 로더
+# CR / OG CR / LSAT 텍스트 파일과 questions 테이블을 같은 형태(BankQuestion)로 읽어서
+# 검증/중복 탐지/검색 등에서 출처와 무관하게 사용할 수 있게 합니다.
+# 보기는 "A. " / "(A) " 접두어를 뗀 본문만, 정답은 가능한 경우 A~E 문자로 정규화합니다.
+
+LETTERS = ['A', 'B', 'C', 'D', 'E']
+
+# 업로드 스크립트들이 사용하는 기본 파일 경로
+DEFAULT_FILES = {
+    "cr": 'questionbank/cr/CR문제.txt',
+    "og": 'questionbank/OG_CR_2025/OG_CR_clean_answer.txt',
+    "lsat": 'questionbank/lsat/LSAT_03.txt',
+}
+DEFAULT_LSAT_ANSWERS = 'questionbank/lsat/answers.txt'
+
+DB_COLUMNS = "id, type, question_number, q_number, question, choices, answer, explanation, explanation_en"
+
+CHOICE_LABEL_PATTERN = re.compile(r'^\s*\(?([A-E])[.)]\s*')
+
+# 언어 → 해설 칼럼
+EXPLANATION_COLUMNS = {
+    "ko": "explanation",
+    "en": "explanation_en",
+}
+
+# 실제 해설이 아닌 자리표시자 (업로더 실패 시 저장되는 문구 포함)
+PLACEHOLDER_EXPLANATIONS = {
+    "",
+    "설명 없음",
+    "설명 생성 실패",
+    "설명 생성 중 오류가 발생했습니다.",
+    "Explanation generation failed",
+    "An error occurred while generating explanation.",
+}
+
+
+@dataclass
+class BankQuestion:
+    source: str
+    number: int
+    question: str
+    choices: List[str]
+    answer: Optional[str] = None
+    explanation: Optional[str] = None
+    explanation_en: Optional[str] = None
+    id: Optional[object] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.source}:{self.number}"
+
+
+def strip_choice_label(text: str) -> str:
+    """'A. 내용' / '(A) 내용' → '내용'"""
+    return CHOICE_LABEL_PATTERN.sub('', text or '', count=1).strip()
+
+
+def normalize_choices(choices: Optional[Iterable]) -> List[str]:
+    return [strip_choice_label(str(c)) for c in (choices or [])]
+
+
+def normalize_answer(value) -> Optional[str]:
+    """정답 값을 A~E 로 정규화합니다 ('b', '(B)', 'B. ...', 2, '2' 모두 'B')
+
+    인식할 수 없는 값은 공백만 제거하여 그대로 돌려주고 (검증에서 보고), 비어 있으면 None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, int) and not isinstance(value, bool):
+        return LETTERS[value - 1] if 1 <= value <= 5 else str(value)
+
+    text = str(value).strip()
+    if not text:
+        return None
+    if text.isdigit():
+        return LETTERS[int(text) - 1] if 1 <= int(text) <= 5 else text
+    m = re.match(r'^\(?([A-Ea-e])(?:[.)]|\s|$)', text)
+    if m:
+        return m.group(1).upper()
+    return text
+
+
+def needs_explanation(text: Optional[str]) -> bool:
+    """해설이 비어 있거나 자리표시자인지"""
+    return (text or "").strip() in PLACEHOLDER_EXPLANATIONS
+
+
+def _read(file_path: str) -> Optional[str]:
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except Exception as e:
+        print(f"❌ 파일 읽기 오류 ({file_path}): {e}")
+        return None
+
+
+def _split_question_and_choices(content: str, choice_pattern: str):
+    matches = re.findall(choice_pattern, content, re.DOTALL)
+    first = re.search(choice_pattern, content, re.DOTALL)
+    question = content[:first.start()] if first else content
+    return question.strip(), [text.strip() for _, text in matches]
+
+
+def load_cr_file(file_path: str = DEFAULT_FILES["cr"]) -> List[BankQuestion]:
+    """정답이 추가된 CR문제.txt ("141. 내용 ... 141. 정답 : B") 를 읽습니다"""
+    content = _read(file_path)
+    if content is None:
+        return []
+
+    questions = []
+    for number, body, answer in re.findall(r'(\d+)\.\s+(.+?)\1\.\s*정답\s*:\s*([A-E])', content, re.DOTALL):
+        question, choices = _split_question_and_choices(body, r'([A-E])\.\s+(.+?)(?=[A-E]\.\s+|$)')
+        questions.append(BankQuestion("cr", int(number), question, choices, normalize_answer(answer)))
+    return questions
+
+
+def load_og_file(file_path: str = DEFAULT_FILES["og"]) -> List[BankQuestion]:
+    """OG_CR_clean_answer.txt ("620. 내용 ... 620정답. B") 를 읽습니다"""
+    content = _read(file_path)
+    if content is None:
+        return []
+
+    questions = []
+    pattern = r'(\d{3})\.\s*(.*?)\1정답\.\s*([A-E])(?=\s*\d{3}\.\s*|$|\n\n)'
+    for number, body, answer in re.findall(pattern, content, re.DOTALL):
+        question, choices = _split_question_and_choices(body, r'([A-E])\.\s*(.*?)(?=[A-E]\.\s+|$)')
+        questions.append(BankQuestion("og", int(number), question, choices, normalize_answer(answer)))
+    return questions
+
+
+# 정답 키 파일 ("141. B", "1.B" ...) 의 한 항목
+ANSWER_KEY_PATTERN = re.compile(r'(\d+)\.\s*([A-E])')
+
+
+class AnswerKey:
+    """정답 키 인덱스: {문제 번호: 정답} (같은 번호가 다른 정답으로 또 나오면 conflicts 에 기록, 마지막 값 사용)"""
+
+    def __init__(self, answers: Optional[Dict[int, str]] = None, source: str = ""):
+        self.answers: Dict[int, str] = dict(answers or {})
+        self.source = source
+        self.conflicts: Dict[int, List[str]] = {}
+
+    @classmethod
+    def from_text(cls, content: str, source: str = "") -> "AnswerKey":
+        key = cls(source=source)
+        for number, answer in ANSWER_KEY_PATTERN.findall(content):
+            number = int(number)
+            previous = key.answers.get(number)
+            if previous is not None and previous != answer:
+                key.conflicts.setdefault(number, [previous]).append(answer)
+            key.answers[number] = answer
+        return key
+
+    @classmethod
+    def from_file(cls, answers_file: str) -> "AnswerKey":
+        content = _read(answers_file) if os.path.exists(answers_file) else None
+        return cls.from_text(content or "", source=answers_file)
+
+    def get(self, number: int) -> Optional[str]:
+        return self.answers.get(number)
+
+    def __contains__(self, number) -> bool:
+        return number in self.answers
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def describe(self) -> str:
+        if not self.answers:
+            return f"정답 0개 ({self.source or '입력'})"
+        return f"정답 {len(self.answers)}개 ({min(self.answers)}번 ~ {max(self.answers)}번)"
+
+
+@dataclass
+class AnswerMerge:
+    """merge_answers 결과: 채운 번호 / 바뀐 번호 / 정답 없는 문제 / 문제 없는 정답"""
+    matched: List[int]
+    changed: List[int]
+    missing_answers: List[int]
+    orphan_answers: List[int]
+    conflicts: Dict[int, List[str]]
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing_answers or self.orphan_answers or self.conflicts)
+
+    def print_report(self, label: str = "정답 병합") -> None:
+        print(f"🔑 {label}: 매칭 {len(self.matched)}개 (변경 {len(self.changed)}개)")
+        if self.missing_answers:
+            print(f"  ⚠️ 정답 없는 문제 {len(self.missing_answers)}개: {_preview(self.missing_answers)}")
+        if self.orphan_answers:
+            print(f"  ⚠️ 문제 없는 정답 {len(self.orphan_answers)}개: {_preview(self.orphan_answers)}")
+        for number, values in sorted(self.conflicts.items()):
+            print(f"  ⚠️ {number}번 정답이 여러 번 다르게 적혀 있음: {' → '.join(values)} (마지막 값 사용)")
+
+
+def _preview(numbers: List[int], limit: int = 20) -> str:
+    text = ", ".join(str(n) for n in numbers[:limit])
+    return text + (f" 외 {len(numbers) - limit}개" if len(numbers) > limit else "")
+
+
+def merge_answers(records: Iterable, key: AnswerKey) -> AnswerMerge:
+    """문제 레코드(BankQuestion 등 number/answer 속성, 또는 'number' 키를 가진 dict)에 정답을 한 번에 조인합니다
+
+    레코드를 번호로 인덱싱한 뒤 정답 키와 양쪽 차집합으로 불일치를 계산합니다.
+    """
+    by_number = {}
+    for record in records:
+        number = record["number"] if isinstance(record, dict) else record.number
+        by_number[number] = record
+
+    matched, changed = [], []
+    for number in sorted(by_number.keys() & key.answers.keys()):
+        record, answer = by_number[number], normalize_answer(key.answers[number])
+        current = record.get("answer") if isinstance(record, dict) else record.answer
+        if isinstance(record, dict):
+            record["answer"] = answer
+        else:
+            record.answer = answer
+        matched.append(number)
+        if normalize_answer(current) != answer:
+            changed.append(number)
+
+    return AnswerMerge(
+        matched=matched,
+        changed=changed,
+        missing_answers=sorted(by_number.keys() - key.answers.keys()),
+        orphan_answers=sorted(key.answers.keys() - by_number.keys()),
+        conflicts=dict(key.conflicts),
+    )
+
+
+def load_lsat_answers(answers_file: str = DEFAULT_LSAT_ANSWERS) -> Dict[int, str]:
+    """LSAT 정답 파일 ("1. B") → {문제 번호: 정답}"""
+    return AnswerKey.from_file(answers_file).answers
+
+
+def load_lsat_file(file_path: str = DEFAULT_FILES["lsat"],
+                   answers_file: Optional[str] = DEFAULT_LSAT_ANSWERS) -> List[BankQuestion]:
+    """정리된 LSAT 파일 ("1.\\n지문\\n\\n질문\\n\\n(A) ...") 을 읽습니다"""
+    content = _read(file_path)
+    if content is None:
+        return []
+
+    questions = []
+    parts = re.split(r'(?m)^(\d+)\.\s*$', content)
+    for i in range(1, len(parts) - 1, 2):
+        number = int(parts[i])
+        question, choices = _split_question_and_choices(parts[i + 1], r'\(([A-E])\)\s*(.*?)(?=\([A-E]\)|$)')
+        questions.append(BankQuestion("lsat", number, question, choices))
+
+    if answers_file and os.path.exists(answers_file):
+        merge = merge_answers(questions, AnswerKey.from_file(answers_file))
+        if not merge.ok:
+            merge.print_report(f"LSAT 정답 병합 ({answers_file})")
+    return questions
+
+
+def from_db_row(row: Dict) -> BankQuestion:
+    """questions 테이블 행 → BankQuestion (출처는 type 컬럼 소문자)"""
+    number = row.get("question_number")
+    if number is None:
+        number = row.get("q_number")
+    return BankQuestion(
+        source=(row.get("type") or "db").lower(),
+        number=int(number) if number is not None else -1,
+        question=row.get("question") or "",
+        choices=normalize_choices(row.get("choices")),
+        answer=normalize_answer(row.get("answer")),
+        explanation=row.get("explanation") or "",
+        explanation_en=row.get("explanation_en") or "",
+        id=row.get("id"),
+    )
+
+
+# 파일 출처 → 업로드 스크립트가 쓰는 questions.type 값
+SOURCE_TYPES = {"cr": "cr", "og": "cr", "lsat": "LSAT"}
+
+
+def to_db_row(q: BankQuestion) -> Dict:
+    """BankQuestion → questions 테이블 행 (from_db_row 의 반대 방향)"""
+    return {
+        "type": SOURCE_TYPES.get(q.source, q.source),
+        "question_number": q.number,
+        "question": q.question,
+        "choices": q.choices,
+        "answer": q.answer,
+        "explanation": q.explanation or None,
+        "explanation_en": q.explanation_en or None,
+    }
+
+
+def load_db(client, question_type: Optional[str] = None, page_size: int = 500) -> List[BankQuestion]:
+    """questions 테이블 전체를 keyset 페이지네이션으로 읽습니다"""
+    from storage import iter_rows
+
+    filters = (("eq", "type", question_type),) if question_type else ()
+    return [from_db_row(row) for row in iter_rows(client, "questions", columns=DB_COLUMNS,
+                                                   filters=filters, page_size=page_size)]
+
+
+def load_files(files: Optional[Dict[str, str]] = None,
+               lsat_answers: Optional[str] = DEFAULT_LSAT_ANSWERS) -> List[BankQuestion]:
+    """출처별 텍스트 파일을 모두 읽습니다 (없는 파일은 건너뜀)"""
+    loaders = {
+        "cr": load_cr_file,
+        "og": load_og_file,
+        "lsat": lambda path: load_lsat_file(path, lsat_answers),
+    }
+    questions = []
+    for source, path in (files or DEFAULT_FILES).items():
+        if not os.path.exists(path):
+            print(f"⚠️ {source} 파일 없음, 건너뜀: {path}")
+            continue
+        loaded = loaders[source](path)
+        print(f"📖 {source}: {path} → {len(loaded)}개 문제")
+        questions.extend(loaded)
+    return questions
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from search_index import SearchHit, SearchIndex
+
+# 📚 문제 카탈로그 + 렌더링 캐시
+# 봇 핸들러가 매 요청마다 questions 테이블을 다시 읽고 문자열을 조립하지 않도록
+# 카탈로그를 한 번 로드하면서 메시지 본문/키보드를 미리 만들어 둡니다.
+
+CATALOG_TTL_SEC = 300
+
+# Telegram legacy Markdown에서 의미를 갖는 문자 (legacy Markdown 은 역슬래시 자체의 이스케이프를 지원하지 않음)
+MARKDOWN_SPECIAL = ("_", "*", "`", "[")
+
+
+def escape_markdown(text: str) -> str:
+    """parse_mode='Markdown' 용으로 특수문자를 이스케이프합니다"""
+    for ch in MARKDOWN_SPECIAL:
+        text = text.replace(ch, f"\\{ch}")
+    return text
+
+
+def display_number(question: Dict) -> Optional[int]:
+    """/q<번호> 로 찾는 문제 번호 (CR/OG 는 question_number, LSAT 업로드 행은 q_number 만 있음)"""
+    number = question.get("question_number")
+    return number if number is not None else question.get("q_number")
+
+
+def content_hash(question: Dict) -> str:
+    """렌더링에 영향을 주는 필드만으로 해시를 만듭니다"""
+    payload = json.dumps(
+        [display_number(question), question.get("question"), question.get("choices")],
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class RenderedQuestion:
+    text: str
+    reply_markup: object
+
+
+def build_keyboard(choice_count: int = 5, prefix: str = ""):
+    """보기 버튼 키보드 (callback_data는 prefix + 1부터 시작하는 보기 번호)"""
+    from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+    keyboard = [[InlineKeyboardButton(chr(65 + i), callback_data=f"{prefix}{i + 1}") for i in range(choice_count)]]
+    return InlineKeyboardMarkup(keyboard)
+
+
+def render_question_text(question: Dict) -> str:
+    """문제 메시지 본문을 Markdown으로 렌더링합니다"""
+    q_number = display_number(question) or "?"
+    q_text = escape_markdown((question.get("question") or "").replace("\n", " ").strip())
+    lines = [f"*문제 {q_number}:*", q_text, ""]
+
+    # DB에는 순수한 텍스트만 저장되어 있으므로 A. B. 등을 붙여줌
+    for i, choice in enumerate(question.get("choices") or []):
+        lines.append(f"{chr(65 + i)}. {escape_markdown(choice.strip())}")
+
+    return "\n".join(lines) + "\n"
+
+
+class QuestionCatalog:
+    """questions 테이블의 메모리 캐시 (TTL 경과 시 재로드)"""
+
+    def __init__(self, supabase, ttl_sec: int = CATALOG_TTL_SEC):
+        self.supabase = supabase
+        self.ttl_sec = ttl_sec
+        self._loaded_at = 0.0
+        self._questions: List[Dict] = []
+        self._by_id: Dict[str, Dict] = {}
+        self._by_number: Dict[int, Dict] = {}
+        self._rendered: Dict[Tuple[str, str], RenderedQuestion] = {}
+        self._keyboards: Dict[int, object] = {}
+        self._search_index: Optional[SearchIndex] = None
+
+    def refresh(self) -> None:
+        """전체 문제를 다시 읽고, 내용이 바뀐 문제만 새로 렌더링합니다"""
+        from storage import iter_rows
+
+        # 한 번의 select 는 PostgREST 기본 1000행 제한에 잘리므로 keyset 페이지네이션으로 전부 읽음
+        rows = sorted(iter_rows(self.supabase, "questions"),
+                      key=lambda row: (row.get("question_number") is None, row.get("question_number") or 0))
+
+        rendered = {}
+        for row in rows:
+            digest = content_hash(row)
+            row["_hash"] = digest
+            key = (row["id"], digest)
+            rendered[key] = self._rendered.get(key) or self._render(row)
+
+        self._questions = rows
+        self._by_id = {row["id"]: row for row in rows}
+        by_number = {}
+        for row in rows:
+            number = display_number(row)
+            if number is not None:
+                # 번호가 겹치면 question_number 를 가진 행(먼저 정렬됨)을 우선
+                by_number.setdefault(number, row)
+        self._by_number = by_number
+        self._rendered = rendered
+        self._search_index = None
+        self._loaded_at = time.monotonic()
+        print(f"📚 문제 카탈로그 로드: {len(rows)}개")
+
+    def _ensure_fresh(self) -> None:
+        if not self._loaded_at or time.monotonic() - self._loaded_at > self.ttl_sec:
+            self.refresh()
+
+    def _keyboard(self, choice_count: int):
+        if choice_count not in self._keyboards:
+            self._keyboards[choice_count] = build_keyboard(choice_count)
+        return self._keyboards[choice_count]
+
+    def _render(self, question: Dict) -> RenderedQuestion:
+        return RenderedQuestion(
+            text=render_question_text(question),
+            reply_markup=self._keyboard(len(question.get("choices") or []) or 5),
+        )
+
+    def __len__(self) -> int:
+        self._ensure_fresh()
+        return len(self._questions)
+
+    def all(self) -> List[Dict]:
+        self._ensure_fresh()
+        return self._questions
+
+    def get(self, question_id: str) -> Optional[Dict]:
+        self._ensure_fresh()
+        return self._by_id.get(question_id)
+
+    def by_number(self, number: int) -> Optional[Dict]:
+        self._ensure_fresh()
+        return self._by_number.get(number)
+
+    def first_unanswered(self, answered_ids) -> Optional[Dict]:
+        self._ensure_fresh()
+        return next((q for q in self._questions if q["id"] not in answered_ids), None)
+
+    def update_cached(self, question_id: str, changes: Dict) -> Optional[Dict]:
+        """DB 에 기록한 변경을 캐시된 행에도 반영합니다 (렌더링 해시/검색 색인 갱신, 카탈로그 밖의 문제면 None)"""
+        row = self._by_id.get(question_id)
+        if row is None:
+            return None
+        row.update(changes)
+        digest = content_hash(row)
+        if digest != row.get("_hash"):
+            self._rendered.pop((question_id, row.get("_hash")), None)
+            row["_hash"] = digest
+            self._rendered[(question_id, digest)] = self._render(row)
+        # 색인은 해설도 포함하므로 다음 검색 때 다시 생성
+        self._search_index = None
+        return row
+
+    def search(self, query: str, limit: int = 10) -> List[SearchHit]:
+        """본문/보기/해설 검색 (색인은 카탈로그 로드 후 첫 검색 때 생성)"""
+        self._ensure_fresh()
+        if self._search_index is None:
+            self._search_index = SearchIndex(self._questions)
+        return self._search_index.search(query, limit)
+
+    def rendered(self, question: Dict) -> RenderedQuestion:
+        """미리 렌더링된 메시지를 반환합니다 (카탈로그 밖의 문제는 즉시 렌더링)"""
+        digest = question.get("_hash") or content_hash(question)
+        key = (question["id"], digest)
+        cached = self._rendered.get(key)
+        if cached is None:
+            cached = self._render(question)
+            self._rendered[key] = cached
+        return cached
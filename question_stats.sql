@@ -0,0 +1,32 @@
+-- 📊 문제별 풀이 통계 (question_analytics.py)
+-- user_answers 를 주기적으로 집계해 questions 행에 저장합니다 (유저별 첫 풀이 기준).
+-- 봇/샘플러는 요청마다 집계하지 않고 이 컬럼만 읽습니다.
+ALTER TABLE questions ADD COLUMN IF NOT EXISTS stats_attempts INTEGER;          -- 집계에 쓰인 첫 풀이 수
+ALTER TABLE questions ADD COLUMN IF NOT EXISTS stats_accuracy REAL;             -- 정답률 (0~1)
+ALTER TABLE questions ADD COLUMN IF NOT EXISTS stats_choice_dist JSONB;         -- {"A": 0.1, "B": 0.6, ...}
+ALTER TABLE questions ADD COLUMN IF NOT EXISTS stats_median_sec REAL;           -- 풀이 시간 중앙값 (초)
+ALTER TABLE questions ADD COLUMN IF NOT EXISTS stats_discrimination REAL;       -- 상위 27% 정답률 - 하위 27% 정답률
+ALTER TABLE questions ADD COLUMN IF NOT EXISTS stats_updated_at TIMESTAMP;
+
+-- 통계 컬럼만 갱신하는 RPC (storage/bulk.py, mode="rpc")
+-- payload: [{"id": "...", "stats_attempts": 12, "stats_accuracy": 0.58, ...}, ...]
+CREATE OR REPLACE FUNCTION update_question_stats(payload jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    updated integer;
+BEGIN
+    UPDATE questions AS q
+    SET (stats_attempts, stats_accuracy, stats_choice_dist, stats_median_sec, stats_discrimination, stats_updated_at) = (
+        SELECT r.stats_attempts, r.stats_accuracy, r.stats_choice_dist, r.stats_median_sec,
+               r.stats_discrimination, r.stats_updated_at
+        FROM jsonb_populate_record(q, item) AS r
+    )
+    FROM jsonb_array_elements(payload) AS item
+    WHERE q.id = (item->>'id')::uuid;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$;
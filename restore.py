@@ -1,19 +1,6 @@
-import shutil
-import os
+from restore_backup import restore_backup
 
-# 백업 파일을 원본으로 복원
-backup_file = 'questionbank/cr/CR문제.txt.backup_20250725_133717'
-original_file = 'questionbank/cr/CR문제.txt'
-
-if os.path.exists(backup_file):
-    shutil.copy2(backup_file, original_file)
-    print(f"✅ 백업 복원 완료!")
-    print(f"  {backup_file} → {original_file}")
-    
-    # 파일 크기 확인
-    backup_size = os.path.getsize(backup_file)
-    original_size = os.path.getsize(original_file)
-    print(f"  백업 파일 크기: {backup_size:,} bytes")
-    print(f"  복원된 파일 크기: {original_size:,} bytes")
-else:
-    print(f"❌ 백업 파일을 찾을 수 없습니다: {backup_file}") 
\ No newline at end of file
+# 백업 저장소의 버전을 원본으로 복원
+#   python restore.py            → 가장 최근 백업 ("복원 전" 사본 제외, 여러 번 실행해도 같은 버전)
+#   python restore.py <버전 id>   → 지정한 버전 (python backup_store.py list 로 확인)
+restore_backup()
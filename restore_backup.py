@@ -1,31 +1,51 @@
-import shutil
+import argparse
 import os
 
+from backup_store import default_store, print_versions
+
+CR_FILE = 'questionbank/cr/CR문제.txt'
+
+
 def restore_backup():
-    # 가장 큰 백업 파일 (원본 상태)
-    backup_file = 'questionbank/cr/CR문제.txt.backup_20250725_134223'
-    original_file = 'questionbank/cr/CR문제.txt'
-    
-    if os.path.exists(backup_file):
-        shutil.copy2(backup_file, original_file)
-        print(f"✅ 백업 복원 완료!")
-        print(f"  {backup_file} → {original_file}")
-        
-        # 파일 크기 확인
-        backup_size = os.path.getsize(backup_file)
-        original_size = os.path.getsize(original_file)
-        print(f"  백업 파일 크기: {backup_size:,} bytes")
-        print(f"  복원된 파일 크기: {original_size:,} bytes")
-        
-        # 줄 수 확인
-        with open(original_file, 'r', encoding='utf-8') as f:
-            lines = len(f.readlines())
-        print(f"  복원된 파일 줄 수: {lines:,} lines")
-        
-        return True
-    else:
-        print(f"❌ 백업 파일을 찾을 수 없습니다: {backup_file}")
+    """백업 저장소에서 CR문제.txt 를 복원합니다 (버전 id 를 주지 않으면 "복원 전" 사본을 뺀 가장 최근 백업)"""
+    parser = argparse.ArgumentParser(description="CR문제.txt 백업 복원")
+    parser.add_argument("version_id", nargs="?", help="복원할 버전 id (python backup_store.py list 로 확인)")
+    parser.add_argument("--file", default=CR_FILE, help="복원할 파일")
+    args = parser.parse_args()
+
+    store = default_store()
+    versions = store.versions(args.file)
+    if not versions:
+        print(f"❌ 백업을 찾을 수 없습니다: {args.file}")
+        return False
+
+    print_versions(versions)
+    version_id = args.version_id
+    if not version_id:
+        latest = store.latest(args.file)
+        if latest is None:
+            print("❌ \"복원 전\" 사본만 있습니다. 복원할 버전 id 를 지정하세요.")
+            return False
+        version_id = latest["id"]
+    try:
+        version = store.restore(version_id, args.file)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
         return False
 
+    print("\n✅ 백업 복원 완료!")
+    print(f"  버전 {version['id']} ({version['created_at']}) → {args.file}")
+
+    # 파일 크기 확인
+    print(f"  백업 파일 크기: {version['size']:,} bytes")
+    print(f"  복원된 파일 크기: {os.path.getsize(args.file):,} bytes")
+
+    # 줄 수 확인
+    with open(args.file, 'r', encoding='utf-8') as f:
+        lines = len(f.readlines())
+    print(f"  복원된 파일 줄 수: {lines:,} lines")
+
+    return True
+
 if __name__ == "__main__":
-    restore_backup() 
\ No newline at end of file
+    restore_backup()
@@ -0,0 +1,15 @@
+-- 📅 틀린 문제 복습 스케줄 (review_scheduler.py)
+CREATE TABLE IF NOT EXISTS review_schedule (
+    user_id TEXT NOT NULL,
+    question_id UUID NOT NULL REFERENCES questions(id) ON DELETE CASCADE,
+    repetitions INTEGER NOT NULL DEFAULT 0,
+    interval_days REAL NOT NULL DEFAULT 0,
+    ease_factor REAL NOT NULL DEFAULT 2.5,
+    due_at TIMESTAMP NOT NULL,
+    last_reviewed_at TIMESTAMP,
+    PRIMARY KEY (user_id, question_id)
+);
+
+-- 유저별 "다음 복습 문제" 조회용 인덱스
+CREATE INDEX IF NOT EXISTS idx_review_schedule_user_due
+    ON review_schedule (user_id, due_at);
@@ -0,0 +1,237 @@
+import heapq
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+# 📅 틀린 문제 복습 스케줄러 (SM-2 변형)
+# review_schedule 테이블에 유저별 상태를 저장하고,
+# 메모리에는 유저별 우선순위 큐(heap)를 유지하여 "다음 복습 문제"를 O(log n)에 조회합니다.
+
+REVIEW_TABLE = "review_schedule"
+
+MIN_EASE = 1.3
+DEFAULT_EASE = 2.5
+
+# 풀이 시간(초) 기준 - 빠르게 맞히면 더 높은 품질 점수를 줍니다
+FAST_SOLVE_SEC = 90
+SLOW_SOLVE_SEC = 180
+
+
+@dataclass
+class ReviewItem:
+    question_id: str
+    repetitions: int = 0
+    interval_days: float = 0.0
+    ease_factor: float = DEFAULT_EASE
+    due_at: datetime = None
+    last_reviewed_at: Optional[datetime] = None
+
+    def to_row(self, user_id: str) -> Dict:
+        return {
+            "user_id": user_id,
+            "question_id": self.question_id,
+            "repetitions": self.repetitions,
+            "interval_days": self.interval_days,
+            "ease_factor": round(self.ease_factor, 3),
+            "due_at": _to_db_time(self.due_at),
+            "last_reviewed_at": _to_db_time(self.last_reviewed_at) if self.last_reviewed_at else None,
+        }
+
+    @classmethod
+    def from_row(cls, row: Dict) -> "ReviewItem":
+        return cls(
+            question_id=row["question_id"],
+            repetitions=row.get("repetitions") or 0,
+            interval_days=float(row.get("interval_days") or 0),
+            ease_factor=float(row.get("ease_factor") or DEFAULT_EASE),
+            due_at=_parse_time(row["due_at"]),
+            last_reviewed_at=_parse_time(row.get("last_reviewed_at")),
+        )
+
+
+def _parse_time(value) -> Optional[datetime]:
+    """Supabase timestamp 문자열을 로컬 시각의 naive datetime으로 변환합니다 (datetime.now() 와 비교용)"""
+    if not value:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone()
+    return value.replace(tzinfo=None)
+
+
+def _to_db_time(value: datetime) -> str:
+    """로컬 naive datetime → 오프셋이 붙은 ISO 문자열 (timestamptz 가 UTC 로 해석하지 않도록)"""
+    return value.astimezone().isoformat()
+
+
+def answer_quality(is_correct: bool, started_at=None, submitted_at=None) -> int:
+    """정답 여부와 풀이 시간으로 SM-2 품질 점수(0~5)를 계산합니다"""
+    if not is_correct:
+        return 1
+
+    started = _parse_time(started_at)
+    submitted = _parse_time(submitted_at)
+    if not started or not submitted:
+        return 4
+
+    duration = (submitted - started).total_seconds()
+    if duration <= FAST_SOLVE_SEC:
+        return 5
+    if duration <= SLOW_SOLVE_SEC:
+        return 4
+    return 3
+
+
+def schedule_next(item: ReviewItem, quality: int, reviewed_at: datetime) -> ReviewItem:
+    """SM-2 알고리즘으로 다음 복습 시점을 계산합니다"""
+    if quality < 3:
+        # 틀렸으면 처음부터 다시 (Leitner 1번 상자)
+        item.repetitions = 0
+        item.interval_days = 1
+    else:
+        if item.repetitions == 0:
+            item.interval_days = 1
+        elif item.repetitions == 1:
+            item.interval_days = 6
+        else:
+            item.interval_days = round(item.interval_days * item.ease_factor, 2)
+        item.repetitions += 1
+
+    item.ease_factor = max(
+        MIN_EASE,
+        item.ease_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)),
+    )
+    item.last_reviewed_at = reviewed_at
+    item.due_at = reviewed_at + timedelta(days=item.interval_days)
+    return item
+
+
+class ReviewScheduler:
+    """유저별 복습 큐를 관리합니다 (DB가 원본, 메모리 heap은 조회용 인덱스)"""
+
+    def __init__(self, supabase):
+        self.supabase = supabase
+        self._items: Dict[str, Dict[str, ReviewItem]] = {}
+        self._heaps: Dict[str, List[Tuple[datetime, str]]] = {}
+
+    def _ensure_loaded(self, user_id: str, before: Optional[datetime] = None) -> None:
+        """유저의 스케줄을 처음 한 번만 DB에서 읽어 heap을 구성합니다
+
+        before: 기록 재생(seed) 시 이 시각 이후 답안은 제외 (방금 insert 된 답안을 두 번 반영하지 않도록)
+        """
+        if user_id in self._items:
+            return
+
+        rows = self.supabase.table(REVIEW_TABLE) \
+            .select("*") \
+            .eq("user_id", user_id) \
+            .execute().data
+
+        if not rows:
+            rows = self._seed_from_history(user_id, before)
+
+        items = {}
+        for row in rows:
+            item = ReviewItem.from_row(row)
+            items[item.question_id] = item
+
+        self._items[user_id] = items
+        self._heaps[user_id] = [(item.due_at, qid) for qid, item in items.items()]
+        heapq.heapify(self._heaps[user_id])
+
+    def _seed_from_history(self, user_id: str, before: Optional[datetime] = None) -> List[Dict]:
+        """스케줄이 없는 유저는 기존 user_answers 기록을 재생하여 초기 스케줄을 만듭니다"""
+        history = self.supabase.table("user_answers") \
+            .select("question_id, is_correct, started_at, submitted_at") \
+            .eq("user_id", user_id) \
+            .order("submitted_at", desc=False) \
+            .execute().data
+
+        items: Dict[str, ReviewItem] = {}
+        for row in history:
+            qid = row.get("question_id")
+            if not qid:
+                continue
+            is_correct = bool(row.get("is_correct"))
+            # 한 번도 틀리지 않은 문제는 복습 대상이 아님
+            if qid not in items and is_correct:
+                continue
+            reviewed_at = _parse_time(row.get("submitted_at")) or datetime.now()
+            if before is not None and reviewed_at >= before:
+                continue
+            item = items.setdefault(qid, ReviewItem(question_id=qid))
+            quality = answer_quality(is_correct, row.get("started_at"), row.get("submitted_at"))
+            schedule_next(item, quality, reviewed_at)
+
+        seeded = [item.to_row(user_id) for item in items.values()]
+        if seeded:
+            self.supabase.table(REVIEW_TABLE) \
+                .upsert(seeded, on_conflict="user_id,question_id") \
+                .execute()
+            print(f"📅 {user_id}: 기존 기록에서 복습 문제 {len(seeded)}개 생성")
+        return seeded
+
+    def record_answer(self, user_id: str, question_id: str, is_correct: bool,
+                      started_at=None, submitted_at=None) -> Optional[ReviewItem]:
+        """답안 제출 결과를 스케줄에 반영합니다 (틀린 문제는 새로 등록)"""
+        if not question_id:
+            return None
+        reviewed_at = _parse_time(submitted_at) or datetime.now()
+        self._ensure_loaded(user_id, before=reviewed_at)
+
+        items = self._items[user_id]
+        item = items.get(question_id)
+        if item is None:
+            if is_correct:
+                return None
+            item = ReviewItem(question_id=question_id)
+            items[question_id] = item
+
+        quality = answer_quality(is_correct, started_at, submitted_at)
+        schedule_next(item, quality, reviewed_at)
+
+        # 기존 heap 항목은 그대로 두고 새 항목을 넣음 (조회 시 오래된 항목은 버림)
+        heapq.heappush(self._heaps[user_id], (item.due_at, question_id))
+
+        self.supabase.table(REVIEW_TABLE) \
+            .upsert(item.to_row(user_id), on_conflict="user_id,question_id") \
+            .execute()
+        return item
+
+    def _prune(self, user_id: str) -> None:
+        heap = self._heaps[user_id]
+        items = self._items[user_id]
+        while heap:
+            due_at, qid = heap[0]
+            item = items.get(qid)
+            if item is not None and item.due_at == due_at:
+                return
+            heapq.heappop(heap)
+
+    def next_due(self, user_id: str, now: Optional[datetime] = None) -> Optional[ReviewItem]:
+        """지금 복습해야 할 문제를 반환합니다 (없으면 None)"""
+        self._ensure_loaded(user_id)
+        self._prune(user_id)
+
+        heap = self._heaps[user_id]
+        if not heap:
+            return None
+
+        due_at, qid = heap[0]
+        if due_at > (now or datetime.now()):
+            return None
+        return self._items[user_id][qid]
+
+    def upcoming(self, user_id: str) -> Optional[datetime]:
+        """다음 복습 예정 시각을 반환합니다"""
+        self._ensure_loaded(user_id)
+        self._prune(user_id)
+        heap = self._heaps[user_id]
+        return heap[0][0] if heap else None
+
+    def due_count(self, user_id: str, now: Optional[datetime] = None) -> int:
+        """현재 복습 대기 중인 문제 수"""
+        self._ensure_loaded(user_id)
+        now = now or datetime.now()
+        return sum(1 for item in self._items[user_id].values() if item.due_at <= now)
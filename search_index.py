@@ -0,0 +1,113 @@
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+# 🔎 문제 검색용 역색인
+# 카탈로그의 문제 본문/보기/해설을 토큰 → {문제 id: 가중치} 로 색인합니다.
+# - 영어: 소문자 단어 (불용어 제외)
+# - 한국어: 한글 연속 구간의 2-gram ("재정적자" → 재정, 정적, 적자) - 조사가 붙어도 검색됨
+# 검색은 검색어 토큰 대부분(MIN_MATCH_RATIO)을 포함하는 문제를 TF-IDF 합으로 정렬합니다.
+
+# 필드별 가중치 (본문 일치를 가장 중요하게)
+FIELD_WEIGHTS = {
+    "question": 3.0,
+    "choices": 2.0,
+    "explanation": 1.0,
+    "explanation_en": 1.0,
+}
+
+SNIPPET_LENGTH = 80
+MIN_MATCH_RATIO = 0.75
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "if", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "was", "were", "which", "with",
+}
+
+_WORD_PATTERN = re.compile(r'[a-z0-9]+|[가-힣]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """영어 단어 + 한글 2-gram 토큰 목록"""
+    tokens = []
+    for chunk in _WORD_PATTERN.findall((text or '').lower()):
+        if '가' <= chunk[0] <= '힣':
+            if len(chunk) == 1:
+                tokens.append(chunk)
+            else:
+                tokens.extend(chunk[i:i + 2] for i in range(len(chunk) - 1))
+        elif chunk not in STOPWORDS and (len(chunk) > 1 or chunk.isdigit()):
+            tokens.append(chunk)
+    return tokens
+
+
+def _field_text(question: Dict, field: str) -> str:
+    value = question.get(field)
+    if isinstance(value, list):
+        return ' '.join(str(v) for v in value)
+    return value or ''
+
+
+@dataclass
+class SearchHit:
+    question: Dict
+    score: float
+    snippet: str
+
+
+class SearchIndex:
+    """문제 목록으로 한 번 만들고, 카탈로그가 새로 로드되면 다시 만듭니다"""
+
+    def __init__(self, questions: Iterable[Dict]):
+        self.questions: Dict[object, Dict] = {}
+        postings: Dict[str, Dict[object, float]] = defaultdict(lambda: defaultdict(float))
+
+        for question in questions:
+            qid = question["id"]
+            self.questions[qid] = question
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(_field_text(question, field)):
+                    postings[token][qid] += weight
+
+        # 검색 중에는 읽기만 하므로 일반 dict 로 고정 (여러 핸들러 스레드에서 공유)
+        self.postings: Dict[str, Dict[object, float]] = {token: dict(p) for token, p in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def _idf(self, token: str) -> float:
+        return math.log(1 + len(self.questions) / (1 + len(self.postings.get(token, ()))))
+
+    def search(self, query: str, limit: int = 10) -> List[SearchHit]:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        # 검색어 토큰의 MIN_MATCH_RATIO 이상을 포함하는 문제만 후보 (한글 조사 "재정적자는" 의 '자는' 등 허용)
+        required = max(1, math.ceil(len(tokens) * MIN_MATCH_RATIO))
+        matched: Dict[object, int] = defaultdict(int)
+        for token in tokens:
+            for qid in self.postings.get(token, ()):
+                matched[qid] += 1
+        candidates = [qid for qid, count in matched.items() if count >= required]
+
+        scored = []
+        for qid in candidates:
+            score = sum(self.postings.get(token, {}).get(qid, 0.0) * self._idf(token) for token in tokens)
+            scored.append((score, qid))
+        scored.sort(key=lambda x: (-x[0], self.questions[x[1]].get("question_number") or 0))
+
+        return [SearchHit(self.questions[qid], round(score, 2), snippet(self.questions[qid], query))
+                for score, qid in scored[:limit]]
+
+
+def snippet(question: Dict, query: str, length: int = SNIPPET_LENGTH) -> str:
+    """본문에서 첫 검색어 주변을 잘라 보여줍니다"""
+    text = ' '.join((question.get("question") or '').split())
+    lowered = text.lower()
+    positions = [lowered.find(word) for word in query.lower().split() if word and word in lowered]
+    start = max(0, min(positions) - length // 4) if positions else 0
+    part = text[start:start + length]
+    return ("…" if start else "") + part + ("…" if start + length < len(text) else "")
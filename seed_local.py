@@ -0,0 +1,37 @@
+import argparse
+import os
+
+from question_bank import DEFAULT_FILES, load_files, to_db_row
+
+# 💾 로컬 저장소(MBOT_STORAGE=sqlite / memory) 에 문제은행 텍스트 파일을 채웁니다
+# Supabase 없이 봇/유지보수 스크립트를 돌리거나 성능 측정을 할 때 사용합니다.
+#   MBOT_STORAGE=sqlite python seed_local.py
+#   MBOT_STORAGE=sqlite python bot.py
+# (type, question_number) 기준 upsert 라서 여러 번 실행해도 중복되지 않습니다.
+
+
+def seed(client, files=None, batch_size: int = 500) -> int:
+    rows = [to_db_row(q) for q in load_files(files)]
+    for start in range(0, len(rows), batch_size):
+        client.table("questions").upsert(rows[start:start + batch_size], on_conflict="type,question_number").execute()
+    print(f"💾 questions {len(rows)}개 기록 ({client.label})")
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 저장소에 문제은행 파일 적재")
+    for source, path in DEFAULT_FILES.items():
+        parser.add_argument(f"--{source}", default=path, help=f"{source} 파일 경로")
+    args = parser.parse_args()
+
+    backend = os.getenv("MBOT_STORAGE", "supabase").lower()
+    if backend == "supabase":
+        print("❌ MBOT_STORAGE=sqlite 로 실행하세요 (실제 Supabase 에는 업로드 스크립트를 사용)")
+        return
+
+    from storage import get_client
+    seed(get_client(service_role=True), {source: getattr(args, source) for source in DEFAULT_FILES})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+# 🗄️ DB 스냅샷 내보내기 / 복원
+# questions (선택: user_answers) 테이블을 keyset 페이지네이션으로 읽어
+# gzip JSONL 청크 + manifest.json(행 수, sha256) 으로 저장하고,
+# 복원 시에는 체크섬을 모두 확인한 뒤 청크를 병렬로 upsert 합니다.
+#   python snapshot.py export [--with-answers] [--out snapshots/...]
+#   python snapshot.py verify snapshots/20250801_120000
+#   python snapshot.py restore snapshots/20250801_120000 [--workers 8]
+# 다른 프로젝트로 옮길 때는 SUPABASE_URL/키만 바꿔서 restore 하면 됩니다.
+
+SNAPSHOT_DIR = "snapshots"
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+DEFAULT_TABLES = ("questions",)
+ANSWER_TABLES = ("user_answers",)
+CHUNK_ROWS = int(os.getenv("SNAPSHOT_CHUNK_ROWS", "5000"))
+PAGE_SIZE = 1000
+BATCH_SIZE = 500
+DEFAULT_WORKERS = int(os.getenv("SNAPSHOT_WORKERS", "4"))
+
+
+class SnapshotError(RuntimeError):
+    """manifest 누락, 체크섬 불일치 등 스냅샷이 손상되었을 때 발생"""
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_chunk(out_dir: str, table: str, index: int, rows: List[Dict], key: str) -> Dict:
+    name = f"{table}-{index:05d}.jsonl.gz"
+    path = os.path.join(out_dir, name)
+    # mtime=0 → 같은 데이터면 같은 파일(같은 체크섬)
+    with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False, sort_keys=True).encode("utf-8") + b"\n")
+    return {
+        "file": name,
+        "rows": len(rows),
+        "sha256": _sha256(path),
+        "first_key": rows[0].get(key),
+        "last_key": rows[-1].get(key),
+    }
+
+
+def export_snapshot(client, out_dir: str, tables: Sequence[str] = DEFAULT_TABLES, key: str = "id",
+                    page_size: int = PAGE_SIZE, chunk_rows: int = CHUNK_ROWS) -> Dict:
+    """테이블을 페이지 단위로 읽어 청크 파일로 내보내고 manifest 를 반환합니다"""
+    from storage import iter_pages
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {
+        "format": FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "source": getattr(client, "label", "supabase"),
+        "tables": {},
+    }
+
+    for table in tables:
+        started = time.perf_counter()
+        chunks, buffer, total = [], [], 0
+        for page in iter_pages(client, table, key=key, page_size=page_size):
+            buffer.extend(page)
+            total += len(page)
+            while len(buffer) >= chunk_rows:
+                chunks.append(_write_chunk(out_dir, table, len(chunks), buffer[:chunk_rows], key))
+                buffer = buffer[chunk_rows:]
+        if buffer:
+            chunks.append(_write_chunk(out_dir, table, len(chunks), buffer, key))
+
+        manifest["tables"][table] = {"key": key, "rows": total, "chunks": chunks}
+        print(f"📦 {table}: {total}행 → 청크 {len(chunks)}개 ({time.perf_counter() - started:.1f}초)")
+
+    with open(os.path.join(out_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"✅ 스냅샷 저장: {out_dir}")
+    return manifest
+
+
+def load_manifest(snapshot_dir: str) -> Dict:
+    path = os.path.join(snapshot_dir, MANIFEST)
+    if not os.path.exists(path):
+        raise SnapshotError(f"manifest 가 없습니다: {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_VERSION:
+        raise SnapshotError(f"지원하지 않는 스냅샷 형식: {manifest.get('format')}")
+    return manifest
+
+
+def verify_snapshot(snapshot_dir: str, manifest: Optional[Dict] = None) -> Dict:
+    """모든 청크의 존재/체크섬을 확인합니다 (하나라도 틀리면 SnapshotError)"""
+    manifest = manifest or load_manifest(snapshot_dir)
+    problems = []
+    for table, info in manifest["tables"].items():
+        for chunk in info["chunks"]:
+            path = os.path.join(snapshot_dir, chunk["file"])
+            if not os.path.exists(path):
+                problems.append(f"{chunk['file']}: 파일 없음")
+            elif _sha256(path) != chunk["sha256"]:
+                problems.append(f"{chunk['file']}: 체크섬 불일치")
+    if problems:
+        raise SnapshotError("스냅샷 손상:\n  " + "\n  ".join(problems))
+    print(f"🔐 체크섬 확인 완료: 청크 {sum(len(t['chunks']) for t in manifest['tables'].values())}개")
+    return manifest
+
+
+def read_chunk(snapshot_dir: str, chunk: Dict) -> List[Dict]:
+    with gzip.open(os.path.join(snapshot_dir, chunk["file"]), "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _restore_chunk(client, snapshot_dir: str, table: str, chunk: Dict, key: str, batch_size: int) -> int:
+    rows = read_chunk(snapshot_dir, chunk)
+    if len(rows) != chunk["rows"]:
+        raise SnapshotError(f"{chunk['file']}: 행 수 불일치 ({len(rows)} != {chunk['rows']})")
+    for start in range(0, len(rows), batch_size):
+        client.table(table).upsert(rows[start:start + batch_size], on_conflict=key).execute()
+    return len(rows)
+
+
+def restore_snapshot(client, snapshot_dir: str, tables: Optional[Sequence[str]] = None,
+                     workers: int = DEFAULT_WORKERS, batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+    """체크섬 확인 후 테이블 순서대로(외래 키), 테이블 안의 청크는 병렬로 upsert 합니다"""
+    manifest = verify_snapshot(snapshot_dir)
+    restored: Dict[str, int] = {}
+
+    for table, info in manifest["tables"].items():
+        if tables and table not in tables:
+            continue
+        started = time.perf_counter()
+        count = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_restore_chunk, client, snapshot_dir, table, chunk, info["key"], batch_size): chunk
+                       for chunk in info["chunks"]}
+            for future in as_completed(futures):
+                count += future.result()
+                print(f"  … {table}: {count}/{info['rows']}행")
+        restored[table] = count
+        print(f"📥 {table}: {count}행 복원 ({time.perf_counter() - started:.1f}초)")
+
+    print_restore_check(client, manifest, restored)
+    if "user_answers" in restored:
+        print("ℹ️ 답안은 순서와 무관하게 복원되므로 python cli.py backfill-progress 로 진척도를 다시 계산하세요")
+    return restored
+
+
+def print_restore_check(client, manifest: Dict, restored: Dict[str, int]) -> None:
+    """복원 후 테이블 행 수가 스냅샷 행 수 이상인지 확인합니다"""
+    for table in restored:
+        expected = manifest["tables"][table]["rows"]
+        try:
+            actual = client.table(table).select(manifest["tables"][table]["key"], count="exact").limit(1).execute().count
+        except Exception as e:
+            print(f"⚠️ {table} 행 수 확인 실패: {e}")
+            continue
+        mark = "✅" if actual is not None and actual >= expected else "❌"
+        print(f"{mark} {table}: DB {actual}행 / 스냅샷 {expected}행")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="questions / user_answers 스냅샷 내보내기·복원")
+    sub = parser.add_subparsers(dest="action", required=True)
+
+    export = sub.add_parser("export", help="DB → 스냅샷")
+    export.add_argument("--out", help=f"저장 폴더 (기본: {SNAPSHOT_DIR}/<시각>)")
+    export.add_argument("--with-answers", action="store_true", help="user_answers 도 포함")
+    export.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="청크당 행 수")
+
+    verify = sub.add_parser("verify", help="스냅샷 체크섬 확인")
+    verify.add_argument("path")
+
+    restore = sub.add_parser("restore", help="스냅샷 → DB")
+    restore.add_argument("path")
+    restore.add_argument("--tables", nargs="+", help="복원할 테이블만 지정")
+    restore.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="병렬 청크 수")
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🗄️ DB 스냅샷")
+    print("=" * 60)
+
+    try:
+        if args.action == "verify":
+            verify_snapshot(args.path)
+            return
+
+        from storage import get_client
+        client = get_client(service_role=True)
+        if args.action == "export":
+            tables = DEFAULT_TABLES + (ANSWER_TABLES if args.with_answers else ())
+            out_dir = args.out or os.path.join(SNAPSHOT_DIR, datetime.now().strftime("%Y%m%d_%H%M%S"))
+            export_snapshot(client, out_dir, tables, chunk_rows=args.chunk_rows)
+        else:
+            restore_snapshot(client, args.path, args.tables, workers=args.workers)
+    except SnapshotError as e:
+        print(f"❌ {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# storage - 공용 데이터 접근 패키지
+# 프로세스당 하나의 Supabase 클라이언트(= 하나의 HTTP 커넥션 풀)를 공유하고
+# 타임아웃, 지터 재시도, 서킷 브레이커를 일괄 적용합니다.
+# MBOT_STORAGE=sqlite / memory 이면 오프라인 SQLite 저장소(storage/local.py)를 사용합니다.
+
+from storage.bulk import BulkUpdateResult, bulk_update, iter_pages, iter_rows, print_summary
+from storage.client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientClient,
+    IDEMPOTENT_RPCS,
+    STORAGE_BACKENDS,
+    StorageConfigError,
+    get_client,
+    is_transient_error,
+    is_unsent_error,
+)
+
+__all__ = [
+    "BulkUpdateResult",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "IDEMPOTENT_RPCS",
+    "ResilientClient",
+    "STORAGE_BACKENDS",
+    "StorageConfigError",
+    "bulk_update",
+    "get_client",
+    "is_transient_error",
+    "is_unsent_error",
+    "iter_pages",
+    "iter_rows",
+    "print_summary",
+]
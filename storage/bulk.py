@@ -0,0 +1,152 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# 🚚 대량 유지보수 업데이트 엔진
+# - keyset 페이지네이션(id > 마지막 id)으로 테이블을 끝까지 훑고
+# - 행마다 transform(row) → 변경 필드(dict) 또는 None 을 계산한 뒤
+# - 변경분을 batch 단위 upsert 또는 RPC 한 번으로 기록합니다.
+# 메모리에는 한 페이지 + 한 배치만 유지합니다.
+
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_BATCH_SIZE = 200
+
+# 필터 형식: ("eq", "type", "cr"), ("gte", "question_number", 147) ...
+Filter = Tuple[str, str, object]
+
+
+@dataclass
+class BulkUpdateResult:
+    scanned: int = 0
+    changed: int = 0
+    written: int = 0
+    failed: int = 0
+    batches: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def _apply_filters(query, filters: Iterable[Filter]):
+    for op, column, value in filters:
+        query = getattr(query, op)(column, value)
+    return query
+
+
+def iter_pages(client, table: str, columns: str = "*", filters: Sequence[Filter] = (),
+               key: str = "id", page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[List[Dict]]:
+    """keyset 페이지네이션으로 행을 page_size 단위로 읽습니다 (OFFSET 미사용)"""
+    if columns != "*" and key not in [c.strip() for c in columns.split(",")]:
+        columns = f"{key}, {columns}"
+
+    last_key = None
+    while True:
+        query = _apply_filters(client.table(table).select(columns), filters)
+        if last_key is not None:
+            query = query.gt(key, last_key)
+        rows = query.order(key, desc=False).limit(page_size).execute().data or []
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        last_key = rows[-1][key]
+
+
+def iter_rows(client, table: str, **kwargs) -> Iterator[Dict]:
+    """iter_pages 를 행 단위로 풀어서 반환합니다"""
+    for page in iter_pages(client, table, **kwargs):
+        yield from page
+
+
+def _short(value, limit: int = 60) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def print_diff(row: Dict, changes: Dict, label: str) -> None:
+    print(f"  📝 {label}")
+    for column, new_value in changes.items():
+        print(f"      {column}: {_short(row.get(column))} → {_short(new_value)}")
+
+
+def _write_batch(client, table: str, batch: List[Dict], key: str, mode: str,
+                 rpc_name: Optional[str], result: BulkUpdateResult) -> None:
+    if not batch:
+        return
+    result.batches += 1
+    try:
+        if mode == "rpc":
+            client.rpc(rpc_name, {"payload": batch}).execute()
+        else:
+            client.table(table).upsert(batch, on_conflict=key).execute()
+        result.written += len(batch)
+    except Exception as e:
+        result.failed += len(batch)
+        result.errors.append(str(e))
+        print(f"  ❌ 배치 {result.batches} 기록 실패 ({len(batch)}행): {e}")
+
+
+def bulk_update(client, table: str, transform: Callable[[Dict], Optional[Dict]],
+                columns: str = "*", filters: Sequence[Filter] = (), key: str = "id",
+                page_size: int = DEFAULT_PAGE_SIZE, batch_size: int = DEFAULT_BATCH_SIZE,
+                mode: str = "upsert", rpc_name: Optional[str] = None,
+                dry_run: bool = False, show_diff: int = 20,
+                label: Callable[[Dict], str] = None) -> BulkUpdateResult:
+    """테이블 전체에 transform 을 적용하고 변경분만 묶어서 기록합니다
+
+    mode="upsert": 조회한 행에 변경분을 합쳐 on_conflict=key 로 upsert
+                   (NOT NULL 컬럼이 있으면 columns="*" 로 전체 행을 읽어야 함)
+    mode="rpc":    {key, 변경 필드}만 모아 rpc_name(payload jsonb) 을 호출
+    dry_run=True:  아무것도 쓰지 않고 변경 예정 diff 만 출력
+    """
+    if mode not in ("upsert", "rpc"):
+        raise ValueError(f"지원하지 않는 mode: {mode}")
+    if mode == "rpc" and not rpc_name:
+        raise ValueError("mode='rpc' 에는 rpc_name 이 필요합니다")
+
+    label = label or (lambda row: f"{key}={row.get(key)}")
+    result = BulkUpdateResult()
+    batch: List[Dict] = []
+
+    for page in iter_pages(client, table, columns=columns, filters=filters, key=key, page_size=page_size):
+        for row in page:
+            result.scanned += 1
+            changes = transform(row)
+            if not changes:
+                continue
+            changes = {k: v for k, v in changes.items() if row.get(k) != v}
+            if not changes:
+                continue
+
+            result.changed += 1
+            if result.changed <= show_diff:
+                print_diff(row, changes, label(row))
+
+            if dry_run:
+                continue
+
+            if mode == "rpc":
+                batch.append({key: row[key], **changes})
+            else:
+                batch.append({**row, **changes})
+
+            if len(batch) >= batch_size:
+                _write_batch(client, table, batch, key, mode, rpc_name, result)
+                batch = []
+
+        print(f"  … {result.scanned}행 확인, 변경 {result.changed}행")
+
+    _write_batch(client, table, batch, key, mode, rpc_name, result)
+
+    if show_diff and result.changed > show_diff:
+        print(f"  (diff {show_diff}개만 표시, 나머지 {result.changed - show_diff}개 생략)")
+    return result
+
+
+def print_summary(result: BulkUpdateResult, dry_run: bool = False) -> None:
+    print("\n" + "=" * 60)
+    print("📊 대량 업데이트 결과" + (" (dry-run, 기록 안 함)" if dry_run else ""))
+    print("=" * 60)
+    print(f"확인한 행: {result.scanned}개")
+    print(f"변경 대상: {result.changed}개")
+    if not dry_run:
+        print(f"기록 성공: {result.written}개 ({result.batches}개 배치)")
+        print(f"기록 실패: {result.failed}개")
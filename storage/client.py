@@ -0,0 +1,237 @@
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ⚙️ 연결 정책 (환경 변수로 조정 가능)
+SUPABASE_TIMEOUT_SEC = float(os.getenv("SUPABASE_TIMEOUT_SEC", "10"))
+SUPABASE_MAX_RETRIES = int(os.getenv("SUPABASE_MAX_RETRIES", "3"))
+SUPABASE_BACKOFF_BASE_SEC = float(os.getenv("SUPABASE_BACKOFF_BASE_SEC", "0.5"))
+SUPABASE_BACKOFF_MAX_SEC = float(os.getenv("SUPABASE_BACKOFF_MAX_SEC", "8"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("SUPABASE_CIRCUIT_THRESHOLD", "5"))
+CIRCUIT_RESET_SEC = float(os.getenv("SUPABASE_CIRCUIT_RESET_SEC", "30"))
+
+TRANSIENT_STATUS_CODES = {"408", "425", "429", "500", "502", "503", "504"}
+
+# 두 번 실행해도 결과가 같은 RPC (값을 덮어쓰기만 함) → select/upsert 처럼 일시 오류 시 재시도
+IDEMPOTENT_RPCS = {"bulk_update_questions", "update_question_stats", "sync_answers_by_q_number"}
+
+# 반복하면 행이 늘어나거나 트리거가 다시 도는 쓰기 → 요청이 서버에 닿지 않은 오류만 재시도
+NON_IDEMPOTENT_METHODS = {"insert", "update", "delete"}
+
+# 저장소 종류: supabase (기본) / sqlite / memory (storage/local.py)
+STORAGE_BACKENDS = ("supabase", "sqlite", "memory")
+
+
+class StorageConfigError(RuntimeError):
+    """Supabase 접속 정보(URL/KEY)가 없을 때 발생"""
+
+
+class CircuitOpenError(RuntimeError):
+    """연속 실패로 서킷이 열려 있어 요청을 보내지 않았을 때 발생"""
+
+
+def is_transient_error(exc: Exception) -> bool:
+    """재시도하면 성공할 수 있는 오류(네트워크/타임아웃/5xx/429)인지 판단합니다"""
+    try:
+        import httpx
+        if isinstance(exc, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)):
+            return True
+    except ImportError:
+        pass
+
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+
+    for attr in ("status_code", "code", "status"):
+        code = getattr(exc, attr, None)
+        if code is not None and str(code) in TRANSIENT_STATUS_CODES:
+            return True
+    return False
+
+
+def is_unsent_error(exc: Exception) -> bool:
+    """요청이 서버에서 처리되지 않았음이 확실한 오류(연결 실패/429)인지 판단합니다
+
+    읽기 타임아웃이나 5xx 는 서버에서 이미 커밋됐을 수 있으므로 포함하지 않습니다.
+    """
+    try:
+        import httpx
+        if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+            return True
+    except ImportError:
+        pass
+
+    if isinstance(exc, ConnectionRefusedError):
+        return True
+    return any(str(getattr(exc, attr, None)) == "429" for attr in ("status_code", "code", "status"))
+
+
+class CircuitBreaker:
+    """연속 실패가 임계치를 넘으면 일정 시간 요청을 차단합니다 (closed → open → half-open)"""
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_SEC):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> None:
+        if self.state == "open":
+            remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+            raise CircuitOpenError(f"Supabase 서킷 열림 ({remaining:.0f}초 후 재시도)")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                # half-open 상태에서 실패하면 다시 open
+                self.opened_at = time.monotonic()
+
+
+class _RetryingBuilder:
+    """postgrest 쿼리 빌더를 감싸서 execute()에 재시도/서킷 브레이커를 적용합니다
+
+    select/upsert/멱등 RPC 는 일시 오류(is_transient_error)에 재시도하고,
+    insert/update/delete 와 그 밖의 RPC 는 요청이 전달되지 않은 오류(is_unsent_error)만 재시도합니다.
+    """
+
+    def __init__(self, client: "ResilientClient", builder, idempotent: bool = True):
+        self._client = client
+        self._builder = builder
+        self._idempotent = idempotent
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, "execute"):
+                idempotent = self._idempotent and name not in NON_IDEMPOTENT_METHODS
+                return _RetryingBuilder(self._client, result, idempotent)
+            return result
+
+        return call
+
+    def execute(self):
+        retry_on = is_transient_error if self._idempotent else is_unsent_error
+        return self._client.call_with_retry(self._builder.execute, retry_on)
+
+
+class ResilientClient:
+    """지연 초기화되는 Supabase 클라이언트 래퍼
+
+    기존 코드의 supabase.table(...).select(...).execute() 형태를 그대로 지원합니다.
+    """
+
+    def __init__(self, url: Optional[str], key: Optional[str], label: str = "default"):
+        self.url = url
+        self.key = key
+        self.label = label
+        self.breaker = CircuitBreaker()
+        self._raw = None
+        self._lock = threading.Lock()
+
+    @property
+    def raw(self):
+        """실제 supabase Client (첫 사용 시 생성)"""
+        if self._raw is None:
+            with self._lock:
+                if self._raw is None:
+                    self._raw = self._connect()
+        return self._raw
+
+    def _connect(self):
+        if not self.url or not self.key:
+            raise StorageConfigError(
+                f"Supabase 환경 변수가 설정되지 않았습니다 ({self.label}). "
+                ".env 파일에 SUPABASE_URL과 키를 추가하세요."
+            )
+
+        from supabase import create_client
+        from supabase.lib.client_options import ClientOptions
+
+        options = ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT_SEC)
+        return create_client(self.url, self.key, options=options)
+
+    def call_with_retry(self, fn: Callable, retry_on: Callable[[Exception], bool] = is_transient_error):
+        """retry_on 이 참인 오류는 지터 백오프로 재시도하고, 그 외 오류는 즉시 전달합니다"""
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                result = fn()
+            except Exception as e:
+                if not retry_on(e):
+                    if is_transient_error(e):
+                        self.breaker.record_failure()
+                    raise
+                self.breaker.record_failure()
+                attempt += 1
+                if attempt > SUPABASE_MAX_RETRIES:
+                    raise
+                # full jitter 백오프
+                delay = random.uniform(0, min(SUPABASE_BACKOFF_MAX_SEC, SUPABASE_BACKOFF_BASE_SEC * 2 ** attempt))
+                print(f"⚠️ Supabase 일시 오류, {delay:.1f}초 후 재시도 ({attempt}/{SUPABASE_MAX_RETRIES}): {e}")
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def table(self, name: str) -> _RetryingBuilder:
+        return _RetryingBuilder(self, self.raw.table(name))
+
+    def rpc(self, fn: str, params: Optional[Dict] = None) -> _RetryingBuilder:
+        return _RetryingBuilder(self, self.raw.rpc(fn, params or {}), idempotent=fn in IDEMPOTENT_RPCS)
+
+
+_clients: Dict[str, ResilientClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(service_role: bool = False) -> ResilientClient:
+    """프로세스 공용 Supabase 클라이언트를 반환합니다
+
+    service_role=True 이면 SUPABASE_SERVICE_ROLE_KEY (업로드/관리 스크립트),
+    아니면 SUPABASE_KEY (봇)를 사용하고, 없으면 다른 키로 대체합니다.
+    MBOT_STORAGE=sqlite / memory 이면 키와 무관하게 로컬 저장소 하나를 공유합니다.
+    """
+    backend = os.getenv("MBOT_STORAGE", "supabase").lower()
+    if backend not in STORAGE_BACKENDS:
+        raise StorageConfigError(f"알 수 없는 MBOT_STORAGE 값: {backend} ({', '.join(STORAGE_BACKENDS)} 중 선택)")
+    label = backend if backend != "supabase" else ("service_role" if service_role else "anon")
+    with _clients_lock:
+        if backend != "supabase":
+            if label not in _clients:
+                from storage.local import DEFAULT_SQLITE_PATH, LocalClient
+                _clients[label] = LocalClient(":memory:" if backend == "memory" else DEFAULT_SQLITE_PATH)
+            return _clients[label]
+        if label not in _clients:
+            if service_role:
+                key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
+            else:
+                key = os.getenv("SUPABASE_KEY") or os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+            _clients[label] = ResilientClient(os.getenv("SUPABASE_URL"), key, label)
+        return _clients[label]
@@ -0,0 +1,333 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence
+
+# 💾 로컬(오프라인) 저장소
+# Supabase 없이 봇/업로더/유지보수 스크립트를 돌리기 위한 SQLite 백엔드입니다.
+# 코드에서 쓰는 postgrest 빌더 부분집합(select/eq/gt/in_/order/limit/range/insert/upsert/update/delete/rpc)을
+# 같은 모양으로 지원하므로 호출부는 바꿀 필요가 없습니다.
+# - 테이블마다 (rowid, doc JSON) 한 쌍으로 저장 → 스키마/마이그레이션 없이 모든 테이블 사용 가능
+# - 필터/정렬/페이지네이션은 json_extract 로 SQLite 에서 처리
+# - DB 트리거/RPC 는 register_trigger / register_rpc 로 파이썬 구현을 등록
+# MBOT_STORAGE=sqlite (파일, MBOT_SQLITE_PATH) 또는 memory (프로세스 메모리) 로 선택합니다.
+
+DEFAULT_SQLITE_PATH = os.getenv("MBOT_SQLITE_PATH", ".cache/mbot.sqlite3")
+
+try:
+    from postgrest.exceptions import APIError
+except ImportError:
+    class APIError(Exception):
+        """postgrest.exceptions.APIError 와 같은 모양 (postgrest 가 없는 오프라인 환경용)"""
+
+        def __init__(self, error: Dict):
+            self._raw_error = error
+            self.message = error.get("message")
+            self.code = error.get("code")
+            self.hint = error.get("hint")
+            self.details = error.get("details")
+            Exception.__init__(self, str(self))
+
+        def __str__(self):
+            return str(self._raw_error)
+
+# insert 시 id 가 없으면 정수 일련번호를 붙이는 테이블 (나머지는 UUID)
+SERIAL_ID_TABLES = {"user_answers"}
+
+AFTER_INSERT_TRIGGERS: Dict[str, List[Callable]] = defaultdict(list)
+RPCS: Dict[str, Callable] = {}
+
+
+def register_trigger(table: str):
+    """로컬 백엔드에서 table 에 insert 된 행마다 fn(client, row) 를 호출합니다 (AFTER INSERT 트리거 대응)"""
+    def decorator(fn):
+        AFTER_INSERT_TRIGGERS[table].append(fn)
+        return fn
+    return decorator
+
+
+def register_rpc(name: str):
+    """client.rpc(name, params) 의 로컬 구현을 등록합니다"""
+    def decorator(fn):
+        RPCS[name] = fn
+        return fn
+    return decorator
+
+
+class LocalResponse:
+    def __init__(self, data, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _extract(column: str) -> str:
+    # 경로를 리터럴로 넣어야 json_extract(doc, '$.id') 식 인덱스가 사용됨
+    path = ("$." + column.strip()).replace("'", "''")
+    return f"json_extract(doc, '{path}')"
+
+
+def _param(value):
+    # json_extract 는 true/false 를 1/0 으로, 객체/배열은 JSON 문자열로 반환
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+class LocalQuery:
+    """LocalClient.table(name) 이 반환하는 빌더"""
+
+    def __init__(self, client: "LocalClient", table: str):
+        self._client = client
+        self._table = table
+        self._op = "select"
+        self._columns = "*"
+        self._count = None
+        self._payload = None
+        self._on_conflict = None
+        self._where: List[str] = []
+        self._params: List = []
+        self._order: List[str] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+
+    # --- 동작 ---
+    def select(self, columns: str = "*", count: Optional[str] = None):
+        self._op, self._columns, self._count = "select", columns, count
+        return self
+
+    def insert(self, rows, **kwargs):
+        self._op, self._payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict: str = "id", **kwargs):
+        self._op, self._payload, self._on_conflict = "upsert", rows, on_conflict
+        return self
+
+    def update(self, values: Dict):
+        self._op, self._payload = "update", values
+        return self
+
+    def delete(self):
+        self._op = "delete"
+        return self
+
+    # --- 필터 ---
+    def _filter(self, column: str, sql: str, *params):
+        self._where.append(f"{_extract(column)} {sql}")
+        self._params.extend(params)
+        return self
+
+    def eq(self, column, value):
+        if value is None:
+            return self._filter(column, "IS NULL")
+        return self._filter(column, "= ?", _param(value))
+
+    def neq(self, column, value):
+        return self._filter(column, "IS NOT ?", _param(value))
+
+    def gt(self, column, value):
+        return self._filter(column, "> ?", _param(value))
+
+    def gte(self, column, value):
+        return self._filter(column, ">= ?", _param(value))
+
+    def lt(self, column, value):
+        return self._filter(column, "< ?", _param(value))
+
+    def lte(self, column, value):
+        return self._filter(column, "<= ?", _param(value))
+
+    def in_(self, column, values: Sequence):
+        values = [_param(v) for v in values]
+        if not values:
+            self._where.append("0")
+            return self
+        return self._filter(column, f"IN ({', '.join('?' * len(values))})", *values)
+
+    def is_(self, column, value):
+        if value in (None, "null"):
+            return self._filter(column, "IS NULL")
+        return self._filter(column, "IS ?", _param(value))
+
+    def order(self, column: str, desc: bool = False):
+        self._order.append(f"{_extract(column)} {'DESC' if desc else 'ASC'}")
+        return self
+
+    def limit(self, n: int):
+        self._limit = n
+        return self
+
+    def range(self, start: int, end: int):
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    # --- 실행 ---
+    def _where_sql(self) -> str:
+        return (" WHERE " + " AND ".join(self._where)) if self._where else ""
+
+    def _select_rows(self, conn, with_rowid: bool = False):
+        sql = f"SELECT rowid, doc FROM {_quote(self._table)}{self._where_sql()}"
+        sql += " ORDER BY " + ", ".join(self._order + ["rowid"])
+        if self._limit is not None or self._offset:
+            sql += " LIMIT ? OFFSET ?"
+            params = self._params + [self._limit if self._limit is not None else -1, self._offset]
+        else:
+            params = self._params
+        rows = conn.execute(sql, params).fetchall()
+        return [(rowid, json.loads(doc)) for rowid, doc in rows] if with_rowid else [json.loads(d) for _, d in rows]
+
+    def _project(self, row: Dict) -> Dict:
+        if self._columns.strip() == "*":
+            return row
+        return {c.strip(): row.get(c.strip()) for c in self._columns.split(",") if c.strip()}
+
+    def execute(self) -> LocalResponse:
+        with self._client.lock:
+            conn = self._client.connection(self._table)
+            if self._op == "select":
+                rows = [self._project(row) for row in self._select_rows(conn)]
+                count = None
+                if self._count:
+                    sql = f"SELECT COUNT(*) FROM {_quote(self._table)}{self._where_sql()}"
+                    count = conn.execute(sql, self._params).fetchone()[0]
+                return LocalResponse(rows, count)
+
+            if self._op == "insert":
+                inserted = [self._client.insert_row(conn, self._table, row) for row in _as_list(self._payload)]
+            elif self._op == "upsert":
+                keys = [k.strip() for k in (self._on_conflict or "id").split(",")]
+                inserted = [self._client.upsert_row(conn, self._table, row, keys) for row in _as_list(self._payload)]
+            elif self._op == "update":
+                inserted = []
+                for rowid, row in self._select_rows(conn, with_rowid=True):
+                    row.update(self._payload)
+                    self._client.write_doc(conn, self._table, rowid, row)
+                    inserted.append(row)
+            else:
+                inserted = self._select_rows(conn)
+                conn.execute(f"DELETE FROM {_quote(self._table)}{self._where_sql()}", self._params)
+            conn.commit()
+
+        if self._op == "insert":
+            for row in inserted:
+                for trigger in AFTER_INSERT_TRIGGERS.get(self._table, ()):
+                    trigger(self._client, row)
+        return LocalResponse(inserted)
+
+
+def _as_list(payload) -> List[Dict]:
+    return list(payload) if isinstance(payload, (list, tuple)) else [payload]
+
+
+class _LocalRpc:
+    def __init__(self, client: "LocalClient", name: str, params: Dict):
+        self._client, self._name, self._params = client, name, params
+
+    def execute(self) -> LocalResponse:
+        if self._name not in RPCS:
+            # PostgREST 가 없는 함수에 돌려주는 오류와 같은 코드/메시지
+            raise APIError({
+                "code": "PGRST202",
+                "message": f"Could not find the function public.{self._name} in the schema cache",
+                "hint": "로컬 저장소(storage/local.py)에 register_rpc 로 등록되지 않은 RPC 입니다",
+                "details": None,
+            })
+        return LocalResponse(RPCS[self._name](self._client, **self._params))
+
+
+class LocalClient:
+    """SQLite 파일(또는 :memory:) 하나에 모든 테이블을 담는 Supabase 대체 클라이언트"""
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH):
+        self.path = path
+        self.label = "memory" if path == ":memory:" else f"sqlite:{path}"
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL" if path != ":memory:" else "PRAGMA journal_mode=MEMORY")
+        self._tables = set()
+        # 트리거가 같은 클라이언트로 다시 쿼리하므로 재진입 가능한 락
+        self.lock = threading.RLock()
+
+    def connection(self, table: str) -> sqlite3.Connection:
+        if table not in self._tables:
+            name = _quote(table)
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {name} (rowid INTEGER PRIMARY KEY AUTOINCREMENT, doc TEXT NOT NULL)")
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote('idx_' + table + '_id')} ON {name} ({_extract('id')})")
+            self._tables.add(table)
+        return self._conn
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self, name)
+
+    def rpc(self, fn: str, params: Optional[Dict] = None) -> _LocalRpc:
+        return _LocalRpc(self, fn, params or {})
+
+    # --- 행 단위 쓰기 (LocalQuery 에서 락을 잡은 상태로 호출) ---
+    def write_doc(self, conn, table: str, rowid: int, row: Dict) -> None:
+        conn.execute(f"UPDATE {_quote(table)} SET doc = ? WHERE rowid = ?",
+                     (json.dumps(row, ensure_ascii=False), rowid))
+
+    def insert_row(self, conn, table: str, row: Dict) -> Dict:
+        row = dict(row)
+        if row.get("id") is None and table not in SERIAL_ID_TABLES:
+            row["id"] = str(uuid.uuid4())
+        cursor = conn.execute(f"INSERT INTO {_quote(table)} (doc) VALUES (?)", (json.dumps(row, ensure_ascii=False),))
+        if row.get("id") is None:
+            row["id"] = cursor.lastrowid
+            self.write_doc(conn, table, cursor.lastrowid, row)
+        return row
+
+    def upsert_row(self, conn, table: str, row: Dict, keys: List[str]) -> Dict:
+        if any(row.get(k) is None for k in keys):
+            return self.insert_row(conn, table, row)
+        where = " AND ".join(f"{_extract(k)} = ?" for k in keys)
+        params = [_param(row[k]) for k in keys]
+        found = conn.execute(f"SELECT rowid, doc FROM {_quote(table)} WHERE {where} LIMIT 1", params).fetchone()
+        if found is None:
+            return self.insert_row(conn, table, row)
+        merged = {**json.loads(found[1]), **row}
+        self.write_doc(conn, table, found[0], merged)
+        return merged
+
+
+@register_rpc("bulk_update_questions")
+@register_rpc("update_question_stats")
+def _update_questions_by_id(client: LocalClient, payload) -> int:
+    """payload 항목의 id 로 questions 행을 찾아 주어진 필드만 덮어씁니다 (bulk_update.sql 과 동일)"""
+    if isinstance(payload, str):
+        payload = json.loads(payload)
+    updated = 0
+    for item in payload:
+        fields = {k: v for k, v in item.items() if k != "id"}
+        updated += len(client.table("questions").update(fields).eq("id", item["id"]).execute().data)
+    return updated
+
+
+@register_rpc("sync_answers_by_q_number")
+def _sync_answers_by_q_number(client: LocalClient, payload, question_type: str = "LSAT") -> int:
+    """payload 의 q_number 로 questions 행을 찾아 답이 바뀐 경우만 answer 를 덮어씁니다 (bulk_update.sql 과 동일)"""
+    if isinstance(payload, str):
+        payload = json.loads(payload)
+    updated = 0
+    for item in payload:
+        query = (client.table("questions").update({"answer": item["answer"]})
+                 .eq("type", question_type).eq("q_number", int(item["q_number"])).neq("answer", item["answer"]))
+        updated += len(query.execute().data)
+    return updated
+
+
+@register_trigger("user_answers")
+def _apply_user_answer_progress(client: LocalClient, row: Dict) -> None:
+    """user_answers insert 마다 user_progress 갱신 (user_progress.sql 의 apply_user_answer_progress 트리거와 동일)"""
+    from user_progress import apply_answer
+    apply_answer(client, row)
@@ -0,0 +1,108 @@
+import json
+from typing import Callable, Dict, List, Optional
+
+from explanation_quality import check_explanation
+from question_bank import normalize_answer
+
+# 🧾 구조화된(JSON) 해설 생성
+# 업로더들이 "KOR: ... ENG: ..." 텍스트를 정규식으로 나누던 방식을 대신합니다.
+# - 응답: {"answer": "B", "korean": "...", "english": "..."} 객체 하나
+#   (json_object 모드를 지원하는 모델이면 response_format 도 지정)
+# - 검증: JSON 파싱, 필수 키/타입, 정답 문자 일치, 언어 (explanation_quality 의 language 규칙)
+#   품질 점수의 나머지 규칙(자리표시자/태그/길이)은 재요청 사유로 쓰지 않음 - 토큰만 쓰고 실패 행을 늘림
+# - 검증에 실패하면 이유와 함께 다시 요청 (MAX_ATTEMPTS 회) → 한 번의 생성으로 두 언어 해설을 확보
+
+MAX_ATTEMPTS = 3
+
+# 다시 요청하는 explanation_quality 규칙
+VALIDATED_RULES = ("language",)
+
+# response_format={"type": "json_object"} 를 지원하는 모델 (접두어)
+JSON_MODE_MODELS = ("gpt-4o", "gpt-4.1", "gpt-4-turbo", "gpt-4-1106", "gpt-4-0125", "gpt-3.5-turbo")
+
+SCHEMA = {
+    "answer": "정답 보기 문자 (A~E)",
+    "korean": "한국어 해설",
+    "english": "English explanation",
+}
+
+FORMAT_INSTRUCTIONS = (
+    "응답은 아래 키를 가진 JSON 객체 하나로만 작성하세요 (코드 블록이나 다른 텍스트 없이):\n"
+    + json.dumps(SCHEMA, ensure_ascii=False)
+    + '\n- korean 은 한국어로만, english 는 영어로만 작성하고 "KOR:", "[한국어 설명]" 같은 머리말은 붙이지 마세요.'
+)
+
+
+class ExplanationFormatError(ValueError):
+    """모델 응답이 JSON 해설 스키마를 만족하지 않을 때 발생"""
+
+
+def supports_json_mode(model: str) -> bool:
+    return model.startswith(JSON_MODE_MODELS)
+
+
+def _load_json(text: str) -> Dict:
+    text = (text or "").strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    # json_object 모드가 없는 모델은 코드 블록/앞뒤 문장을 붙이기도 함 → 가장 바깥 {...} 만 시도
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        raise ExplanationFormatError("JSON 객체가 없습니다")
+    try:
+        return json.loads(text[start:end + 1])
+    except ValueError as e:
+        raise ExplanationFormatError(f"JSON 파싱 실패: {e}")
+
+
+def parse_explanation(text: str, answer: Optional[str]) -> Dict[str, str]:
+    """모델 응답 → {'korean': ..., 'english': ...} (스키마/정답/언어 검증 실패 시 ExplanationFormatError)"""
+    data = _load_json(text)
+    if not isinstance(data, dict):
+        raise ExplanationFormatError("최상위 값이 JSON 객체가 아닙니다")
+
+    missing = [key for key in SCHEMA if not isinstance(data.get(key), str) or not data[key].strip()]
+    if missing:
+        raise ExplanationFormatError(f"비어 있거나 문자열이 아닌 키: {', '.join(missing)}")
+
+    answer = normalize_answer(answer)
+    if answer and normalize_answer(data["answer"]) != answer:
+        raise ExplanationFormatError(f"answer 가 {data['answer']!r} 입니다 (정답은 {answer})")
+
+    for key, column in (("korean", "explanation"), ("english", "explanation_en")):
+        issues = [message for rule, message in check_explanation(data[key], column, answer).items()
+                  if rule in VALIDATED_RULES]
+        if issues:
+            raise ExplanationFormatError(f"{key}: {'; '.join(issues)}")
+    return {"korean": data["korean"].strip(), "english": data["english"].strip()}
+
+
+def request_explanation(chat_create: Callable, messages: List[Dict], model: str, answer: Optional[str],
+                        max_tokens: int = 1000, temperature: float = 0.3,
+                        attempts: int = MAX_ATTEMPTS, log: Callable = print) -> Dict[str, str]:
+    """chat_create(model=..., messages=..., ...) 로 JSON 해설을 요청하고, 잘못된 응답이면 이유를 붙여 다시 요청합니다
+
+    messages 의 마지막 user 메시지에는 FORMAT_INSTRUCTIONS 가 포함되어 있어야 합니다.
+    """
+    kwargs = {"model": model, "max_tokens": max_tokens, "temperature": temperature}
+    if supports_json_mode(model):
+        kwargs["response_format"] = {"type": "json_object"}
+
+    messages = list(messages)
+    last_error = None
+    for attempt in range(1, attempts + 1):
+        response = chat_create(messages=messages, **kwargs)
+        content = response.choices[0].message.content or ""
+        try:
+            return parse_explanation(content, answer)
+        except ExplanationFormatError as e:
+            last_error = e
+            log(f"⚠️ 해설 형식 오류 ({attempt}/{attempts}): {e}")
+            messages = messages + [
+                {"role": "assistant", "content": content},
+                {"role": "user", "content": f"응답이 형식 조건을 어겼습니다: {e}\n"
+                                            f"같은 해설을 조건에 맞는 JSON 객체 하나로만 다시 작성하세요."},
+            ]
+    raise ExplanationFormatError(f"{attempts}번 요청했지만 올바른 JSON 해설을 받지 못했습니다: {last_error}")
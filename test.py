@@ -1,19 +1,26 @@
 import os
 from datetime import datetime
-from dotenv import load_dotenv
-from supabase import create_client, Client
 
-load_dotenv()
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+# 실제 Supabase 대신 메모리 저장소 사용 (MBOT_STORAGE=sqlite 로 파일 DB 도 가능)
+os.environ.setdefault("MBOT_STORAGE", "memory")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+from storage import get_client
+from user_progress import get_progress
+
+supabase = get_client()
 
 user_id = "debug_test_user"
-question_id = "1e4402e2-c35c-4ea6-8852-aa0c69b4810b"  # 꼭 진짜 UUID 넣어야 해!
+question = supabase.table("questions").insert({
+    "type": "cr",
+    "question_number": 1,
+    "question": "디버그용 문제",
+    "choices": ["a", "b", "c", "d", "e"],
+    "answer": "C",
+}).execute().data[0]
+question_id = question["id"]
 now = datetime.utcnow().isoformat()
 
-print("📡 Attempting insert...")
+print(f"📡 Attempting insert... ({supabase.label})")
 
 try:
     result = supabase.table("user_answers").insert({
@@ -26,7 +33,8 @@ try:
         "answered_at": now
     }).execute()
     print("✅ Insert success!")
-    print(result)
+    print(result.data)
+    print(get_progress(supabase, user_id))
 except Exception as e:
     print("❌ Insert failed:")
     print(e)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# 저장소 루트의 모듈을 import 하고, 실제 Supabase 대신 메모리 저장소를 사용
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MBOT_STORAGE", "memory")
@@ -0,0 +1,70 @@
+import backup_store
+from add_answers import ANSWER_RANGE, add_answers_to_questions, render_blocks, split_blocks
+from question_bank import AnswerKey, merge_answers
+
+QUESTIONS = """Critical Reasoning
+
+141. First question?
+A. one
+B. two
+
+142. Second question?
+A. one
+B. two
+"""
+
+
+def merge_text(content, key):
+    preamble, blocks = split_blocks(content)
+    merge = merge_answers([b for b in blocks if b.number in ANSWER_RANGE], key)
+    return render_blocks(preamble, blocks), merge
+
+
+def test_render_blocks_round_trips_without_answers():
+    preamble, blocks = split_blocks(QUESTIONS)
+    assert render_blocks(preamble, blocks) == QUESTIONS
+
+
+def test_merge_is_idempotent():
+    key = AnswerKey.from_text("141. B\n142. A\n143. C")
+    once, merge = merge_text(QUESTIONS, key)
+    assert "141. 정답 : B" in once and "142. 정답 : A" in once
+    assert merge.matched == [141, 142] and merge.orphan_answers == [143]
+
+    twice, merge = merge_text(once, key)
+    assert twice == once
+    assert merge.changed == []
+
+
+def test_merge_replaces_existing_answer_line():
+    once, _ = merge_text(QUESTIONS, AnswerKey.from_text("141. B\n142. A"))
+    fixed, merge = merge_text(once, AnswerKey.from_text("141. D\n142. A"))
+    assert merge.changed == [141]
+    assert "141. 정답 : D" in fixed and "141. 정답 : B" not in fixed
+    assert fixed.count("정답 :") == 2
+
+
+def test_merge_reports_missing_and_conflicts():
+    key = AnswerKey.from_text("141. B\n141. C")
+    _, merge = merge_text(QUESTIONS, key)
+    assert merge.missing_answers == [142]
+    assert merge.conflicts == {141: ["B", "C"]}
+    assert not merge.ok
+
+
+def test_merge_answers_on_dict_records():
+    records = [{"number": 1, "answer": None}, {"number": 2, "answer": "b"}]
+    merge = merge_answers(records, AnswerKey({1: "A", 2: "B"}))
+    assert [r["answer"] for r in records] == ["A", "B"]
+    assert merge.changed == [1]
+
+
+def test_add_answers_file_is_idempotent(tmp_path, monkeypatch):
+    monkeypatch.setattr(backup_store, "_default_store", backup_store.BackupStore(str(tmp_path / ".backups")))
+    path = tmp_path / "CR문제.txt"
+    path.write_text(QUESTIONS, encoding="utf-8")
+    key = AnswerKey.from_text("141. B\n142. A")
+    assert add_answers_to_questions(str(path), key)
+    first = path.read_text(encoding="utf-8")
+    assert add_answers_to_questions(str(path), key)
+    assert path.read_text(encoding="utf-8") == first
@@ -0,0 +1,23 @@
+import sys
+
+import backup_store
+from backup_store import PRE_RESTORE_LABEL, BackupStore
+from restore_backup import restore_backup
+
+
+def test_default_restore_is_repeatable(tmp_path, monkeypatch):
+    store = BackupStore(str(tmp_path / ".backups"))
+    monkeypatch.setattr(backup_store, "_default_store", store)
+    path = tmp_path / "CR문제.txt"
+    path.write_text("원본", encoding="utf-8")
+    store.save(str(path))
+    path.write_text("포맷 후", encoding="utf-8")
+
+    monkeypatch.setattr(sys, "argv", ["restore.py", "--file", str(path)])
+    assert restore_backup()
+    assert path.read_text(encoding="utf-8") == "원본"
+    assert store.versions(str(path))[-1]["label"] == PRE_RESTORE_LABEL
+
+    # 두 번째 실행이 "복원 전" 사본(포맷 후)을 되돌려 놓지 않음
+    assert restore_backup()
+    assert path.read_text(encoding="utf-8") == "원본"
@@ -0,0 +1,16 @@
+from content_manifest import ContentManifest, content_hash
+
+
+def test_keep_lines_hash_sees_line_breaks():
+    formatted = "141. Question text (A) one (B) two"
+    raw = "141. Question text\n(A) one\n(B) two"
+    assert content_hash(formatted) == content_hash(raw)
+    assert content_hash(formatted, keep_lines=True) != content_hash(raw, keep_lines=True)
+    assert content_hash(formatted + "  \n", keep_lines=True) == content_hash(formatted, keep_lines=True)
+
+
+def test_format_manifest_reprocesses_line_break_changes(tmp_path):
+    manifest = ContentManifest("format", path=str(tmp_path / "manifest.json"), force=False, keep_lines=True)
+    manifest.record(141, "141. Question text (A) one (B) two")
+    assert manifest.is_current(141, "141. Question text (A) one (B) two   ")
+    assert not manifest.is_current(141, "141. Question text\n(A) one (B) two")
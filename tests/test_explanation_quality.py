@@ -0,0 +1,21 @@
+from explanation_quality import check_explanation
+
+REAL_KO = ("정답은 (B)입니다. 지문의 결론은 새 정책이 비용을 줄인다는 것입니다. "
+           "(B)는 비용 절감의 전제를 직접 뒷받침하므로 논지를 가장 강화하는 보기입니다. "
+           "(A)와 (C)는 결론과 무관합니다.")
+
+
+def test_real_explanation_using_choice_wording_is_not_placeholder():
+    assert check_explanation(REAL_KO, "explanation", "B") == {}
+
+
+def test_one_sentence_explanation_is_not_placeholder():
+    text = "(B)는 결론의 전제를 직접 뒷받침하므로 논지를 가장 강화하는 보기입니다."
+    assert "placeholder" not in check_explanation(text, "explanation", "B")
+
+
+def test_legacy_template_is_placeholder():
+    for text in ("(B)는 추론 흐름을 가장 강하게 뒷받침하는 보기입니다.",
+                 "설명 생성 실패",
+                 ""):
+        assert "placeholder" in check_explanation(text, "explanation", "B"), text
@@ -0,0 +1,85 @@
+import pytest
+
+import llm_client
+from llm_client import LLMClient, is_retryable_error
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class AuthenticationError(Exception):
+    status_code = 401
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+class InternalServerError(Exception):
+    status_code = 500
+
+
+def make_client(errors):
+    """create() 가 errors 를 차례로 던진 뒤 usage 가 있는 응답을 돌려주는 클라이언트"""
+    calls = []
+
+    def create(**request):
+        calls.append(request)
+        if errors:
+            raise errors.pop(0)
+        return {"usage": {"prompt_tokens": 10, "completion_tokens": 5}}
+
+    client = LLMClient("test", api_key="sk-test", write_ledger=False)
+    client._backend = (create, None)
+    client._finished = True
+    return client, calls
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """가짜 시계: sleep 은 시각만 앞당기고, 각 perf_counter 호출은 0.1초씩 흐른다"""
+    slept, clock = [], [0.0]
+
+    def sleep(seconds):
+        slept.append(seconds)
+        clock[0] += seconds
+
+    def perf_counter():
+        clock[0] += 0.1
+        return clock[0]
+
+    monkeypatch.setattr(llm_client.time, "sleep", sleep)
+    monkeypatch.setattr(llm_client.time, "perf_counter", perf_counter)
+    return slept
+
+
+def test_retryable_error_classification():
+    assert is_retryable_error(RateLimitError())
+    assert is_retryable_error(InternalServerError())
+    assert is_retryable_error(TimeoutError())
+    assert not is_retryable_error(AuthenticationError())
+    assert not is_retryable_error(BadRequestError())
+    assert not is_retryable_error(ValueError())
+
+
+def test_retries_rate_limit_and_records_retry_count(sleeps):
+    client, calls = make_client([RateLimitError(), InternalServerError()])
+    client.chat(model="gpt-4o-mini", messages=[])
+    assert len(calls) == 3
+    assert sleeps == [2, 4]
+    record, = client.ledger.records
+    assert record.ok and record.retries == 2
+    # 지연은 성공한 시도만 (백오프 2+4초가 섞이지 않음)
+    assert record.latency_ms == 100.0
+
+
+@pytest.mark.parametrize("error", [AuthenticationError(), BadRequestError()])
+def test_does_not_retry_client_errors(sleeps, error):
+    client, calls = make_client([error])
+    with pytest.raises(type(error)):
+        client.chat(model="gpt-4o-mini", messages=[])
+    assert len(calls) == 1
+    assert sleeps == []
+    record, = client.ledger.records
+    assert not record.ok and record.retries == 0
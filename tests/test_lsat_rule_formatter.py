@@ -0,0 +1,26 @@
+from lsat_rule_formatter import format_problem, split_stem
+
+PASSAGE = ("Dr. Lee claims that the new drug lowers blood pressure. "
+           "In a trial, patients in the U.S. who took it had lower readings.")
+STEM = "Which one of the following, if true, most weakens Dr. Lee's argument?"
+
+
+def test_split_stem_keeps_abbreviations():
+    passage, stem = split_stem(f"{PASSAGE}\n{STEM}")
+    assert stem == STEM
+    assert passage == PASSAGE
+
+
+def test_inline_problem_with_abbreviation_in_stem():
+    content = (f"{PASSAGE} {STEM} (A) The trial was small. (B) Readings vary by hour. "
+               "(C) Diet changed. (D) Most patients were old. (E) The placebo group also improved.")
+    result = format_problem("5", content)
+    assert result.confidence == 1.0
+    assert result.text.split("\n")[3] == STEM
+
+
+def test_stem_without_question_cue_falls_back():
+    content = "The sky was clear. Birds flew south. (A) one. (B) two. (C) three. (D) four. (E) five."
+    result = format_problem("6", content)
+    assert result.text is None
+    assert result.reasons == ["질문 표현을 찾지 못함"]
@@ -0,0 +1,71 @@
+import pytest
+
+from explanation_quality import ExplanationScore
+from model_router import escalation_score, gen_ko_jobs, route
+from question_bank import from_db_row
+
+SHORT = "짧은 CR 문제\nA\nB\nC\nD\nE"
+LONG = "x" * 2000
+GOOD_KO = "정답은 (B) 입니다. 결론의 전제를 직접 약화하므로 논증의 흐름을 가장 잘 설명하는 보기입니다."
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    for name in ("GPT_MODEL", "ROUTER_POLICY", "ROUTER_SMALL_MODEL", "ROUTER_LARGE_MODEL", "ROUTER_LONG_STEM_CHARS"):
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_short_cr_goes_to_small_model():
+    r = route("gen-ko", "cr", SHORT)
+    assert (r.model, r.max_tokens) == ("gpt-4o-mini", 500)
+
+
+def test_long_lsat_goes_to_large_model_with_more_tokens():
+    r = route("upload-lsat-explain", "LSAT", LONG)
+    assert (r.model, r.max_tokens) == ("gpt-4o", 1800)
+    assert route("upload-cr", "cr", LONG).model == "gpt-4o-mini"
+
+
+def test_low_quality_score_escalates():
+    assert route("gen-ko", "cr", SHORT, quality_score=40).model == "gpt-4o"
+    assert route("gen-ko", "cr", SHORT, quality_score=80).model == "gpt-4o-mini"
+
+
+def test_placeholder_score_does_not_escalate():
+    placeholder = ExplanationScore("cr-1", "1", "explanation", 0, ["placeholder: 해설 없음/자리표시자"])
+    language = ExplanationScore("cr-2", "2", "explanation", 50, ["language: 한국어 해설의 한글 비율 0%"])
+    assert escalation_score(placeholder) is None
+    assert route("gen-ko", "cr", SHORT, escalation_score(placeholder)).model == "gpt-4o-mini"
+    assert route("gen-ko", "cr", SHORT, escalation_score(language)).model == "gpt-4o"
+
+
+def test_legacy_policy():
+    assert route("upload-og", "cr", SHORT, policy="legacy").model == "gpt-4"
+    assert route("gen-ko", "cr", SHORT, policy="legacy").model == "gpt-4o-mini"
+
+
+def test_env_is_read_at_call_time(monkeypatch):
+    monkeypatch.setenv("ROUTER_LARGE_MODEL", "gpt-4.1")
+    assert route("upload-lsat-explain", "LSAT", LONG).model == "gpt-4.1"
+    monkeypatch.setenv("ROUTER_POLICY", "large")
+    assert route("gen-ko", "cr", SHORT).model == "gpt-4.1"
+    monkeypatch.setenv("GPT_MODEL", "gpt-4o")
+    assert route("gen-ko", "cr", SHORT, policy="routed").model == "gpt-4o"
+    assert route("gen-ko", "cr", SHORT, policy="legacy").model == "gpt-4o"
+
+
+def test_gen_ko_jobs_only_flagged_rows():
+    choices = ["A", "B", "C", "D", "E"]
+    rows = [
+        {"id": 1, "type": "cr", "q_number": 1, "question": "Q1", "choices": choices, "answer": "B",
+         "explanation": GOOD_KO},
+        {"id": 2, "type": "cr", "q_number": 2, "question": "Q2", "choices": choices, "answer": "B",
+         "explanation": ""},
+        {"id": 3, "type": "cr", "q_number": 3, "question": "Q3", "choices": choices, "answer": "B",
+         "explanation": "The answer is B because the premise supports the conclusion directly."},
+        {"id": 4, "type": "cr", "q_number": 4, "question": "Q4", "choices": choices[:3], "answer": "B",
+         "explanation": ""},
+    ]
+    jobs = gen_ko_jobs([from_db_row(row) for row in rows])
+    assert [job.text.split("\n")[0] for job in jobs] == ["Q2", "Q3"]
+    assert [route(j.stage, j.question_type, j.text, j.quality_score).model for j in jobs] == ["gpt-4o-mini", "gpt-4o"]
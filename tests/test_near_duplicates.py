@@ -0,0 +1,45 @@
+import near_duplicates
+from near_duplicates import DuplicateGuard, NearDuplicateIndex
+
+STIMULUS = ("Economist: Raising the minimum wage in the region will not reduce employment, because "
+            "businesses there have historically absorbed higher labor costs through modest price "
+            "increases rather than layoffs, and consumer demand has remained strong for a decade. ")
+WEAKENS = STIMULUS + "Which one of the following, if true, most weakens the economist's argument?"
+STRENGTHENS = STIMULUS + "Which one of the following, if true, most strengthens the economist's argument?"
+WEAKEN_CHOICES = [
+    "Many regional businesses now operate on much thinner margins than in the past decade.",
+    "Automation has recently become cheaper than hiring entry-level staff in the region.",
+    "Consumer demand in the region is expected to fall sharply next year.",
+    "Neighboring regions that raised wages saw employment drop significantly.",
+    "Most price increases in the past were driven by rising material costs.",
+]
+STRENGTHEN_CHOICES = [
+    "Regional businesses report record profits and growing cash reserves this year.",
+    "Surveys show consumers would accept small price increases without buying less.",
+    "Previous wage increases in the region were larger than the one now proposed.",
+    "Employers in the region cite staff turnover as their largest avoidable cost.",
+    "Similar regions that raised wages saw no change in employment levels.",
+]
+
+
+def test_same_stimulus_different_question_is_uploaded(monkeypatch):
+    monkeypatch.setattr(near_duplicates, "SKIP_NEAR_DUPLICATES", False)
+    guard = DuplicateGuard(NearDuplicateIndex())
+    assert not guard.should_skip("LSAT 1번", WEAKENS, WEAKEN_CHOICES)
+    assert not guard.should_skip("LSAT 2번", STRENGTHENS, STRENGTHEN_CHOICES)
+    assert not guard.skipped
+
+
+def test_default_reports_instead_of_skipping(monkeypatch):
+    monkeypatch.setattr(near_duplicates, "SKIP_NEAR_DUPLICATES", False)
+    guard = DuplicateGuard(NearDuplicateIndex())
+    assert not guard.should_skip("LSAT 1번", WEAKENS, WEAKEN_CHOICES)
+    assert not guard.should_skip("LSAT 1번 재업로드", WEAKENS, WEAKEN_CHOICES)
+    assert [m.other for m in guard.reported] == ["LSAT 1번"]
+
+
+def test_skip_only_when_enabled(monkeypatch):
+    monkeypatch.setattr(near_duplicates, "SKIP_NEAR_DUPLICATES", True)
+    guard = DuplicateGuard(NearDuplicateIndex())
+    assert not guard.should_skip("LSAT 1번", WEAKENS, WEAKEN_CHOICES)
+    assert guard.should_skip("LSAT 1번 재업로드", WEAKENS, WEAKEN_CHOICES)
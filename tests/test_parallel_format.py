@@ -0,0 +1,54 @@
+import parallel_format
+from parallel_format import run_parallel_format
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+class Reply:
+    def __init__(self, text):
+        message = type("Message", (), {"content": text})
+        self.choices = [type("Choice", (), {"message": message})]
+
+
+def run(tmp_path, monkeypatch, errors):
+    """acreate 가 errors 를 차례로 던진 뒤 응답하는 가짜로 문제 하나를 정리"""
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(parallel_format.asyncio, "sleep", no_sleep)
+    calls = []
+
+    async def acreate(**request):
+        calls.append(request)
+        if errors:
+            raise errors.pop(0)
+        return Reply("formatted")
+
+    stats = run_parallel_format(
+        [("1.", "content")],
+        build_request=lambda num, content: {"messages": [{"role": "user", "content": content}]},
+        validate=lambda num, text: text,
+        acreate=acreate,
+        output_file=str(tmp_path / "out.txt"),
+        rpm=0,
+        cache_dir=str(tmp_path / "cache"),
+    )
+    return stats, calls
+
+
+def test_retries_rate_limit(tmp_path, monkeypatch):
+    stats, calls = run(tmp_path, monkeypatch, [RateLimitError()])
+    assert len(calls) == 2
+    assert stats.formatted == 1 and not stats.failed
+
+
+def test_does_not_retry_bad_request(tmp_path, monkeypatch):
+    stats, calls = run(tmp_path, monkeypatch, [BadRequestError()])
+    assert len(calls) == 1
+    assert stats.failed == ["1."]
@@ -0,0 +1,21 @@
+from question_analytics import collect
+from storage.local import LocalClient
+
+
+def test_first_attempt_by_submission_time_and_normalized_choices():
+    client = LocalClient(":memory:")
+    # 복원처럼 나중에 제출한 재풀이가 먼저 insert 됨
+    client.table("user_answers").insert([
+        {"user_id": "u1", "question_id": "q1", "user_answer": 2, "is_correct": True,
+         "submitted_at": "2026-01-02T00:00:00+00:00"},
+        {"user_id": "u1", "question_id": "q1", "user_answer": "C", "is_correct": False,
+         "submitted_at": "2026-01-01T00:00:00+00:00"},
+        {"user_id": "u2", "question_id": "q1", "user_answer": "3", "is_correct": False,
+         "submitted_at": "2026-01-01T00:00:00+00:00"},
+        {"user_id": "u3", "question_id": "q1", "user_answer": "(a)", "is_correct": False,
+         "submitted_at": "2026-01-01T00:00:00+00:00"},
+    ]).execute()
+
+    tally = collect(client, page_size=2)["q1"]
+    assert sorted(tally.responses) == [("u1", False), ("u2", False), ("u3", False)]
+    assert dict(tally.choices) == {"A": 1, "C": 2}
@@ -0,0 +1,20 @@
+import question_catalog
+from question_catalog import QuestionCatalog
+from storage.local import LocalClient
+
+
+def test_refresh_loads_past_single_select_cap(monkeypatch):
+    # 키보드는 telegram 객체라 테스트에서는 선택지 수만 기록
+    monkeypatch.setattr(question_catalog, "build_keyboard", lambda choice_count: choice_count)
+    client = LocalClient(":memory:")
+    client.table("questions").insert([
+        {"type": "cr", "question_number": 1200 - i, "question": f"Q{i}", "choices": list("ABCDE"), "answer": "A"}
+        for i in range(1200)
+    ]).execute()
+
+    catalog = QuestionCatalog(client)
+    catalog.refresh()
+
+    assert len(catalog.all()) == 1200
+    assert [q["question_number"] for q in catalog.all()[:3]] == [1, 2, 3]
+    assert catalog.by_number(1100)["question"] == "Q100"
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from review_scheduler import REVIEW_TABLE, ReviewScheduler, _parse_time
+from storage.local import LocalClient
+
+USER = "u1"
+
+
+@pytest.fixture
+def client():
+    return LocalClient(":memory:")
+
+
+def insert_answer(client, question_id, is_correct, submitted_at):
+    # bot.py / practice_session.py 처럼 답안을 먼저 insert 한 뒤 record_answer 를 호출
+    client.table("user_answers").insert({
+        "user_id": USER,
+        "question_id": question_id,
+        "is_correct": is_correct,
+        "started_at": (submitted_at - timedelta(seconds=60)).astimezone().isoformat(),
+        "submitted_at": submitted_at.astimezone().isoformat(),
+    }).execute()
+
+
+def answer(client, scheduler, question_id, is_correct, submitted_at):
+    insert_answer(client, question_id, is_correct, submitted_at)
+    return scheduler.record_answer(USER, question_id, is_correct, submitted_at - timedelta(seconds=60), submitted_at)
+
+
+def test_first_answer_is_applied_once(client):
+    item = answer(client, ReviewScheduler(client), "q1", False, datetime.now())
+    assert item.ease_factor == pytest.approx(1.96)
+    assert item.repetitions == 0
+
+
+def test_seed_excludes_answer_being_recorded(client):
+    now = datetime.now()
+    insert_answer(client, "q1", False, now - timedelta(days=2))
+    insert_answer(client, "q1", True, now - timedelta(days=1))
+
+    # 스케줄 행이 없는 유저 (재시작 직후) → 기록 재생 + 새 답안은 한 번만 반영
+    item = answer(client, ReviewScheduler(client), "q1", True, now)
+    assert item.repetitions == 2
+    assert item.interval_days == 6
+
+    rows = client.table(REVIEW_TABLE).select("*").eq("user_id", USER).execute().data
+    assert len(rows) == 1
+    assert rows[0]["repetitions"] == 2
+
+
+def test_restart_with_schedule_rows_does_not_replay(client):
+    now = datetime.now()
+    answer(client, ReviewScheduler(client), "q1", False, now - timedelta(days=1))
+    item = answer(client, ReviewScheduler(client), "q1", True, now)
+    # 틀림(1.96) → 빠르게 맞힘(+0.1), 재시작해도 첫 답안은 다시 반영되지 않음
+    assert item.repetitions == 1
+    assert item.ease_factor == pytest.approx(2.06)
+
+
+def test_parse_time_converts_utc_to_local():
+    local = datetime.now().replace(microsecond=0)
+    utc = local.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+    assert _parse_time(utc) == local
+    assert _parse_time(local) == local
+
+
+def test_next_due_uses_local_time(client):
+    scheduler = ReviewScheduler(client)
+    now = datetime.now()
+    answer(client, scheduler, "q1", False, now - timedelta(days=1, minutes=1))
+    assert scheduler.next_due(USER, now).question_id == "q1"
+    assert scheduler.next_due(USER, now - timedelta(minutes=2)) is None
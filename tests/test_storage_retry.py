@@ -0,0 +1,89 @@
+import pytest
+
+import storage.client as storage_client
+from storage.client import ResilientClient
+
+
+class FakeBuilder:
+    """postgrest 빌더 흉내: execute() 가 errors 를 차례로 던진 뒤 성공"""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def insert(self, *args, **kwargs):
+        return self
+
+    def upsert(self, *args, **kwargs):
+        return self
+
+    def eq(self, *args, **kwargs):
+        return self
+
+    def execute(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class FakeRaw:
+    def __init__(self, builder):
+        self.builder = builder
+
+    def table(self, name):
+        return self.builder
+
+    def rpc(self, fn, params):
+        return self.builder
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(storage_client.time, "sleep", lambda _: None)
+
+
+def make_client(errors):
+    builder = FakeBuilder(errors)
+    client = ResilientClient("http://test", "key")
+    client._raw = FakeRaw(builder)
+    return client, builder
+
+
+def test_select_retries_timeout():
+    client, builder = make_client([TimeoutError("read timeout")])
+    assert client.table("questions").select("*").eq("id", 1).execute() == "ok"
+    assert builder.calls == 2
+
+
+def test_upsert_retries_timeout():
+    client, builder = make_client([TimeoutError("read timeout")])
+    assert client.table("questions").upsert({"id": 1}).execute() == "ok"
+    assert builder.calls == 2
+
+
+def test_insert_is_not_retried_after_read_timeout():
+    client, builder = make_client([TimeoutError("read timeout")])
+    with pytest.raises(TimeoutError):
+        client.table("user_answers").insert({"user_id": "u"}).execute()
+    assert builder.calls == 1
+
+
+def test_insert_retries_when_request_was_not_sent():
+    client, builder = make_client([ConnectionRefusedError("refused")])
+    assert client.table("user_answers").insert({"user_id": "u"}).execute() == "ok"
+    assert builder.calls == 2
+
+
+def test_rpc_retry_depends_on_idempotency():
+    client, builder = make_client([TimeoutError("read timeout")])
+    assert client.rpc("sync_answers_by_q_number", {"payload": []}).execute() == "ok"
+    assert builder.calls == 2
+
+    client, builder = make_client([TimeoutError("read timeout")])
+    with pytest.raises(TimeoutError):
+        client.rpc("record_something", {}).execute()
+    assert builder.calls == 1
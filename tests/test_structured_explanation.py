@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from structured_explanation import ExplanationFormatError, parse_explanation
+
+KOREAN = "(B)는 결론의 전제를 직접 뒷받침하므로 논지를 가장 강화하는 보기입니다."
+ENGLISH = "Choice B directly supports the premise, so it strengthens the argument the most."
+
+
+def reply(**overrides):
+    return json.dumps({"answer": "B", "korean": KOREAN, "english": ENGLISH, **overrides}, ensure_ascii=False)
+
+
+def test_accepts_choice_wording_and_short_text():
+    assert parse_explanation(reply(), "B") == {"korean": KOREAN, "english": ENGLISH}
+    # 길이/태그 같은 품질 규칙은 재요청 사유가 아님
+    short = "B가 전제를 보강하는 보기입니다."
+    assert parse_explanation(reply(korean=short), "B")["korean"] == short
+
+
+@pytest.mark.parametrize("overrides, answer", [
+    ({"answer": "C"}, "B"),
+    ({"korean": ENGLISH}, "B"),
+    ({"english": KOREAN}, "B"),
+    ({"english": ""}, "B"),
+])
+def test_rejects_schema_answer_and_language_errors(overrides, answer):
+    with pytest.raises(ExplanationFormatError):
+        parse_explanation(reply(**overrides), answer)
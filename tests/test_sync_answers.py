@@ -0,0 +1,51 @@
+import pytest
+
+from storage import get_client
+from storage.local import LocalClient
+
+
+def seed(client):
+    client.table("questions").insert([
+        {"type": "LSAT", "q_number": 1000, "answer": "A"},
+        {"type": "LSAT", "q_number": 1001, "answer": None},
+        {"type": "LSAT", "q_number": 1002, "answer": "B"},
+        {"type": "cr", "q_number": 1000, "answer": "A"},
+    ]).execute()
+
+
+def answers(client, question_type):
+    rows = client.table("questions").select("q_number, answer").eq("type", question_type).execute().data
+    return {row["q_number"]: row["answer"] for row in rows}
+
+
+def test_rpc_matches_sql_semantics():
+    client = LocalClient(":memory:")
+    seed(client)
+    payload = [
+        {"q_number": 1000, "answer": "C"},    # 변경
+        {"q_number": "1001", "answer": "D"},  # NULL → 값 (IS DISTINCT FROM), 문자열 q_number 도 ::integer 처럼 처리
+        {"q_number": 1002, "answer": "B"},    # 같음 → 갱신 안 함
+        {"q_number": 1003, "answer": "E"},    # 없는 문제
+    ]
+    updated = client.rpc("sync_answers_by_q_number", {"payload": payload, "question_type": "LSAT"}).execute().data
+    assert updated == 2
+    assert answers(client, "LSAT") == {1000: "C", 1001: "D", 1002: "B"}
+    assert answers(client, "cr") == {1000: "A"}
+
+    again = client.rpc("sync_answers_by_q_number", {"payload": payload, "question_type": "LSAT"}).execute().data
+    assert again == 0
+
+
+@pytest.mark.parametrize("use_upsert", [False, True])
+def test_update_answers_syncs_and_verifies(tmp_path, use_upsert):
+    import upload_lsat_to_supabase
+
+    client = get_client(service_role=True)
+    client.table("questions").delete().neq("id", "").execute()
+    seed(client)
+    answers_file = tmp_path / "answers.txt"
+    answers_file.write_text("1. C\n2. D\n3. B\n", encoding="utf-8")
+
+    assert upload_lsat_to_supabase.update_answers(str(answers_file), 1000, use_upsert=use_upsert)
+    assert answers(client, "LSAT") == {1000: "C", 1001: "D", 1002: "B"}
+    assert answers(client, "cr") == {1000: "A"}
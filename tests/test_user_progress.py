@@ -0,0 +1,66 @@
+import random
+
+from storage.local import LocalClient
+from user_progress import PROGRESS_TABLE, backfill
+
+
+def progress_rows(client):
+    rows = client.table(PROGRESS_TABLE).select("*").execute().data
+    return sorted(({k: v for k, v in row.items() if k not in ("id", "updated_at")} for row in rows),
+                  key=lambda r: (r["user_id"], r["question_type"]))
+
+
+def test_backfill_matches_insert_trigger():
+    client = LocalClient(":memory:")
+    rng = random.Random(1)
+    questions = client.table("questions").insert(
+        [{"type": rng.choice(["cr", "LSAT"]), "question_number": i} for i in range(20)]).execute().data
+    for i in range(300):
+        client.table("user_answers").insert({
+            "user_id": f"u{rng.randint(1, 4)}",
+            "question_id": rng.choice(questions)["id"],
+            "is_correct": rng.random() < 0.6,
+            "submitted_at": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}",
+        }).execute()
+
+    # 트리거가 답안마다 갱신한 값 == 페이지 단위 백필로 다시 계산한 값
+    expected = progress_rows(client)
+    client.table(PROGRESS_TABLE).delete().neq("user_id", "").execute()
+    backfill(client, page_size=37)
+    assert progress_rows(client) == expected
+    assert len(expected) == 12
+
+
+def test_backfill_folds_answers_in_submission_order():
+    # snapshot 복원처럼 id 순서가 제출 순서와 다른 경우에도 트리거(제출 순서)와 같은 값
+    rng = random.Random(2)
+    answers = [{
+        "user_id": f"u{rng.randint(1, 3)}",
+        "is_correct": rng.random() < 0.6,
+        "submitted_at": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}+00:00",
+        "question": rng.randrange(10),
+    } for i in range(200)]
+
+    def load(client, rows):
+        questions = client.table("questions").insert(
+            [{"type": "cr" if i % 2 else "LSAT", "question_number": i} for i in range(10)]).execute().data
+        for row in rows:
+            client.table("user_answers").insert({
+                **{k: v for k, v in row.items() if k != "question"},
+                "question_id": questions[row["question"]]["id"],
+            }).execute()
+
+    def comparable(client):
+        # 두 저장소의 문제 id 가 다르므로 마지막 문제는 번호로 비교
+        numbers = {q["id"]: q["question_number"] for q in client.table("questions").select("*").execute().data}
+        return [{**row, "last_question_id": numbers[row["last_question_id"]]} for row in progress_rows(client)]
+
+    in_order = LocalClient(":memory:")
+    load(in_order, answers)
+    expected = comparable(in_order)
+
+    restored = LocalClient(":memory:")
+    load(restored, rng.sample(answers, len(answers)))
+    restored.table(PROGRESS_TABLE).delete().neq("user_id", "").execute()
+    backfill(restored, page_size=50)
+    assert comparable(restored) == expected
@@ -1,5 +1,7 @@
 import os
-from supabase import create_client, Client
+import argparse
+from storage import get_client, bulk_update, print_summary
+from storage.bulk import DEFAULT_PAGE_SIZE
 from dotenv import load_dotenv
 
 # 환경 변수 로드
@@ -9,11 +11,47 @@ load_dotenv()
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_SERVICE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
 
-def update_answers_to_text():
+# 변환 매핑 (integer → text)
+ANSWER_MAPPING = {
+    0: 'A',
+    1: 'B',
+    2: 'C',
+    3: 'D',
+    4: 'E'
+}
+
+def answer_to_text(question):
+    """한 문제의 answer 변경분을 계산합니다 (변경 없으면 None)"""
+    question_number = question['question_number']
+    current_answer = question['answer']
+
+    # 이미 A-E 형태인 경우 스킵
+    if isinstance(current_answer, str) and current_answer in ANSWER_MAPPING.values():
+        return None
+
+    # integer이거나 문자열 숫자인 경우 변환
+    answer_value = None
+
+    # 정수인 경우
+    if isinstance(current_answer, int) and current_answer in ANSWER_MAPPING:
+        answer_value = current_answer
+    # 문자열 숫자인 경우 ("0", "1", "2", "3", "4")
+    elif isinstance(current_answer, str) and current_answer.isdigit():
+        int_value = int(current_answer)
+        if int_value in ANSWER_MAPPING:
+            answer_value = int_value
+
+    if answer_value is None:
+        print(f"  ⚠️  문제 {question_number}: 예상치 못한 answer 값 - {current_answer}")
+        return None
+
+    return {'answer': ANSWER_MAPPING[answer_value]}
+
+def update_answers_to_text(dry_run=False, use_rpc=False, page_size=DEFAULT_PAGE_SIZE):
     """기존 데이터의 answer 값을 integer에서 text로 변환"""
     
     print("=" * 60)
-    print("🔄 Answer 값 업데이트: integer → text")
+    print("🔄 Answer 값 업데이트: integer → text" + (" (dry-run)" if dry_run else ""))
     print("=" * 60)
     
     # 환경 변수 확인
@@ -29,88 +67,32 @@ def update_answers_to_text():
     print(f"   URL: {SUPABASE_URL}")
     
     # Supabase 클라이언트 생성
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+    supabase = get_client(service_role=True)
     
     try:
-        # 1. 기존 CR 문제들 조회 (type='cr'인 것들만)
-        print("\n📋 기존 CR 문제 데이터 조회 중...")
-        result = supabase.table('questions').select('id, question_number, answer, type').eq('type', 'cr').order('question_number').execute()
+        # 1~2. CR 문제(type='cr')를 페이지 단위로 읽으며 변환 후 배치 기록
+        print("\n🔄 Answer 값 업데이트 시작...")
+        result = bulk_update(
+            supabase, 'questions', answer_to_text,
+            filters=[('eq', 'type', 'cr')],
+            page_size=page_size,
+            mode='rpc' if use_rpc else 'upsert',
+            rpc_name='bulk_update_questions',
+            dry_run=dry_run,
+            label=lambda q: f"문제 {q['question_number']}",
+        )
         
-        if not result.data:
+        if not result.scanned:
             print("❌ CR 문제 데이터를 찾을 수 없습니다.")
             return
         
-        questions = result.data
-        print(f"✅ {len(questions)}개 CR 문제 발견")
-        
-        # 변환 매핑 (integer → text)
-        answer_mapping = {
-            0: 'A',
-            1: 'B', 
-            2: 'C',
-            3: 'D',
-            4: 'E'
-        }
-        
-        # 2. 각 문제의 answer 값 업데이트
-        print("\n🔄 Answer 값 업데이트 시작...")
-        updated_count = 0
-        error_count = 0
-        
-        for question in questions:
-            question_id = question['id']
-            question_number = question['question_number']
-            current_answer = question['answer']
-            
-            # 이미 A-E 형태인 경우 스킵
-            if isinstance(current_answer, str) and current_answer in ['A', 'B', 'C', 'D', 'E']:
-                print(f"  ⏭️  문제 {question_number}: 이미 text 형태 (answer: {current_answer})")
-                continue
-            
-            # integer이거나 문자열 숫자인 경우 변환
-            answer_value = None
-            
-            # 정수인 경우
-            if isinstance(current_answer, int) and current_answer in answer_mapping:
-                answer_value = current_answer
-            # 문자열 숫자인 경우 ("0", "1", "2", "3", "4")
-            elif isinstance(current_answer, str) and current_answer.isdigit():
-                int_value = int(current_answer)
-                if int_value in answer_mapping:
-                    answer_value = int_value
-            
-            if answer_value is not None:
-                new_answer = answer_mapping[answer_value]
-                
-                try:
-                    # 업데이트 실행
-                    update_result = supabase.table('questions').update({
-                        'answer': new_answer
-                    }).eq('id', question_id).execute()
-                    
-                    if update_result.data:
-                        print(f"  ✅ 문제 {question_number}: {current_answer} → {new_answer}")
-                        updated_count += 1
-                    else:
-                        print(f"  ❌ 문제 {question_number}: 업데이트 실패")
-                        error_count += 1
-                        
-                except Exception as e:
-                    print(f"  ❌ 문제 {question_number}: 오류 - {e}")
-                    error_count += 1
-                    
-            else:
-                print(f"  ⚠️  문제 {question_number}: 예상치 못한 answer 값 - {current_answer}")
-                error_count += 1
-        
         # 3. 결과 요약
-        print("\n" + "=" * 60)
-        print("📊 업데이트 완료!")
-        print("=" * 60)
-        print(f"총 문제 수: {len(questions)}개")
-        print(f"업데이트 성공: {updated_count}개")
-        print(f"스킵/오류: {error_count}개")
-        print(f"성공률: {updated_count/len(questions)*100:.1f}%")
+        print_summary(result, dry_run)
+        if dry_run:
+            return
+        if result.changed:
+            # 변경이 필요 없던 행은 실패가 아니므로 변경 대상 기준으로 계산
+            print(f"성공률: {result.written/result.changed*100:.1f}% ({result.written}/{result.changed})")
         
         # 4. 업데이트 검증
         print("\n🔍 업데이트 검증 중...")
@@ -130,7 +112,12 @@ def update_answers_to_text():
         print(f"\n❌ 오류가 발생했습니다: {e}")
 
 def main():
-    update_answers_to_text()
+    parser = argparse.ArgumentParser(description="questions.answer 값을 A~E 텍스트로 변환")
+    parser.add_argument("--dry-run", action="store_true", help="기록하지 않고 변경 예정 diff만 출력")
+    parser.add_argument("--rpc", action="store_true", help="bulk_update_questions RPC로 기록")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="페이지 크기")
+    args = parser.parse_args()
+    update_answers_to_text(dry_run=args.dry_run, use_rpc=args.rpc, page_size=args.page_size)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,6 +1,10 @@
+import argparse
 import os
 import re
-from supabase import create_client
+import time
+from near_duplicates import DuplicateGuard
+from question_bank import AnswerKey, merge_answers
+from storage import get_client, iter_rows
 from dotenv import load_dotenv
 
 # 환경 변수 로드
@@ -10,12 +14,7 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")  # 서비스 롤 키 사용
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    print("❌ Supabase 환경 변수가 설정되지 않았습니다.")
-    print("   .env 파일에 SUPABASE_URL과 SUPABASE_SERVICE_ROLE_KEY를 추가하세요.")
-    exit(1)
-
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase = get_client(service_role=True)
 
 def parse_lsat_file(file_path):
     """LSAT 파일을 파싱하여 문제별로 분리합니다."""
@@ -75,10 +74,15 @@ def upload_to_supabase(problems, start_q_number=1000):
     
     success_count = 0
     error_count = 0
+    guard = DuplicateGuard.from_table(supabase)
     
     for i, problem in enumerate(problems):
         q_number = start_q_number + i
         
+        # 이미 올라간 문제와 본문 + 보기가 거의 같으면 경고 (SKIP_NEAR_DUPLICATES=1 이면 건너뜀, q_number 는 비워둠)
+        if guard.should_skip(f"LSAT {problem['number']}번", problem['passage'], problem['choices']):
+            continue
+        
         try:
             # Supabase에 삽입할 데이터
             question_data = {
@@ -107,56 +111,102 @@ def upload_to_supabase(problems, start_q_number=1000):
     print(f"\n=== 업로드 완료 ===")
     print(f"성공: {success_count}개")
     print(f"실패: {error_count}개")
+    guard.print_summary()
     
     return success_count, error_count
 
-def update_answers(answers_file, start_q_number=1000):
-    """답안 파일을 읽어서 Supabase의 answer 필드를 업데이트합니다."""
-    
+def update_answers(answers_file, start_q_number=1000, dry_run=False, use_upsert=False):
+    """답안 파일을 읽어서 Supabase의 answer 필드를 한 번에 동기화합니다.
+
+    업로드된 LSAT 행(q_number = start_q_number + 문제 번호 - 1)과 정답 키를 번호로 조인해
+    답안 없는 문제 / 문제 없는 답안을 먼저 보고하고, (q_number, answer) 쌍 전체를
+    sync_answers_by_q_number RPC 한 번(use_upsert=True 이면 id 기준 upsert 한 번)으로 보낸 뒤
+    다시 읽어서 정답이 모두 반영됐는지 개수를 확인합니다.
+    """
+    key = AnswerKey.from_file(answers_file)
+    if not key:
+        print(f"❌ 답안 파일에서 답안을 찾을 수 없습니다: {answers_file}")
+        return False
+    
+    print(f"\n=== 답안 동기화 시작 ({key.describe()}) ===")
+    
+    records = _load_lsat_rows(start_q_number, columns='*' if use_upsert else 'id, q_number, answer')
+    merge = merge_answers(records, key)
+    merge.print_report("LSAT 답안 ⋈ 업로드된 문제")
+    
+    by_number = {record['number']: record for record in records}
+    matched = [by_number[number] for number in merge.matched]
+    for number in merge.changed[:20]:
+        record = by_number[number]
+        print(f"  📝 q_number {record['q_number']}: {record['row'].get('answer')!r} → {record['answer']!r}")
+    
+    if dry_run:
+        print(f"\n🔎 dry-run: 변경 예정 {len(merge.changed)}개 (기록 안 함)")
+        return True
+    if not merge.changed:
+        print("\n✅ 모든 답안이 이미 최신입니다.")
+        return True
+    
+    started = time.perf_counter()
     try:
-        with open(answers_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        if use_upsert:
+            rows = [{**record['row'], 'answer': record['answer']} for record in matched]
+            supabase.table('questions').upsert(rows, on_conflict='id').execute()
+            updated = len(merge.changed)
+        else:
+            payload = [{'q_number': record['q_number'], 'answer': record['answer']} for record in matched]
+            updated = supabase.rpc('sync_answers_by_q_number',
+                                   {'payload': payload, 'question_type': 'LSAT'}).execute().data
     except Exception as e:
-        print(f"❌ 답안 파일 읽기 오류: {e}")
-        return
-    
-    # 답안 파싱
-    answer_pattern = r'(\d+)\.\s*([A-E])'
-    answers = re.findall(answer_pattern, content)
-    
-    print(f"\n=== 답안 업데이트 시작 ===")
-    
-    success_count = 0
-    error_count = 0
-    
-    for problem_num, answer in answers:
-        q_number = start_q_number + int(problem_num) - 1
-        
-        try:
-            # answer 필드 업데이트
-            result = supabase.table('questions').update({
-                'answer': answer
-            }).eq('q_number', q_number).execute()
-            
-            if result.data:
-                print(f"✅ q_number {q_number} 답안 '{answer}' 업데이트 성공")
-                success_count += 1
-            else:
-                print(f"❌ q_number {q_number} 답안 업데이트 실패")
-                error_count += 1
-                
-        except Exception as e:
-            print(f"❌ q_number {q_number} 답안 업데이트 오류: {e}")
-            error_count += 1
+        print(f"❌ 답안 동기화 오류: {e}")
+        return False
+    print(f"📤 요청 1회로 {len(matched)}쌍 전송, 갱신 {updated}행 ({time.perf_counter() - started:.2f}초)")
     
-    print(f"\n=== 답안 업데이트 완료 ===")
-    print(f"성공: {success_count}개")
-    print(f"실패: {error_count}개")
+    return verify_answers(key, start_q_number, expected=len(matched))
+
+
+def _load_lsat_rows(start_q_number, columns):
+    """업로드된 LSAT 행 → merge_answers 용 레코드 (number 는 답안 파일의 문제 번호)"""
+    records = []
+    for row in iter_rows(supabase, 'questions', columns=columns,
+                         filters=[('eq', 'type', 'LSAT'), ('gte', 'q_number', start_q_number)]):
+        records.append({'number': row['q_number'] - start_q_number + 1, 'q_number': row['q_number'],
+                        'answer': row.get('answer'), 'row': row})
+    return records
+
+
+def verify_answers(key, start_q_number, expected):
+    """동기화 후 DB 답안이 정답 키와 일치하는 행 수를 확인합니다"""
+    records = _load_lsat_rows(start_q_number, columns='id, q_number, answer')
+    wrong = [record['q_number'] for record in records
+             if record['number'] in key and record['answer'] != key.get(record['number'])]
+    correct = sum(1 for record in records if record['number'] in key) - len(wrong)
+    
+    mark = "✅" if correct == expected and not wrong else "❌"
+    print(f"{mark} 검증: 정답 키와 일치 {correct}/{expected}행")
+    if wrong:
+        print(f"  불일치 q_number: {', '.join(str(n) for n in wrong[:20])}")
+    return not wrong and correct == expected
+
+
+def sync_answers_main():
+    parser = argparse.ArgumentParser(description="LSAT 답안 파일 → questions.answer 일괄 동기화")
+    parser.add_argument("--answers", default='questionbank/lsat/answers.txt', help="답안 파일")
+    parser.add_argument("--start", type=int, default=1000, help="1번 문제의 q_number")
+    parser.add_argument("--dry-run", action="store_true", help="기록하지 않고 변경 예정만 출력")
+    parser.add_argument("--upsert", action="store_true", help="RPC 대신 id 기준 upsert 한 번으로 기록")
+    args = parser.parse_args()
+    return update_answers(args.answers, args.start, dry_run=args.dry_run, use_upsert=args.upsert)
 
 def main():
     print("=" * 60)
     print("LSAT 문제 Supabase 업로드 스크립트")
     print("=" * 60)
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("❌ Supabase 환경 변수가 설정되지 않았습니다.")
+        print("   .env 파일에 SUPABASE_URL과 SUPABASE_SERVICE_ROLE_KEY를 추가하세요.")
+        return
     
     # 파일 경로
     lsat_file = 'questionbank/lsat/LSAT_02.txt'
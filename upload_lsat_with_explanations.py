@@ -1,28 +1,28 @@
 import os
 import re
-import openai
-from supabase import create_client
+from near_duplicates import DuplicateGuard
+from question_bank import AnswerKey, merge_answers
+from storage import get_client
+from structured_explanation import FORMAT_INSTRUCTIONS, ExplanationFormatError, request_explanation
 from dotenv import load_dotenv
+from llm_client import Budget, LLMClient
+from model_router import route
 
 # 환경 변수 로드
 load_dotenv()
 
 # OpenAI API 설정
-openai.api_key = os.getenv('OPENAI_API_KEY')
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
 # Supabase 설정
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
-if not openai.api_key:
-    print("❌ OPENAI_API_KEY가 설정되지 않았습니다.")
-    exit(1)
+supabase = get_client(service_role=True)
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    print("❌ Supabase 환경 변수가 설정되지 않았습니다.")
-    exit(1)
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+# 토큰/지연/비용 기록 + 예산 (LLM_BUDGET_*), openai 는 첫 호출 때 import (CLI 시작 속도)
+llm = LLMClient("upload-lsat-explain", api_key=OPENAI_API_KEY, budget=Budget.from_env())
 
 def parse_lsat_file(file_path):
     """LSAT 파일을 파싱하여 문제별로 분리합니다."""
@@ -76,7 +76,7 @@ def parse_lsat_file(file_path):
     return parsed_problems
 
 def generate_explanation_with_openai(question_data):
-    """OpenAI를 사용해서 문제 해설을 생성합니다."""
+    """OpenAI를 사용해서 문제 해설을 생성합니다. ({'korean', 'english'}, 실패 시 None)"""
     
     question = question_data['passage']
     choices = question_data['choices']
@@ -101,13 +101,9 @@ E) {choices[4] if len(choices) > 4 else ''}
 정답: {answer}
 정답 보기: {correct_choice}
 
-다음 형식으로 해설을 작성해주세요:
-
-[한국어 해설]
-(정답에 대한 상세한 설명과 논리적 근거, 오답들이 틀린 이유, 문제 해결 과정 등을 10줄 이내로 깊이 있게 설명)
-
-[English Explanation]
-(Detailed explanation of the correct answer with logical reasoning, why other options are incorrect, problem-solving process, etc. within 10 lines)
+다음 조건으로 해설을 작성해주세요:
+- korean: 정답에 대한 상세한 설명과 논리적 근거, 오답들이 틀린 이유, 문제 해결 과정 등을 10줄 이내로 깊이 있게 설명
+- english: Detailed explanation of the correct answer with logical reasoning, why other options are incorrect, problem-solving process, etc. within 10 lines
 
 중요한 점:
 1. 정답이 왜 맞는지 논리적으로 설명
@@ -116,52 +112,36 @@ E) {choices[4] if len(choices) > 4 else ''}
 4. 10줄 이내로 깊이 있는 내용으로 작성
 5. 국문과 영문 모두 동일한 수준의 상세함으로 작성
 
-해설:"""
+{FORMAT_INSTRUCTIONS}"""
 
+    r = route("upload-lsat-explain", "LSAT", question + "\n" + "\n".join(choices))
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[
+        return request_explanation(
+            llm.chat,
+            [
                 {"role": "system", "content": "당신은 LSAT 문제 해설 전문가입니다. 정답과 오답에 대한 깊이 있고 논리적인 해설을 제공하는 것이 목표입니다. 국문과 영문 모두 10줄 이내로 상세하게 설명하세요."},
                 {"role": "user", "content": prompt}
             ],
-            max_tokens=1500,
-            temperature=0.3
+            model=r.model,
+            answer=answer,
+            max_tokens=r.max_tokens,
         )
         
-        explanation = response.choices[0].message.content.strip()
-        return explanation
-        
+    except ExplanationFormatError as e:
+        print(f"❌ {e}")
+        return None
     except Exception as e:
         print(f"❌ OpenAI API 오류: {e}")
         return None
 
-def get_answers_from_file(answers_file):
-    """답안 파일에서 답안을 읽어옵니다."""
-    try:
-        with open(answers_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except Exception as e:
-        print(f"❌ 답안 파일 읽기 오류: {e}")
-        return {}
-    
-    # 답안 파싱
-    answer_pattern = r'(\d+)\.\s*([A-E])'
-    answers = re.findall(answer_pattern, content)
-    
-    answer_dict = {}
-    for problem_num, answer in answers:
-        answer_dict[int(problem_num)] = answer
-    
-    return answer_dict
-
-def upload_to_supabase_with_explanations(problems, answers_dict, start_q_number=1000):
+def upload_to_supabase_with_explanations(problems, start_q_number=1000):
     """파싱된 문제들을 해설과 함께 Supabase에 업로드합니다."""
     
     print(f"\n=== Supabase 업로드 시작 (q_number: {start_q_number}~{start_q_number + len(problems) - 1}) ===")
     
     success_count = 0
     error_count = 0
+    guard = DuplicateGuard.from_table(supabase)
     
     for i, problem in enumerate(problems):
         q_number = start_q_number + i
@@ -169,8 +149,12 @@ def upload_to_supabase_with_explanations(problems, answers_dict, start_q_number=
         
         print(f"\n처리 중: 문제 {problem_num} -> q_number {q_number}")
         
-        # 답안 가져오기
-        answer = answers_dict.get(problem_num, '')
+        # 이미 올라간 문제와 본문 + 보기가 거의 같으면 경고 (SKIP_NEAR_DUPLICATES=1 이면 해설 생성 전에 건너뜀)
+        if guard.should_skip(f"LSAT {problem_num}번", problem['passage'], problem['choices']):
+            continue
+        
+        # 답안 (main 에서 merge_answers 로 채움)
+        answer = problem.get('answer') or ''
         if not answer:
             print(f"⚠️ 문제 {problem_num} 답안을 찾을 수 없습니다.")
         
@@ -186,24 +170,9 @@ def upload_to_supabase_with_explanations(problems, answers_dict, start_q_number=
         
         if not explanation:
             print(f"  ❌ 해설 생성 실패, 기본 해설 사용")
-            explanation = f"[한국어 해설]\n정답: {answer}\n\n[English Explanation]\nAnswer: {answer}"
+            explanation = {'korean': "설명 생성 실패", 'english': "Explanation generation failed"}
         
         try:
-            # 해설을 한국어와 영문으로 분리
-            korean_explanation = ""
-            english_explanation = ""
-            
-            if explanation:
-                # [한국어 해설]과 [English Explanation] 부분 분리
-                if "[한국어 해설]" in explanation and "[English Explanation]" in explanation:
-                    parts = explanation.split("[English Explanation]")
-                    korean_explanation = parts[0].replace("[한국어 해설]", "").strip()
-                    english_explanation = parts[1].strip()
-                else:
-                    # 분리할 수 없으면 전체를 한국어로
-                    korean_explanation = explanation
-                    english_explanation = f"Answer: {answer}"
-            
             # Supabase에 삽입할 데이터 (올바른 스키마에 맞춤)
             question_data = {
                 'question_number': q_number,  # q_number -> question_number
@@ -211,8 +180,8 @@ def upload_to_supabase_with_explanations(problems, answers_dict, start_q_number=
                 'question': problem['passage'],
                 'choices': problem['choices'],  # (A) 뒷부분 텍스트만 저장
                 'answer': answer,
-                'explanation': korean_explanation,  # 한국어 해설
-                'explanation_en': english_explanation  # 영문 해설
+                'explanation': explanation['korean'],  # 한국어 해설
+                'explanation_en': explanation['english']  # 영문 해설
             }
             
             # Supabase에 삽입
@@ -232,6 +201,7 @@ def upload_to_supabase_with_explanations(problems, answers_dict, start_q_number=
     print(f"\n=== 업로드 완료 ===")
     print(f"성공: {success_count}개")
     print(f"실패: {error_count}개")
+    guard.print_summary()
     
     return success_count, error_count
 
@@ -240,6 +210,14 @@ def main():
     print("LSAT 문제 Supabase 업로드 + 해설 생성 스크립트")
     print("LSAT_03.txt 사용, type: cr")
     print("=" * 60)
+
+    if not OPENAI_API_KEY:
+        print("❌ OPENAI_API_KEY가 설정되지 않았습니다.")
+        return
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("❌ Supabase 환경 변수가 설정되지 않았습니다.")
+        return
     
     # 파일 경로
     lsat_file = 'questionbank/lsat/LSAT_03.txt'
@@ -257,12 +235,13 @@ def main():
     
     # 2. 답안 파일 읽기
     print(f"\n2. 답안 파일 읽기: {answers_file}")
-    answers_dict = get_answers_from_file(answers_file)
-    print(f"답안 수: {len(answers_dict)}개")
+    answer_key = AnswerKey.from_file(answers_file)
+    print(f"답안 수: {len(answer_key)}개")
+    merge_answers(problems, answer_key).print_report("LSAT 답안 ⋈ 파싱된 문제")
     
     # 3. Supabase 업로드 + 해설 생성
     print(f"\n3. Supabase 업로드 + 해설 생성")
-    success_count, error_count = upload_to_supabase_with_explanations(problems, answers_dict, start_q_number=1000)
+    success_count, error_count = upload_to_supabase_with_explanations(problems, start_q_number=1000)
     
     if success_count == 0:
         print("❌ 업로드에 실패했습니다.")
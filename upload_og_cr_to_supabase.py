@@ -5,32 +5,40 @@ import time
 import logging
 from datetime import datetime
 from typing import List, Dict, Optional
-import openai
-from supabase import create_client, Client
+from near_duplicates import DuplicateGuard
+from storage import get_client
+from structured_explanation import FORMAT_INSTRUCTIONS, ExplanationFormatError, request_explanation
 from dotenv import load_dotenv
-
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('upload_og_cr.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ],
-    encoding='utf-8'
-)
+from llm_client import Budget, LLMClient
+from model_router import route
 
 # 환경 변수 로드
 load_dotenv()
 
 # API 설정
-openai.api_key = os.getenv('OPENAI_API_KEY')
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_SERVICE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
 
+
+# 토큰/지연/비용 기록 + 예산 (LLM_BUDGET_*), openai 는 첫 호출 때 import (CLI 시작 속도)
+llm = LLMClient("upload-og", api_key=OPENAI_API_KEY, budget=Budget.from_env())
+
+def setup_logging():
+    """로그 파일은 업로드를 실제로 실행할 때만 생성합니다"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('upload_og_cr.log', encoding='utf-8'),
+            logging.StreamHandler()
+        ],
+        encoding='utf-8'
+    )
+
 class OGCRQuestionUploader:
     def __init__(self, start_question_number: int = 147):
-        self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        self.supabase = get_client(service_role=True)
         self.start_question_number = start_question_number
         self.uploaded_count = 0
         self.failed_count = 0
@@ -117,44 +125,35 @@ class OGCRQuestionUploader:
 정답: {answer}
 
 요구사항:
-1. 한국어 설명: 10줄 이내로 정답인 이유를 명확하게 설명
-2. 영어 설명: 10줄 이내로 정답인 이유를 명확하게 설명
-3. 형식은 반드시 다음과 같이 해주세요:
-
-KOR:
-[한국어 설명]
-
-ENG:
-[영어 설명]"""
+1. 한국어 설명(korean): 10줄 이내로 정답인 이유를 명확하게 설명
+2. 영어 설명(english): 10줄 이내로 정답인 이유를 명확하게 설명
+3. {FORMAT_INSTRUCTIONS}"""
 
+        r = route("upload-og", "cr", f"{question}\n{choices_text}")
         try:
-            logging.info(f"🤖 OpenAI API 호출 시작 (질문 {len(question)}자)")
+            logging.info(f"🤖 OpenAI API 호출 시작 (질문 {len(question)}자, {r.model}: {r.reason})")
 
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
+            explanations = request_explanation(
+                llm.chat,
+                [
                     {"role": "system", "content": "당신은 GMAT Critical Reasoning 문제 해설 전문가입니다."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=1000,
-                temperature=0.3
+                model=r.model,
+                answer=answer,
+                max_tokens=r.max_tokens,
+                log=logging.warning,
             )
+            logging.info(f"✅ OpenAI API 호출 성공 - 한국어 {len(explanations['korean'])}자 / 영어 {len(explanations['english'])}자")
+            return explanations
 
-            explanation_text = response.choices[0].message.content.strip()
-            logging.info(f"✅ OpenAI API 호출 성공 - 응답 길이: {len(explanation_text)}자")
-
-            # KOR/ENG 부분 분리
-            kor_match = re.search(r'KOR:\s*(.+?)(?=ENG:|$)', explanation_text, re.DOTALL)
-            eng_match = re.search(r'ENG:\s*(.+?)$', explanation_text, re.DOTALL)
-
-            explanation_kor = kor_match.group(1).strip() if kor_match else "설명 생성 실패"
-            explanation_eng = eng_match.group(1).strip() if eng_match else "Explanation generation failed"
-
+        except ExplanationFormatError as e:
+            self.openai_failures += 1
+            logging.error(f"❌ {e}")
             return {
-                'korean': explanation_kor,
-                'english': explanation_eng
+                'korean': "설명 생성 실패",
+                'english': "Explanation generation failed"
             }
-
         except Exception as e:
             self.openai_failures += 1
             logging.error(f"❌ OpenAI API 오류: {e}")
@@ -216,6 +215,9 @@ ENG:
         logging.info(f"\n🚀 {len(questions)}개 문제 업로드 시작...")
         logging.info("=" * 80)
 
+        # 이미 올라간 문제와 본문이 거의 같은 문제는 건너뜀 (해설 생성 비용도 절약)
+        guard = DuplicateGuard.from_table(self.supabase)
+
         for i, question_data in enumerate(questions, 1):
             current_question_number = self.start_question_number + i - 1
 
@@ -223,6 +225,11 @@ ENG:
             logging.info(f"원본 번호: {question_data['original_number']}번")
             logging.info(f"DB 번호: {current_question_number}")
 
+            if guard.should_skip(f"og 원본 {question_data['original_number']}번", question_data['question'],
+                                 question_data['choices']):
+                logging.warning(f"🧬 {question_data['original_number']}번 유사 문제로 건너뜀")
+                continue
+
             # 업로드 시도
             success = self.upload_question(question_data, current_question_number)
 
@@ -256,18 +263,23 @@ ENG:
         logging.info(f"   OpenAI 실패: {self.openai_failures}회")
         if len(questions) > 0:
             logging.info(f"   성공률: {self.uploaded_count/len(questions)*100:.1f}%")
+        if guard.reported:
+            logging.info(f"   유사 문제로 보고됨 (업로드함): {len(guard.reported)}개")
+        if guard.skipped:
+            logging.info(f"   유사 문제로 건너뜀: {len(guard.skipped)}개")
 
         if self.failed_count > 0:
             logging.warning(f"\n⚠️ {self.failed_count}개 문제가 실패했습니다.")
             logging.warning("upload_og_cr.log 파일을 확인하여 수동으로 재시도하거나 문제를 수정해주세요.")
 
 def main():
+    setup_logging()
     print("=" * 80)
     print("🎯 OG CR 문제 Supabase 업로드 스크립트")
     print("=" * 80)
 
     # 환경 변수 확인
-    if not openai.api_key:
+    if not OPENAI_API_KEY:
         print("❌ OPENAI_API_KEY가 설정되지 않았습니다.")
         print("   .env 파일에 OPENAI_API_KEY=sk-proj-... 형태로 추가하세요.")
         return
@@ -284,7 +296,7 @@ def main():
 
     print("✅ 모든 API 키 및 URL 확인 완료")
     print(f"   Supabase URL: {SUPABASE_URL}")
-    print(f"   OpenAI API Key: {openai.api_key[:20]}...")
+    print(f"   OpenAI API Key: {OPENAI_API_KEY[:20]}...")
     print(f"   Supabase Key: {SUPABASE_SERVICE_KEY[:20]}...")
 
     # OG CR 파일 확인
@@ -4,21 +4,29 @@ import json
 import time
 from datetime import datetime
 from typing import List, Dict, Optional
-import openai
-from supabase import create_client, Client
+from near_duplicates import DuplicateGuard
+from content_manifest import ContentManifest
+from storage import get_client
+from structured_explanation import FORMAT_INSTRUCTIONS, ExplanationFormatError, request_explanation
 from dotenv import load_dotenv
+from llm_client import Budget, LLMClient
+from model_router import route
 
 # 환경 변수 로드
 load_dotenv()
 
 # API 설정
-openai.api_key = os.getenv('OPENAI_API_KEY')
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_SERVICE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
 
+
+# 토큰/지연/비용 기록 + 예산 (LLM_BUDGET_*), openai 는 첫 호출 때 import (CLI 시작 속도)
+llm = LLMClient("upload-cr", api_key=OPENAI_API_KEY, budget=Budget.from_env())
+
 class CRQuestionUploader:
     def __init__(self):
-        self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        self.supabase = get_client(service_role=True)
         self.uploaded_count = 0
         self.failed_count = 0
         self.total_questions = 0
@@ -94,41 +102,29 @@ class CRQuestionUploader:
 정답: {answer_letter}
 
 요구사항:
-1. 한국어 설명: 3줄 이내로 정답인 이유를 명확하게 설명
-2. 영어 설명: 3줄 이내로 정답인 이유를 명확하게 설명
-3. 형식은 반드시 다음과 같이 해주세요:
-
-KOR:
-[한국어 설명]
-
-ENG:
-[영어 설명]"""
+1. 한국어 설명(korean): 3줄 이내로 정답인 이유를 명확하게 설명
+2. 영어 설명(english): 3줄 이내로 정답인 이유를 명확하게 설명
+3. {FORMAT_INSTRUCTIONS}"""
 
+        r = route("upload-cr", "cr", f"{question}\n{choices_text}")
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            return request_explanation(
+                llm.chat,
+                [
                     {"role": "system", "content": "당신은 GMAT Critical Reasoning 문제 해설 전문가입니다."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=500,
-                temperature=0.3
+                model=r.model,
+                answer=answer_letter,
+                max_tokens=r.max_tokens,
             )
             
-            explanation_text = response.choices[0].message.content.strip()
-            
-            # KOR/ENG 부분 분리
-            kor_match = re.search(r'KOR:\s*(.+?)(?=ENG:|$)', explanation_text, re.DOTALL)
-            eng_match = re.search(r'ENG:\s*(.+?)$', explanation_text, re.DOTALL)
-            
-            explanation_kor = kor_match.group(1).strip() if kor_match else "설명 생성 실패"
-            explanation_eng = eng_match.group(1).strip() if eng_match else "Explanation generation failed"
-            
+        except ExplanationFormatError as e:
+            print(f"❌ {e}")
             return {
-                'korean': explanation_kor,
-                'english': explanation_eng
+                'korean': "설명 생성 실패",
+                'english': "Explanation generation failed"
             }
-            
         except Exception as e:
             print(f"❌ OpenAI API 오류: {e}")
             return {
@@ -136,8 +132,8 @@ ENG:
                 'english': "An error occurred while generating explanation."
             }
     
-    def upload_question(self, question_data: Dict, question_number: int) -> bool:
-        """단일 문제를 Supabase에 업로드"""
+    def upload_question(self, question_data: Dict, question_number: int, existing_id: Optional[str] = None) -> bool:
+        """단일 문제를 Supabase에 업로드 (existing_id 가 있으면 그 행을 갱신, 저장된 id 는 question_data['db_id'])"""
         
         try:
             # OpenAI로 설명 생성
@@ -161,10 +157,14 @@ ENG:
                 'latex_formula': None
             }
             
-            # Supabase에 삽입
-            result = self.supabase.table('questions').insert(insert_data).execute()
+            # Supabase에 삽입 (이전에 올린 문제의 내용이 바뀐 경우에는 그 행을 갱신)
+            if existing_id:
+                result = self.supabase.table('questions').update(insert_data).eq('id', existing_id).execute()
+            else:
+                result = self.supabase.table('questions').insert(insert_data).execute()
             
             if result.data:
+                question_data['db_id'] = result.data[0].get('id', existing_id)
                 self.uploaded_count += 1
                 print(f"✅ {question_data['original_number']}번 문제 업로드 완료 (DB 번호: {question_number})")
                 print(f"   한국어 설명: {explanations['korean'][:100]}...")
@@ -186,14 +186,34 @@ ENG:
         print(f"\n🚀 {len(questions)}개 문제 업로드 시작...")
         print("=" * 80)
         
+        # 이미 올라간 문제와 본문이 거의 같은 문제는 건너뜀 (해설 생성 비용도 절약)
+        guard = DuplicateGuard.from_table(self.supabase)
+        # 마지막 업로드 이후 문제/보기/정답이 그대로인 문제는 해설 생성과 업로드를 건너뜀
+        manifest = ContentManifest("upload-cr")
+        
         for i, question_data in enumerate(questions, 1):
             print(f"\n📝 진행률: {i}/{len(questions)} ({i/len(questions)*100:.1f}%)")
             print(f"원본 번호: {question_data['original_number']}번")
             
+            key = question_data['original_number']
+            source = json.dumps([question_data['question'], question_data['choices'], question_data['answer']],
+                                ensure_ascii=False)
+            if manifest.is_current(key, source):
+                print("⏭️ 마지막 업로드 이후 변경 없음, 건너뜀")
+                continue
+            
+            # 이전에 올린 문제는 내용이 바뀌었으므로 자기 자신과의 유사 중복 검사는 생략하고 갱신
+            previous = manifest.get(key) or {}
+            if not previous.get('id') and guard.should_skip(f"cr 원본 {key}번", question_data['question'],
+                                                            question_data['choices']):
+                continue
+            
             # 업로드 시도
-            success = self.upload_question(question_data, i)
+            success = self.upload_question(question_data, i, existing_id=previous.get('id'))
             
             if success:
+                manifest.record(key, source, id=question_data.get('db_id'))
+                manifest.save()
                 print(f"✅ 성공")
             else:
                 print(f"❌ 실패")
@@ -217,6 +237,9 @@ ENG:
         print(f"   성공: {self.uploaded_count}개")
         print(f"   실패: {self.failed_count}개")
         print(f"   성공률: {self.uploaded_count/len(questions)*100:.1f}%")
+        guard.print_summary()
+        manifest.save()
+        manifest.print_report()
         
         if self.failed_count > 0:
             print(f"\n⚠️ {self.failed_count}개 문제가 실패했습니다.")
@@ -228,7 +251,7 @@ def main():
     print("=" * 80)
     
     # 환경 변수 확인
-    if not openai.api_key:
+    if not OPENAI_API_KEY:
         print("❌ OPENAI_API_KEY가 설정되지 않았습니다.")
         print("   .env 파일에 OPENAI_API_KEY=sk-proj-... 형태로 추가하세요.")
         return
@@ -245,7 +268,7 @@ def main():
     
     print("✅ 모든 API 키 및 URL 확인 완료")
     print(f"   Supabase URL: {SUPABASE_URL}")
-    print(f"   OpenAI API Key: {openai.api_key[:20]}...")
+    print(f"   OpenAI API Key: {OPENAI_API_KEY[:20]}...")
     print(f"   Supabase Key: {SUPABASE_SERVICE_KEY[:20]}...")
     
     # CR문제 파일 확인
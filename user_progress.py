@@ -0,0 +1,191 @@
+import argparse
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 📈 유저별 진척도 요약 (user_progress 테이블)
+# 답안 insert 시 user_progress.sql 의 트리거가 (유저, 유형) / (유저, 'all') 행을 갱신하므로
+# 봇은 user_answers 전체를 다시 세지 않고 행 하나만 읽습니다.
+# 트리거 설치 전 기록이나 어긋난 값은 backfill() 로 user_answers 에서 다시 계산합니다.
+
+PROGRESS_TABLE = "user_progress"
+ALL_TYPES = "all"
+
+ANSWER_COLUMNS = "id, user_id, question_id, is_correct, submitted_at, answered_at"
+
+
+def answer_time(row: Dict) -> Optional[datetime]:
+    """답안 제출 시각 (submitted_at → answered_at), 오프셋이 있으면 로컬 naive 시각으로 맞춤"""
+    value = row.get("submitted_at") or row.get("answered_at")
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def answer_sort_key(row: Dict):
+    """제출 시각 순, 같으면 id 순 (복원처럼 id 가 제출 순서가 아닌 경우에도 풀이 순서를 지킴)"""
+    return answer_time(row) or datetime.min, row.get("id") or 0
+
+
+@dataclass
+class UserProgress:
+    user_id: str
+    question_type: str = ALL_TYPES
+    answered: int = 0
+    attempts: int = 0
+    correct: int = 0
+    streak: int = 0
+    best_streak: int = 0
+    last_question_id: Optional[str] = None
+    last_answered_at: Optional[str] = None
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.attempts if self.attempts else 0.0
+
+    def apply(self, question_id: str, is_correct: bool, answered_at: Optional[str], is_new: bool) -> None:
+        """답안 하나를 반영합니다 (트리거와 같은 규칙)"""
+        self.answered += 1 if is_new else 0
+        self.attempts += 1
+        self.correct += 1 if is_correct else 0
+        self.streak = self.streak + 1 if is_correct else 0
+        self.best_streak = max(self.best_streak, self.streak)
+        self.last_question_id = question_id
+        self.last_answered_at = answered_at
+
+    def to_row(self) -> Dict:
+        return {
+            "user_id": self.user_id,
+            "question_type": self.question_type,
+            "answered": self.answered,
+            "attempts": self.attempts,
+            "correct": self.correct,
+            "streak": self.streak,
+            "best_streak": self.best_streak,
+            "last_question_id": self.last_question_id,
+            "last_answered_at": self.last_answered_at,
+            "updated_at": datetime.now().isoformat(),
+        }
+
+    @classmethod
+    def from_row(cls, row: Dict) -> "UserProgress":
+        return cls(
+            user_id=row["user_id"],
+            question_type=row.get("question_type") or ALL_TYPES,
+            answered=row.get("answered") or 0,
+            attempts=row.get("attempts") or 0,
+            correct=row.get("correct") or 0,
+            streak=row.get("streak") or 0,
+            best_streak=row.get("best_streak") or 0,
+            last_question_id=row.get("last_question_id"),
+            last_answered_at=row.get("last_answered_at"),
+        )
+
+
+def get_progress(supabase, user_id: str, question_type: str = ALL_TYPES) -> UserProgress:
+    """(유저, 유형) 진척도 행 하나를 읽습니다 (없으면 0)"""
+    rows = supabase.table(PROGRESS_TABLE) \
+        .select("*") \
+        .eq("user_id", user_id) \
+        .eq("question_type", question_type.lower()) \
+        .limit(1) \
+        .execute().data
+    return UserProgress.from_row(rows[0]) if rows else UserProgress(user_id, question_type.lower())
+
+
+def get_all_progress(supabase, user_id: str) -> List[UserProgress]:
+    """유저의 전체/유형별 진척도 행 (유형 수만큼의 작은 결과)"""
+    rows = supabase.table(PROGRESS_TABLE).select("*").eq("user_id", user_id).execute().data or []
+    return [UserProgress.from_row(row) for row in rows]
+
+
+def apply_answer(client, row: Dict) -> None:
+    """user_progress.sql 트리거와 같은 규칙으로 답안 하나를 반영합니다 (로컬 저장소의 AFTER INSERT 트리거가 호출)"""
+    if not row.get("question_id"):
+        return
+    question = client.table("questions").select("type").eq("id", row["question_id"]).limit(1).execute().data
+    qtype = ((question[0].get("type") if question else None) or "unknown").lower()
+    previous = client.table("user_answers").select("id") \
+        .eq("user_id", row["user_id"]).eq("question_id", row["question_id"]).limit(2).execute().data
+    answered_at = row.get("submitted_at") or row.get("answered_at") or datetime.now().isoformat()
+    for scope in (qtype, ALL_TYPES):
+        progress = get_progress(client, row["user_id"], scope)
+        progress.apply(row["question_id"], bool(row.get("is_correct")), answered_at, is_new=len(previous) <= 1)
+        client.table(PROGRESS_TABLE).upsert(progress.to_row(), on_conflict="user_id,question_type").execute()
+
+
+def compute_progress(answers: Iterable[Dict], question_types: Dict[str, str]) -> Dict[Tuple[str, str], UserProgress]:
+    """user_answers 행들로 (유저, 유형) 별 진척도를 계산합니다
+
+    연속 정답 / 마지막 풀이 / 첫 풀이는 제출 시각 순서로 접어야 하므로 행을 answer_sort_key 로 정렬합니다.
+    snapshot 복원처럼 청크를 병렬로 insert 하면 id 순서가 제출 순서와 다를 수 있습니다.
+    """
+    progress: Dict[Tuple[str, str], UserProgress] = {}
+    seen = set()
+    for row in sorted(answers, key=answer_sort_key):
+        user_id, question_id = row["user_id"], row.get("question_id")
+        if not question_id:
+            continue
+        qtype = (question_types.get(question_id) or "unknown").lower()
+        is_new = (user_id, question_id) not in seen
+        seen.add((user_id, question_id))
+        answered_at = row.get("submitted_at") or row.get("answered_at")
+        for scope in (qtype, ALL_TYPES):
+            key = (user_id, scope)
+            if key not in progress:
+                progress[key] = UserProgress(user_id, scope)
+            progress[key].apply(question_id, bool(row.get("is_correct")), answered_at, is_new)
+    return progress
+
+
+def _answer_rows(client, page_size: int) -> Iterator[Dict]:
+    from storage import iter_pages
+
+    read = 0
+    for page in iter_pages(client, "user_answers", columns=ANSWER_COLUMNS, page_size=page_size):
+        yield from page
+        read += len(page)
+        print(f"  … 답안 {read}개 읽음")
+
+
+def backfill(client, page_size: int = 1000, batch_size: int = 500, dry_run: bool = False) -> int:
+    """user_answers 를 페이지 단위로 읽고 제출 시각 순서로 집계해 user_progress 를 다시 채웁니다"""
+    from storage import iter_rows
+
+    question_types = {row["id"]: row.get("type") for row in iter_rows(client, "questions", columns="id, type")}
+
+    progress = compute_progress(_answer_rows(client, page_size), question_types)
+    users = {user_id for user_id, _ in progress}
+    print(f"📈 유저 {len(users)}명, 진척도 행 {len(progress)}개 계산")
+    if dry_run:
+        return len(progress)
+
+    rows = [p.to_row() for p in progress.values()]
+    for start in range(0, len(rows), batch_size):
+        client.table(PROGRESS_TABLE) \
+            .upsert(rows[start:start + batch_size], on_conflict="user_id,question_type") \
+            .execute()
+    print(f"💾 user_progress {len(rows)}행 기록 완료")
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="user_answers 기록으로 user_progress 다시 채우기")
+    parser.add_argument("--dry-run", action="store_true", help="계산만 하고 기록하지 않음")
+    parser.add_argument("--page-size", type=int, default=1000, help="user_answers 페이지 크기")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📈 user_progress 백필")
+    print("=" * 60)
+
+    from storage import get_client
+    backfill(get_client(service_role=True), page_size=args.page_size, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+-- 📈 유저별 진척도 요약 (user_progress.py)
+-- user_answers 에 답안이 들어올 때마다 트리거가 (유저, 유형) 행과 (유저, 'all') 행을 갱신합니다.
+-- 봇(/q, /practice)과 JS 봇 모두 user_answers 에 insert 만 하면 되며,
+-- /stats · 진척도 · 리더보드는 이 테이블의 행 하나만 읽습니다.
+-- 기존 기록으로 다시 채우려면: python user_progress.py (또는 python cli.py backfill-progress)
+CREATE TABLE IF NOT EXISTS user_progress (
+    user_id TEXT NOT NULL,
+    question_type TEXT NOT NULL,              -- questions.type 소문자 또는 전체 'all'
+    answered INTEGER NOT NULL DEFAULT 0,      -- 푼 문제 수 (같은 문제 재풀이 제외)
+    attempts INTEGER NOT NULL DEFAULT 0,      -- 제출한 답안 수
+    correct INTEGER NOT NULL DEFAULT 0,       -- 맞힌 답안 수
+    streak INTEGER NOT NULL DEFAULT 0,        -- 현재 연속 정답
+    best_streak INTEGER NOT NULL DEFAULT 0,
+    last_question_id UUID,
+    last_answered_at TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT now(),
+    PRIMARY KEY (user_id, question_type)
+);
+
+-- 리더보드의 유형별 스냅샷 로드용 (question_type 으로 필터, user_id 로 keyset 페이지네이션)
+CREATE INDEX IF NOT EXISTS idx_user_progress_type
+    ON user_progress (question_type, user_id);
+
+-- 트리거의 "처음 푼 문제인지" 확인용
+CREATE INDEX IF NOT EXISTS idx_user_answers_user_question
+    ON user_answers (user_id, question_id);
+
+CREATE OR REPLACE FUNCTION apply_user_answer_progress()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    qtype TEXT;
+    is_new INTEGER;
+    hit INTEGER := CASE WHEN NEW.is_correct THEN 1 ELSE 0 END;
+    scope TEXT;
+BEGIN
+    SELECT lower(coalesce(type, 'unknown')) INTO qtype FROM questions WHERE id = NEW.question_id;
+    qtype := coalesce(qtype, 'unknown');
+
+    is_new := CASE WHEN EXISTS (
+        SELECT 1 FROM user_answers
+        WHERE user_id = NEW.user_id AND question_id = NEW.question_id AND id <> NEW.id
+    ) THEN 0 ELSE 1 END;
+
+    FOREACH scope IN ARRAY ARRAY[qtype, 'all'] LOOP
+        INSERT INTO user_progress AS p (
+            user_id, question_type, answered, attempts, correct, streak, best_streak,
+            last_question_id, last_answered_at, updated_at
+        )
+        VALUES (
+            NEW.user_id, scope, is_new, 1, hit, hit, hit,
+            NEW.question_id, coalesce(NEW.submitted_at, NEW.answered_at, now()), now()
+        )
+        ON CONFLICT (user_id, question_type) DO UPDATE SET
+            answered = p.answered + EXCLUDED.answered,
+            attempts = p.attempts + 1,
+            correct = p.correct + EXCLUDED.correct,
+            streak = CASE WHEN NEW.is_correct THEN p.streak + 1 ELSE 0 END,
+            best_streak = greatest(p.best_streak, CASE WHEN NEW.is_correct THEN p.streak + 1 ELSE 0 END),
+            last_question_id = EXCLUDED.last_question_id,
+            last_answered_at = EXCLUDED.last_answered_at,
+            updated_at = now();
+    END LOOP;
+
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_user_answers_progress ON user_answers;
+CREATE TRIGGER trg_user_answers_progress
+    AFTER INSERT ON user_answers
+    FOR EACH ROW EXECUTE FUNCTION apply_user_answer_progress();